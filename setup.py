@@ -35,6 +35,7 @@ setup(
     include_package_data=True,
     author='Will McGinnis',
     install_requires=install_requires,
+    extras_require={'polars': ['polars']},
     dependency_links=dependency_links,
     author_email='will@pedalwrencher.com'
 )
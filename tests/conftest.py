@@ -0,0 +1,75 @@
+"""
+Fixtures shared by the tests: clients with a mocked tweepy API, and a stand-in for tweepy.Cursor.
+"""
+
+from unittest import mock
+
+import pytest
+
+from twitterpandas import TwitterPandas
+
+
+class FakeCursor(object):
+    """
+    Stand-in for tweepy.Cursor that serves a fixed list of items page_size at a time, counting the pages fetched, and
+    keeping the keyword arguments it was built with.
+    """
+
+    def __init__(self, items, page_size=None, **kwargs):
+        self.kwargs = kwargs
+        self.items = list(items)
+        self.page_size = page_size or max(len(self.items), 1)
+        self.fetched = 0
+
+    def pages(self):
+        for start in range(0, len(self.items), self.page_size):
+            self.fetched += 1
+            yield self.items[start:start + self.page_size]
+
+
+@pytest.fixture
+def make_client():
+    """
+    Builds clients with made up credentials (nothing is sent until an API is used) and a mock tweepy API, assigning any
+    settings given over the constructor's, e.g. client=None to keep an API per thread.
+    """
+
+    def make(**settings):
+        tp = TwitterPandas('token', 'token secret', 'consumer key', 'consumer secret')
+        settings.setdefault('client', mock.MagicMock())
+        for name, value in settings.items():
+            setattr(tp, name, value)
+        return tp
+
+    return make
+
+
+@pytest.fixture
+def tp(make_client):
+    return make_client()
+
+
+@pytest.fixture
+def cursor():
+    """
+    Patches tweepy.Cursor for the test with a mock, and returns it.  Its serve() sets what each cursor built serves: a
+    list of items, or a function of the cursor's method and keyword arguments returning one, page_size at a time.  The
+    cursors built are kept in its built list.
+    """
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor') as patched:
+        patched.built = []
+
+        def serve(items, page_size=None):
+            def build(method, **kwargs):
+                served = items(method, **kwargs) if callable(items) else items
+                served = FakeCursor(served, page_size=page_size, **kwargs)
+                patched.built.append(served)
+                return served
+
+            patched.side_effect = build
+            return patched
+
+        patched.serve = serve
+        serve([])
+        yield patched
@@ -0,0 +1,86 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from twitterpandas.batching import BatchLoader
+
+
+def _run_together(func, args):
+    # start every call at once, so they land in the same window
+    barrier = threading.Barrier(len(args))
+
+    def call(arg):
+        barrier.wait()
+        return func(arg)
+
+    with ThreadPoolExecutor(max_workers=len(args)) as executor:
+        return list(executor.map(call, args))
+
+
+def test_concurrent_loads_share_one_call():
+    calls = []
+
+    def fetch_many(keys):
+        calls.append(keys)
+        time.sleep(0.05)
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = BatchLoader(fetch_many, window=0.2)
+    keys = [i % 10 for i in range(40)]
+    results = _run_together(lambda key: _safe(loader.load, key), keys)
+
+    assert len(calls) == 1
+    assert sorted(calls[0]) == list(range(10))
+    assert results == [KeyError if key == 3 else key * 10 for key in keys]
+
+    # once delivered, a key is fetched again
+    assert loader.load(4) == 40
+    assert len(calls) == 2
+
+
+def _safe(func, *args):
+    try:
+        return func(*args)
+    except KeyError:
+        return KeyError
+
+
+def test_batches_are_capped_and_errors_fan_out():
+    calls = []
+    loader = BatchLoader(lambda keys: calls.append(len(keys)) or {key: key for key in keys}, max_batch=100, window=0.5)
+
+    assert _run_together(loader.load, list(range(250))) == list(range(250))
+    assert sorted(calls) == [50, 100, 100]
+    assert loader.calls == 3
+
+    def broken(keys):
+        raise RuntimeError('api down')
+
+    loader = BatchLoader(broken, window=0.05)
+    with pytest.raises(RuntimeError):
+        loader.load(1)
+
+
+def test_client_batches_get_user_and_get_status(make_client):
+    tp = make_client(batch_window=0.2)
+    tp.client.lookup_users.side_effect = lambda user_ids=None, screen_names=None: [
+        mock.MagicMock(_json={'id': user_id, 'screen_name': 'u%d' % user_id}) for user_id in user_ids
+    ]
+    tp.client.statuses_lookup.side_effect = lambda id_: [
+        mock.MagicMock(_json={'id': status_id, 'text': 'hi'}) for status_id in id_ if status_id != 7
+    ]
+    tp.client.get_status.return_value = mock.MagicMock(_json={'id': 7, 'text': 'from show'})
+
+    users = _run_together(lambda i: tp.get_user(user_id=i % 5), list(range(20)))
+    assert [df['id'].iloc[0] for df in users] == [i % 5 for i in range(20)]
+    assert tp.client.lookup_users.call_count == 1
+    assert not tp.client.get_user.called
+
+    statuses = _run_together(lambda i: tp.get_status(i % 8), list(range(16)))
+    assert tp.client.statuses_lookup.call_count == 1
+    # 7 wasn't in the lookup, so statuses/show was called for it
+    assert [df['text'].iloc[0] for df in statuses][7] == 'from show'
+    assert tp.client.get_status.call_count == 2
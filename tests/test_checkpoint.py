@@ -0,0 +1,100 @@
+import os
+from unittest import mock
+
+import pytest
+
+from twitterpandas.checkpoint import Checkpoint
+
+FOLLOWER_IDS = list(range(1, 12))
+
+
+class _Crash(Exception):
+    pass
+
+
+class _CursorIterator(object):
+    def __init__(self, cursor):
+        self.next_cursor = cursor or -1
+
+
+class _FakeIdCursor(object):
+    """Stand-in for tweepy.Cursor over a cursor-paged id endpoint, 3 ids per page, that can fail after some pages."""
+
+    calls = []
+    fail_after = None
+
+    def __init__(self, method, cursor=None, **kwargs):
+        self.iterator = _CursorIterator(cursor)
+        type(self).calls.append(cursor)
+
+    def pages(self):
+        fetched = 0
+        while self.iterator.next_cursor != 0:
+            if self.fail_after is not None and fetched >= self.fail_after:
+                raise _Crash()
+            start = 0 if self.iterator.next_cursor == -1 else self.iterator.next_cursor
+            page = FOLLOWER_IDS[start:start + 3]
+            self.iterator.next_cursor = start + 3 if start + 3 < len(FOLLOWER_IDS) else 0
+            fetched += 1
+            yield page
+
+
+@pytest.fixture(autouse=True)
+def _reset_cursor():
+    _FakeIdCursor.calls = []
+    _FakeIdCursor.fail_after = None
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_followers_friendships_resumes_after_a_crash_without_duplicates(make_client, tmp_path, prefetch):
+    tp = make_client(prefetch=prefetch)
+    state = str(tmp_path / 'followers.ckpt')
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', _FakeIdCursor):
+        _FakeIdCursor.fail_after = 2
+        with pytest.raises(_Crash):
+            tp.followers_friendships(screen_name='someone', resume=state)
+
+        _FakeIdCursor.fail_after = None
+        df = tp.followers_friendships(screen_name='someone', resume=state)
+
+    assert df['id'].tolist() == FOLLOWER_IDS
+    # the second run started from the saved next_cursor, not the first page
+    assert _FakeIdCursor.calls == [None, 6]
+
+
+def test_finished_checkpoint_returns_saved_rows_without_fetching(tp, tmp_path):
+    state = str(tmp_path / 'followers.ckpt')
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', _FakeIdCursor):
+        first = tp.followers_friendships(screen_name='someone', resume=state)
+        _FakeIdCursor.fail_after = 0
+        second = tp.followers_friendships(screen_name='someone', resume=state)
+
+    assert second['id'].tolist() == first['id'].tolist() == FOLLOWER_IDS
+    assert Checkpoint(state).done
+
+
+def test_checkpoint_drops_a_torn_last_line(tmp_path):
+    state = str(tmp_path / 'crawl.ckpt')
+    checkpoint = Checkpoint(state, endpoint='followers_ids', params={'screen_name': 'someone'})
+    checkpoint.save_page([1, 2, 3], {'cursor': 3})
+
+    with open(state, 'a') as f:
+        f.write('{"position": {"cursor": 6}, "items": [4, 5')
+
+    resumed = Checkpoint(state, endpoint='followers_ids', params={'screen_name': 'someone'})
+    assert resumed.items == [1, 2, 3]
+    assert resumed.position == {'cursor': 3}
+
+    resumed.save_page([4, 5, 6], {'cursor': 6})
+    assert Checkpoint(state).items == [1, 2, 3, 4, 5, 6]
+
+
+def test_checkpoint_refuses_a_different_crawl(tmp_path):
+    state = str(tmp_path / 'crawl.ckpt')
+    Checkpoint(state, endpoint='followers_ids', params={'screen_name': 'someone'})
+
+    with pytest.raises(ValueError):
+        Checkpoint(state, endpoint='followers_ids', params={'screen_name': 'someone_else'})
+    assert os.path.exists(state)
@@ -0,0 +1,162 @@
+from unittest import mock
+
+import pytest
+import tweepy
+
+from twitterpandas.ratelimit import RateBudget
+
+# who follows whom: FOLLOWS[a] are the users a follows
+FOLLOWS = {
+    1: [2, 3],
+    2: [1, 4, 5, 6, 7],
+    3: [8],
+    4: [1],
+    5: [1],
+    6: [9],
+    8: [1, 10],
+}
+
+
+def _followers(user_id):
+    return sorted(a for a, followed in FOLLOWS.items() if user_id in followed)
+
+
+class _CursorIterator(object):
+    def __init__(self, cursor):
+        self.next_cursor = cursor
+
+
+class _FakeIdCursor(object):
+    """Stand-in for tweepy.Cursor over followers_ids / friends_ids, 2 ids per page, using the start index as cursor."""
+
+    calls = []
+    crash_after = None
+    protected = set()
+
+    def __init__(self, method, user_id=None, cursor=-1, count=None):
+        self.endpoint = method._mock_name
+        self.user_id = user_id
+        self.iterator = _CursorIterator(cursor)
+
+    def pages(self):
+        if self.crash_after is not None and len(self.calls) >= self.crash_after:
+            raise RuntimeError('connection reset')
+        if self.user_id in self.protected:
+            raise tweepy.TweepError('Not authorized.', response=mock.MagicMock(status_code=401))
+        type(self).calls.append((self.endpoint, self.user_id, self.iterator.next_cursor))
+
+        ids = _followers(self.user_id) if self.endpoint == 'followers_ids' else FOLLOWS.get(self.user_id, [])
+        start = max(self.iterator.next_cursor, 0)
+        self.iterator.next_cursor = start + 2 if start + 2 < len(ids) else 0
+        yield ids[start:start + 2]
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    _FakeIdCursor.calls = []
+    _FakeIdCursor.crash_after = None
+    _FakeIdCursor.protected = set()
+
+
+def _graph(crawler):
+    return sorted(map(tuple, crawler.edges().values.tolist()))
+
+
+def test_crawls_out_to_the_hop_limit(tp, tmp_path):
+    with mock.patch('twitterpandas.crawler.tweepy.Cursor', _FakeIdCursor):
+        crawler = tp.graph_crawler(str(tmp_path / 'crawl.db'), seeds=[1], max_hops=1)
+        status = crawler.run()
+
+    # only the seed is expanded, its neighbors are recorded at hop 1
+    assert status['expanded'] == 1
+    assert _graph(crawler) == [(1, 2), (1, 3), (2, 1), (4, 1), (5, 1), (8, 1)]
+    nodes = crawler.nodes().set_index('user_id')
+    assert nodes.loc[1, 'hop'] == 0
+    assert (nodes.drop(1)['hop'] == 1).all()
+    assert set(nodes.index) == {1, 2, 3, 4, 5, 8}
+
+    # 1 and 2 follow each other
+    assert crawler.graph().mutual_edges().values.tolist() == [[1, 2]]
+
+
+def test_node_budget_goes_by_priority(tp, tmp_path):
+    with mock.patch('twitterpandas.crawler.tweepy.Cursor', _FakeIdCursor):
+        crawler = tp.graph_crawler(str(tmp_path / 'crawl.db'), seeds=[1], max_hops=2, max_nodes=2,
+                                   directions=['friends'], priority=lambda ids: [-i for i in ids])
+        crawler.run()
+
+    # 1 follows 2 and 3, the lower id has the higher priority so only 2 is expanded after the seed
+    assert crawler.nodes().set_index('user_id')['admitted'].to_dict() == {1: 1, 2: 1, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0}
+    assert set(user for _, user, _ in _FakeIdCursor.calls) == {1, 2}
+
+
+def test_unknown_priorities_go_last(tp, tmp_path):
+    def priority(ids):
+        return [float('nan') if i == 2 else 5 for i in ids]
+
+    with mock.patch('twitterpandas.crawler.tweepy.Cursor', _FakeIdCursor):
+        crawler = tp.graph_crawler(str(tmp_path / 'crawl.db'), seeds=[1], max_hops=2, max_nodes=2,
+                                   directions=['friends'], priority=priority)
+        crawler.run()
+
+    # 2's priority is unknown, so it is ranked below 3 rather than being looked up over and over
+    nodes = crawler.nodes().set_index('user_id')
+    assert nodes['admitted'].to_dict() == {1: 1, 2: 0, 3: 1, 8: 0}
+    assert nodes.loc[2, 'priority'] == float('-inf')
+
+
+def test_resumes_after_a_crash_without_refetching(tp, tmp_path):
+    path = str(tmp_path / 'crawl.db')
+
+    with mock.patch('twitterpandas.crawler.tweepy.Cursor', _FakeIdCursor):
+        _FakeIdCursor.crash_after = 5
+        with pytest.raises(RuntimeError):
+            tp.graph_crawler(path, seeds=[1], max_hops=2).run()
+        fetched_before = list(_FakeIdCursor.calls)
+
+        _FakeIdCursor.crash_after = None
+        crawler = tp.graph_crawler(path, max_hops=2)
+        crawler.run()
+
+    full = [(a, b) for a, followed in FOLLOWS.items() for b in followed
+            if a in {1, 2, 3, 4, 5, 8} or b in {1, 2, 3, 4, 5, 8}]
+    assert _graph(crawler) == sorted(full)
+    # no page fetched before the crash was fetched again
+    assert len(fetched_before) == 5
+    assert len(_FakeIdCursor.calls) == len(set(_FakeIdCursor.calls))
+
+
+def test_steps_go_to_the_endpoint_with_budget(tp, tmp_path):
+    budgets = {'followers_ids': RateBudget(1, window=900), 'friends_ids': RateBudget(100, window=900)}
+
+    with mock.patch('twitterpandas.crawler.tweepy.Cursor', _FakeIdCursor):
+        crawler = tp.graph_crawler(str(tmp_path / 'crawl.db'), seeds=[1, 2], max_hops=1)
+        crawler.budgets.update(budgets)
+        crawler.run(max_calls=4)
+
+    endpoints = [endpoint for endpoint, _, _ in _FakeIdCursor.calls]
+    assert endpoints.count('followers_ids') == 1
+    assert endpoints.count('friends_ids') == 3
+
+
+def test_protected_users_are_recorded_and_skipped(tp, tmp_path):
+    path = str(tmp_path / 'crawl.db')
+    _FakeIdCursor.protected = {2}
+
+    with mock.patch('twitterpandas.crawler.tweepy.Cursor', _FakeIdCursor):
+        crawler = tp.graph_crawler(path, seeds=[1], max_hops=2, max_nodes=3)
+        status = crawler.run()
+
+        # both of 2's directions failed once, and a later run doesn't try them again
+        calls = len(_FakeIdCursor.calls)
+        assert tp.graph_crawler(path, max_hops=2, max_nodes=3).run() == status
+        assert len(_FakeIdCursor.calls) == calls
+
+    assert status['failed'] == 2
+    assert status['pending'] == 0
+    assert status['expanded'] == 3
+    failures = crawler.failures()
+    assert sorted(failures['endpoint']) == ['followers_ids', 'friends_ids']
+    assert (failures['user_id'] == 2).all()
+    assert (failures['error'] == 'Not authorized.').all()
+    assert (1, 3) in _graph(crawler)
@@ -2,13 +2,13 @@ from types import SimpleNamespace
 from unittest import TestCase
 from unittest.mock import Mock
 
-from twitterpandas import TwitterPandas
+import pytest
 
 
 class DirectMessageMethodsTestCase(TestCase):
-    def setUp(self):
-        self.twitter_pandas = TwitterPandas.__new__(TwitterPandas)
-        self.twitter_pandas.client = Mock()
+    @pytest.fixture(autouse=True)
+    def _client(self, make_client):
+        self.twitter_pandas = make_client(client=Mock())
 
     @staticmethod
     def message():
@@ -18,9 +18,9 @@ class DirectMessageMethodsTestCase(TestCase):
             id_str='123',
             text='hello \U0001f600',
             entities={
-                'urls': [{'url': 'https://example.com'}],
+                'urls': [{'url': 'https://example.com'}, {'url': 'https://example.org'}],
                 'user_mentions': [],
-                'hashtags': [{'text': 'example'}],
+                'hashtags': [{'text': 'example', 'indices': [0, 8]}],
             },
             sender=SimpleNamespace(_json={'id': 1, 'screen_name': 'sender'}),
             recipient=SimpleNamespace(_json={'id': 2, 'screen_name': 'recipient'}),
@@ -43,8 +43,9 @@ class DirectMessageMethodsTestCase(TestCase):
             self.assertEqual(frame.loc[0, 'created_at'], '2016-01-01')
             self.assertEqual(frame.loc[0, 'id'], 123)
             self.assertEqual(frame.loc[0, 'id_str'], '123')
-            self.assertEqual(frame.loc[0, 'entities.urls_url'], 'https://example.com')
+            self.assertEqual(frame.loc[0, 'entities.urls_url'], 'https://example.org')
             self.assertEqual(frame.loc[0, 'entities.hashtags_text'], 'example')
+            self.assertNotIn('entities.user_mentions_screen_name', frame.columns)
             self.assertNotIn('sender_id', frame.columns)
 
     def test_include_user_data_keeps_enriched_columns(self):
@@ -64,3 +65,49 @@ class DirectMessageMethodsTestCase(TestCase):
             self.assertEqual(frame.loc[0, 'sender_screen_name'], 'sender')
             self.assertEqual(frame.loc[0, 'recipient_screen_name'], 'recipient')
             self.assertEqual(frame.loc[0, 'full_text'], 'hello \ufffd')
+
+    def test_entities_are_long_tables_keyed_by_message(self):
+        message = self.message()
+        self.twitter_pandas.client.direct_messages.return_value = [message]
+        self.twitter_pandas.client.get_direct_message.return_value = message
+
+        for tables in [
+            self.twitter_pandas.direct_message_entities(),
+            self.twitter_pandas.direct_message_entities(id_=123),
+        ]:
+            self.assertEqual(tables['urls']['url'].tolist(), ['https://example.com', 'https://example.org'])
+            self.assertEqual(tables['urls']['message_id'].tolist(), [123, 123])
+            self.assertEqual(tables['urls']['position'].tolist(), [0, 1])
+            self.assertEqual(tables['hashtags'].loc[0, 'text'], 'example')
+            self.assertEqual(len(tables['user_mentions']), 0)
+
+    def test_page_is_deprecated(self):
+        self.twitter_pandas.client.direct_messages.return_value = [self.message()]
+        self.twitter_pandas.client.sent_direct_messages.return_value = [self.message()]
+
+        for method in [self.twitter_pandas.direct_messages, self.twitter_pandas.sent_direct_messages]:
+            with self.assertWarns(DeprecationWarning):
+                frame = method(limit=1, page=2)
+            self.assertEqual(frame['id'].tolist(), [123])
+
+    def test_pages_back_through_history_by_max_id(self):
+        def message(id_):
+            m = self.message()
+            m.id, m.id_str = id_, str(id_)
+            return m
+
+        history = [message(i) for i in range(10, 0, -1)]
+
+        def fake_direct_messages(since_id=None, max_id=None, count=None, full_text=False):
+            return [m for m in history if max_id is None or m.id <= max_id][:4]
+
+        self.twitter_pandas.client.direct_messages.side_effect = fake_direct_messages
+
+        frame = self.twitter_pandas.direct_messages()
+        self.assertEqual(frame['id'].tolist(), list(range(10, 0, -1)))
+
+        limited = self.twitter_pandas.direct_messages(limit=6)
+        self.assertEqual(limited['id'].tolist(), list(range(10, 4, -1)))
+
+        pages = list(self.twitter_pandas.direct_messages(stream=True))
+        self.assertEqual([len(page) for page in pages], [4, 4, 2])
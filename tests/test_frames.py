@@ -0,0 +1,115 @@
+import sys
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from twitterpandas.frames import ColumnBuilder, build_frame, check_backend, to_pandas
+
+pa = pytest.importorskip('pyarrow')
+pl = pytest.importorskip('polars')
+
+ROWS = [
+    {'id': 1, 'name': 'a'},
+    {'id': 2, 'verified': True},
+    {'id': 3, 'name': 'c', 'place': None},
+    {'id': 4, 'name': 'd', 'verified': False, 'place': 'ATL'},
+    {'id': 5, 'name': 5},
+]
+
+
+def test_pandas_columns_match_a_frame_of_dicts():
+    built = build_frame(iter(ROWS))
+
+    assert list(built.columns) == ['id', 'name', 'verified', 'place']
+    pd.testing.assert_frame_equal(built, pd.DataFrame(ROWS))
+
+
+def test_arrow_chunks_are_unified():
+    builder = ColumnBuilder(backend='pyarrow', chunk_size=2)
+    builder.extend(ROWS)
+    table = builder.build()
+
+    assert isinstance(table, pa.Table)
+    assert table.num_rows == 5
+    assert table.column('id').to_pylist() == [1, 2, 3, 4, 5]
+    assert table.column('verified').to_pylist() == [None, True, None, False, None]
+    assert table.column('place').to_pylist() == [None, None, None, 'ATL', None]
+    # a name that is a number in one chunk is kept as a string
+    assert table.column('name').to_pylist() == ['a', None, 'c', 'd', '5']
+
+    frame = build_frame(ROWS[:4], backend='polars')
+    assert isinstance(frame, pl.DataFrame)
+    assert frame['id'].to_list() == [1, 2, 3, 4]
+    assert to_pandas(frame, columns=['id', 'verified'])['verified'].tolist() == [None, True, None, False]
+
+    with pytest.raises(ValueError):
+        check_backend('spark')
+
+
+@pytest.mark.parametrize('backend', ['pandas', 'pyarrow', 'polars'])
+def test_rows_swapping_optional_fields(backend):
+    # a row bringing a new field and leaving one out, then the earlier fields again, as statuses with a place or
+    # coordinates do
+    rows = [
+        {'id': 1, 'text': 'a', 'place': 'ATL'},
+        {'id': 2, 'text': 'b', 'coordinates': '1,2'},
+        {'id': 3, 'text': 'c', 'place': 'NYC'},
+        {'id': 4, 'text': 'd', 'place': 'SF'},
+    ]
+    built = to_pandas(build_frame(rows, backend=backend))
+
+    assert built['id'].tolist() == [1, 2, 3, 4]
+    assert built['place'].tolist()[2:] == ['NYC', 'SF'] and pd.isnull(built['place'][1])
+    assert built['coordinates'].tolist()[1] == '1,2' and built['coordinates'][[0, 2, 3]].isnull().all()
+
+
+@pytest.mark.parametrize('backend, kind', [('pyarrow', pa.Table), ('polars', pl.DataFrame)])
+def test_client_methods_return_the_backend(tp, cursor, backend, kind):
+    cursor.serve([mock.MagicMock(_json={'id': i, 'screen_name': 'u%d' % (i % 2), 'user': {'id': 9}}) for i in range(4)],
+                 page_size=2)
+
+    expected = tp.followers(user_id=1, strategy='list')
+    tp.backend = backend
+    followers = tp.followers(user_id=1, strategy='list')
+    timeline = tp.user_timeline(user_id=1)
+    lazy = tp.list_members('owner', 'slug', lazy=True).head(1)
+
+    assert isinstance(followers, kind)
+    assert isinstance(timeline, kind)
+    assert isinstance(lazy, kind)
+    pd.testing.assert_frame_equal(to_pandas(followers), expected)
+    assert to_pandas(timeline, columns=['user.id'])['user.id'].tolist() == [9, 9, 9, 9]
+
+
+@pytest.mark.parametrize('backend', ['pyarrow', 'polars'])
+def test_pandas_only_methods_take_the_backend_output(make_client, cursor, backend):
+    root, reply = 1234567890123456789, 1234567890123456801
+    statuses = {root: None, reply: root, 7: reply}
+
+    tp = make_client(backend=backend)
+    tp.client.statuses_lookup.side_effect = lambda id_=None: [
+        mock.MagicMock(_json={'id': i, 'in_reply_to_status_id': statuses[i]}) for i in id_
+    ]
+
+    cursor.serve([mock.MagicMock(_json={'id': 7, 'in_reply_to_status_id': reply}),
+                  mock.MagicMock(_json={'id': 8, 'in_reply_to_status_id': None})])
+    timeline = tp.user_timeline(user_id=1)
+
+    threads = tp.reply_threads(timeline)
+
+    assert all(isinstance(frame, pd.DataFrame) for frame in threads)
+    assert threads.statuses['root_id'].tolist() == [root, 8]
+    assert sorted(threads.ancestors['id'].tolist()) == [root, reply]
+
+    cursor.serve(lambda method, id=None: [id])
+    edges = tp.retweeters(timeline['id'])
+    assert edges.values.tolist() == [[7, 7], [8, 8]]
+
+
+def test_polars_backend_without_polars():
+    with mock.patch.dict(sys.modules, {'polars': None}):
+        with pytest.raises(ImportError, match=r'twitter-pandas\[polars\]'):
+            build_frame(ROWS, backend='polars')
+
+    assert check_backend('pyarrow') == 'pyarrow'
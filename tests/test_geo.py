@@ -0,0 +1,64 @@
+"""Tests for resolving coordinates to trend locations locally."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from twitterpandas.geo import LocationResolver, haversine
+
+CATALOG = pd.DataFrame([
+    {'woeid': 1, 'name': 'Worldwide', 'placeType.name': 'Supername'},
+    {'woeid': 2357024, 'name': 'Atlanta', 'placeType.name': 'Town'},
+    {'woeid': 2459115, 'name': 'New York', 'placeType.name': 'Town'},
+    {'woeid': 44418, 'name': 'London', 'placeType.name': 'Town'},
+    {'woeid': 1118370, 'name': 'Tokyo', 'placeType.name': 'Town'},
+])
+
+COORDINATES = pd.DataFrame([
+    {'woeid': 2357024, 'lat': 33.749, 'long': -84.388},
+    {'woeid': 2459115, 'lat': 40.713, 'long': -74.006},
+    {'woeid': 44418, 'lat': 51.507, 'long': -0.128},
+    {'woeid': 1118370, 'lat': 35.690, 'long': 139.692},
+])
+
+
+def test_haversine_matches_known_distance():
+    # London to New York is about 5570km
+    assert haversine(51.507, -0.128, 40.713, -74.006) == pytest.approx(5570, rel=0.01)
+
+
+@pytest.mark.parametrize('use_tree', [True, False])
+def test_resolve_keeps_series_index_and_missing_rows(use_tree):
+    resolver = LocationResolver.from_catalog(CATALOG, COORDINATES)
+    if not use_tree:
+        resolver._tree = None
+
+    lat = pd.Series([33.9, 51.0, np.nan, 35.0, 41.0], index=list('abcde'))
+    long = pd.Series([-84.0, 0.5, 10.0, 139.0, -73.0], index=list('abcde'))
+
+    df = resolver.resolve(lat, long)
+
+    assert df.index.tolist() == list('abcde')
+    assert df['name'].tolist()[:2] == ['Atlanta', 'London']
+    assert pd.isnull(df.loc['c', 'woeid'])
+    assert df.loc[['d', 'e'], 'name'].tolist() == ['Tokyo', 'New York']
+    assert (df['distance_km'].dropna() < 150).all()
+
+
+def test_resolve_across_the_antimeridian():
+    coordinates = pd.DataFrame([
+        {'woeid': 1, 'lat': 0.0, 'long': 179.5},
+        {'woeid': 2, 'lat': 0.0, 'long': 170.0},
+    ])
+    resolver = LocationResolver(coordinates)
+
+    assert resolver.resolve([0.0], [-179.5])['woeid'].tolist() == [1]
+
+
+def test_location_resolver_uses_the_catalog(tp):
+    tp.client.trends_available.return_value = CATALOG.rename(columns={'placeType.name': 'kind'}).to_dict('records')
+
+    resolver = tp.location_resolver(COORDINATES)
+
+    assert resolver.closest(33.74, -84.38)['woeid'].tolist() == [2357024]
+    assert len(resolver.catalog) == 4
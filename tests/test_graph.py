@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from twitterpandas.graph import FollowGraph
+
+__author__ = 'willmcginnis'
+
+pytest.importorskip('scipy')
+
+
+def edges():
+    # 1 <-> 2 follow each other, 3 and 4 follow 1 and 2, 4 follows 3, one repeated edge
+    return pd.DataFrame({
+        'source': [1, 2, 3, 3, 4, 4, 4, 4],
+        'target': [2, 1, 1, 2, 1, 2, 3, 3],
+    })
+
+
+def test_degrees_and_reciprocity():
+    graph = FollowGraph.from_edges(edges())
+
+    assert graph.shape == (4, 4)
+    assert graph.n_edges == 7
+    assert graph.in_degree().to_dict() == {1: 3, 2: 3, 3: 1, 4: 0}
+    assert graph.out_degree().to_dict() == {1: 1, 2: 1, 3: 2, 4: 3}
+    assert graph.reciprocity() == pytest.approx(2 / 7.0)
+    assert graph.mutual_counts().to_dict() == {1: 1, 2: 1, 3: 0, 4: 0}
+    assert graph.mutual_edges().values.tolist() == [[1, 2]]
+
+
+def test_overlap_of_followers_and_friends():
+    graph = FollowGraph.from_edges(edges())
+
+    followers = graph.overlap([1, 2, 3])
+    assert followers.loc[1, 2] == 2
+    assert followers.loc[1, 1] == 3
+    assert followers.loc[2, 3] == 1
+
+    # mutual friends: 3 and 4 both follow 1 and 2
+    friends = graph.overlap([3, 4], kind='friends')
+    assert friends.loc[3, 4] == 2
+
+
+def test_similar_matches_top_similar():
+    graph = FollowGraph.from_edges(edges())
+
+    similar = graph.similar(1, k=2)
+    # 2's followers are {1, 3, 4} against 1's {2, 3, 4}: 2 shared out of 4
+    assert similar['similar_id'].tolist() == [2, 3]
+    assert similar['score'].iloc[0] == pytest.approx(0.5)
+
+    everything = graph.top_similar(k=2, block_size=1)
+    assert everything[everything['user_id'] == 1].reset_index(drop=True).equals(similar)
+    assert graph.top_similar(k=1, metric='overlap')['overlap'].max() == 2
+
+    with pytest.raises(ValueError):
+        graph.similar(1, metric='dice')
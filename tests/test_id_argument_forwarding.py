@@ -4,19 +4,6 @@ from unittest import mock
 
 import pytest
 
-from twitterpandas import TwitterPandas
-
-
-class _EmptyCursor:
-    def items(self):
-        return iter(())
-
-
-def _make_client():
-    tp = TwitterPandas.__new__(TwitterPandas)
-    tp.client = mock.MagicMock()
-    return tp
-
 
 @pytest.mark.parametrize(
     'method_name, endpoint_name, extra_kwargs',
@@ -28,16 +15,13 @@ def _make_client():
         ('followers_friendships', 'followers_ids', {}),
     ]
 )
-def test_cursor_user_selectors_use_tweepy_id(method_name, endpoint_name, extra_kwargs):
-    tp = _make_client()
-
-    with mock.patch('twitterpandas.client.tweepy.Cursor', return_value=_EmptyCursor()) as cursor:
-        getattr(tp, method_name)(
-            id_=123,
-            user_id=456,
-            screen_name='example',
-            **extra_kwargs
-        )
+def test_cursor_user_selectors_use_tweepy_id(tp, cursor, method_name, endpoint_name, extra_kwargs):
+    getattr(tp, method_name)(
+        id_=123,
+        user_id=456,
+        screen_name='example',
+        **extra_kwargs
+    )
 
     endpoint = getattr(tp.client, endpoint_name)
     forwarded = cursor.call_args
@@ -48,8 +32,7 @@ def test_cursor_user_selectors_use_tweepy_id(method_name, endpoint_name, extra_k
     assert forwarded.kwargs['screen_name'] == 'example'
 
 
-def test_get_user_uses_tweepy_id_and_preserves_none_selectors():
-    tp = _make_client()
+def test_get_user_uses_tweepy_id_and_preserves_none_selectors(tp):
     user = mock.MagicMock()
     user._json = {'id': 123}
     tp.client.get_user.return_value = user
@@ -63,8 +46,7 @@ def test_get_user_uses_tweepy_id_and_preserves_none_selectors():
     )
 
 
-def test_statuses_lookup_keeps_tweepy_id_():
-    tp = _make_client()
+def test_statuses_lookup_keeps_tweepy_id_(tp):
     tp.client.statuses_lookup.return_value = []
 
     tp.statuses_lookup(id_=[101, 102])
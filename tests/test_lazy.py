@@ -0,0 +1,90 @@
+import itertools
+from unittest import mock
+
+import pytest
+
+
+def _items(method, **kwargs):
+    # 12 items, bare ids for the id endpoints
+    if method._mock_name.endswith('_ids'):
+        return [100 - i for i in range(12)]
+    return [mock.MagicMock(_json={'id': 100 - i, 'screen_name': 'u%d' % i, 'user': {'id': 1}}) for i in range(12)]
+
+
+@pytest.fixture
+def cursor(cursor):
+    # 4 pages of 3
+    return cursor.serve(_items, page_size=3)
+
+
+def _fetched(cursor):
+    return cursor.built[0].fetched
+
+
+def test_lazy_followers_fetch_only_the_pages_used(tp, cursor):
+    result = tp.followers(user_id=1, lazy=True)
+    assert _fetched(cursor) == 0
+
+    assert result.head(2)['screen_name'].tolist() == ['u0', 'u1']
+    assert _fetched(cursor) == 1
+
+    assert result[2:5]['screen_name'].tolist() == ['u2', 'u3', 'u4']
+    assert result[1]['screen_name'] == 'u1'
+    assert _fetched(cursor) == 2
+
+    assert [user['screen_name'] for user in itertools.islice(result, 7)][-1] == 'u6'
+    assert _fetched(cursor) == 3
+
+    assert len(result) == 12
+    full = result.to_frame()
+    assert _fetched(cursor) == 4
+    assert result[-1]['screen_name'] == 'u11'
+
+    eager = tp.followers(user_id=1, strategy='list')
+
+    assert full.equals(eager)
+
+
+def test_lazy_timelines_and_limits(tp, cursor):
+    result = tp.user_timeline(user_id=1, limit=4, lazy=True)
+    assert result.head(1)['id'].tolist() == [100]
+    assert _fetched(cursor) == 1
+
+    # never more than limit, and the end is known without fetching past it
+    assert result.to_frame()['id'].tolist() == [100, 99, 98, 97]
+    assert _fetched(cursor) == 2
+    assert result.exhausted
+
+    tables = tp.home_timeline(lazy=True, normalize=True).head(3)
+    assert tables.statuses['id'].tolist() == [100, 99, 98]
+    assert tables.users['id'].tolist() == [1]
+
+
+def test_lazy_ids_strategy_hydrates_only_the_rows_asked_for(tp, cursor):
+    tp.client.lookup_users.side_effect = lambda user_ids: [mock.MagicMock(_json={'id': u}) for u in user_ids]
+
+    result = tp.friends(user_id=1, strategy='ids', lazy=True)
+    assert result.head(2)['id'].tolist() == [100, 99]
+
+    assert tp.client.lookup_users.call_args[1]['user_ids'] == [100, 99]
+    assert _fetched(cursor) == 1
+
+
+def test_lazy_ids_keep_hydrated_rows_and_iterate_rows(tp, cursor):
+    tp.client.lookup_users.side_effect = lambda user_ids: [mock.MagicMock(_json={'id': u}) for u in user_ids]
+
+    result = tp.friends(user_id=1, strategy='ids', lazy=True)
+    result.head(2)
+    assert result[0]['id'] == 100
+    assert result.head(3)['id'].tolist() == [100, 99, 98]
+    assert result[1:3]['id'].tolist() == [99, 98]
+
+    # the first two were looked up once, the third only when first asked for
+    assert [call[1]['user_ids'] for call in tp.client.lookup_users.call_args_list] == [[100, 99], [98]]
+
+    # iterating gives rows like indexing does, looking up a batch of the rows not seen yet at a time
+    rows = list(itertools.islice(result, 5))
+    assert [row['id'] for row in rows] == [100, 99, 98, 97, 96]
+    assert rows[0].equals(result[0])
+    assert tp.client.lookup_users.call_count == 3
+    assert tp.client.lookup_users.call_args[1]['user_ids'] == list(range(97, 88, -1))
@@ -0,0 +1,80 @@
+"""Tests for list paging and concurrent multi-list ingestion."""
+
+
+class _Item(object):
+    def __init__(self, id_, **extra):
+        self._json = dict({'id': id_}, **extra)
+
+
+def _serve(cursor, ids_by_slug):
+    # each list's items newer than the cursor's since_id, 2 per page
+    def items(method, slug=None, since_id=None, **kwargs):
+        return [_Item(i) for i in ids_by_slug[slug] if since_id is None or i > since_id]
+
+    cursor.serve(items, page_size=2)
+
+
+def test_list_timeline_pages_past_the_first_page_and_stops_at_limit(tp, cursor):
+    _serve(cursor, {'slug': [9, 8, 7, 6, 5, 4, 3]})
+
+    df = tp.list_timeline('owner', 'slug', limit=5)
+
+    assert df['id'].tolist() == [9, 8, 7, 6, 5]
+    assert cursor.built[0].fetched == 3
+    assert cursor.call_args.args == (tp.client.list_timeline,)
+    assert cursor.call_args.kwargs['owner_screen_name'] == 'owner'
+    assert cursor.call_args.kwargs['count'] == 5
+
+
+def test_get_list_returns_one_row(tp):
+    tp.client.get_list.return_value = _Item(1, slug='slug', member_count=10, user={'screen_name': 'owner'})
+
+    df = tp.get_list(owner='owner', slug='slug')
+
+    assert len(df) == 1
+    assert df.loc[0, 'member_count'] == 10
+    assert df.loc[0, 'user.screen_name'] == 'owner'
+
+
+def test_multi_list_members_tags_rows_by_list(tp, cursor):
+    _serve(cursor, {'a': [1, 2, 3], 'b': [3, 4]})
+
+    df = tp.multi_list_members([('owner', 'a'), ('owner', 'b')])
+
+    assert {call.args for call in cursor.call_args_list} == {(tp.client.list_members,)}
+    assert len(df) == 5
+    assert df[df['list_slug'] == 'b']['id'].tolist() == [3, 4]
+    assert set(df['list_owner']) == {'owner'}
+
+
+def test_multi_list_timeline_keeps_watermarks_per_list(tp, cursor):
+    timelines = {'a': [30, 20, 10], 'b': [25, 15]}
+    _serve(cursor, timelines)
+
+    lists = [('owner', 'a'), ('owner', 'b')]
+    first = tp.multi_list_timeline(lists)
+    timelines['a'] = [40] + timelines['a']
+    second = tp.multi_list_timeline(lists)
+
+    assert len(first) == 5
+    assert second['id'].tolist() == [40]
+    calls = [(call.kwargs['slug'], call.kwargs.get('since_id')) for call in cursor.call_args_list]
+    assert sorted(calls[2:]) == [('a', 30), ('b', 25)]
+
+    watermarks = tp.list_watermarks()
+    assert watermarks['since_id'].tolist() == [40, 25]
+
+
+def test_multi_list_timeline_keeps_the_watermark_of_a_list_cut_short(tp, cursor):
+    _serve(cursor, {'a': [30, 20, 10], 'b': [25]})
+
+    lists = [('owner', 'a'), ('owner', 'b')]
+    first = tp.multi_list_timeline(lists, limit=2)
+    assert first['id'].tolist() == [30, 20, 25]
+
+    # a stopped at 20 with 10 unseen, so it isn't moved past them
+    assert tp.list_watermarks()['since_id'].tolist() == [25]
+    second = tp.multi_list_timeline(lists)
+
+    assert second['id'].tolist() == [30, 20, 10]
+    assert tp.list_watermarks()['since_id'].tolist() == [30, 25]
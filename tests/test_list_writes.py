@@ -0,0 +1,64 @@
+"""Tests for adding and removing list members in batches."""
+
+import pandas as pd
+import tweepy
+
+
+def test_add_list_members_batches_ids_by_100(tp):
+    users = pd.DataFrame({'id': range(1, 251), 'screen_name': ['u%d' % i for i in range(1, 251)]})
+
+    df = tp.add_list_members('owner', 'slug', users)
+
+    assert tp.client.add_list_members.call_count == 3
+    first = tp.client.add_list_members.call_args_list[0].kwargs
+    assert first['user_id'] == list(range(1, 101))
+    assert first['owner_screen_name'] == 'owner'
+    assert first['slug'] == 'slug'
+    assert len(df) == 250
+    assert (df['status'] == 'added').all()
+
+
+def test_remove_list_members_by_screen_name(tp):
+    df = tp.remove_list_members('owner', 'slug', pd.Series(['a', 'b', 'a']))
+
+    tp.client.remove_list_members.assert_called_once_with(slug='slug', owner_screen_name='owner', screen_name=['a', 'b'])
+    assert df['status'].tolist() == ['removed', 'removed']
+
+
+def test_failed_batches_resume_from_progress(tp, tmpdir):
+    progress = str(tmpdir.join('progress.jsonl'))
+    tp.client.add_list_members.side_effect = [None, tweepy.TweepError('over capacity')]
+
+    # don't wait between retries, fail on the first error
+    tp.retry_call = lambda func, retries, **kwargs: func(**kwargs)
+    first = tp.add_list_members('owner', 'slug', list(range(150)), progress=progress)
+
+    assert first['status'].value_counts().to_dict() == {'added': 100, 'failed': 50}
+    assert first.loc[first['status'] == 'failed', 'error'].iloc[0] == 'over capacity'
+
+    tp.client.add_list_members.side_effect = None
+    second = tp.add_list_members('owner', 'slug', list(range(150)), progress=progress)
+
+    assert tp.client.add_list_members.call_args.kwargs['user_id'] == list(range(100, 150))
+    assert second['status'].value_counts().to_dict() == {'skipped': 100, 'added': 50}
+
+
+def test_progress_is_kept_per_list(tp, tmpdir):
+    progress = str(tmpdir.join('progress.jsonl'))
+
+    tp.add_list_members('owner', 'first', [1, 2, 3], progress=progress)
+    second = tp.add_list_members('owner', 'second', [2, 3, 4], progress=progress)
+
+    # nothing was added to the second list yet, so nothing is skipped
+    assert tp.client.add_list_members.call_args.kwargs['user_id'] == [2, 3, 4]
+    assert (second['status'] == 'added').all()
+
+    again = tp.add_list_members('owner', 'second', [2, 3, 4, 5], progress=progress)
+    assert again['status'].value_counts().to_dict() == {'skipped': 3, 'added': 1}
+
+
+def test_digit_strings_are_user_ids(tp):
+    tp.add_list_members('owner', 'slug', pd.Series(['1234567890123456789', '12', None]))
+
+    tp.client.add_list_members.assert_called_once_with(slug='slug', owner_screen_name='owner',
+                                                       user_id=[1234567890123456789, 12])
@@ -0,0 +1,62 @@
+"""Tests for the sparse list membership matrix."""
+
+import pytest
+
+from twitterpandas.membership import MembershipMatrix
+
+pytest.importorskip('scipy')
+
+
+def _matrix():
+    matrix = MembershipMatrix()
+    matrix.add_list(('owner', 'a'), [1, 2, 3])
+    matrix.add_list(('owner', 'b'), [2, 3, 4, 4])
+    matrix.add_list(('other', 'c'), [5])
+    return matrix
+
+
+def test_matrix_shape_and_index_maps():
+    matrix = _matrix()
+
+    assert matrix.shape == (5, 3)
+    assert matrix.matrix.nnz == 7
+    assert matrix.user_index.tolist() == [1, 2, 3, 4, 5]
+    assert matrix.list_index.tolist() == [('owner', 'a'), ('owner', 'b'), ('other', 'c')]
+    assert matrix.list_sizes().tolist() == [3, 3, 1]
+
+
+def test_users_in_at_least_k_lists():
+    counts = _matrix().users_in_at_least(2)
+
+    assert sorted(counts.index.tolist()) == [2, 3]
+    assert (counts == 2).all()
+
+
+def test_jaccard_between_lists():
+    matrix = _matrix()
+
+    assert matrix.jaccard(('owner', 'a'), ('owner', 'b')) == pytest.approx(0.5)
+    assert matrix.jaccard(('owner', 'a'), ('other', 'c')) == 0
+
+    similarity = matrix.jaccard()
+    assert similarity.loc[('owner', 'a'), ('owner', 'b')] == pytest.approx(0.5)
+    assert similarity.values.diagonal().tolist() == [1, 1, 1]
+
+
+def test_lists_of_user():
+    assert _matrix().lists_of(3).tolist() == [('owner', 'a'), ('owner', 'b')]
+
+
+class _Member(object):
+    def __init__(self, id_):
+        self._json = {'id': id_, 'screen_name': 'user_%d' % id_}
+
+
+def test_list_membership_matrix_streams_member_pages(tp, cursor):
+    members = {'a': [1, 2], 'b': [2, 3]}
+    cursor.serve(lambda method, slug=None, **kwargs: [_Member(i) for i in members[slug]])
+
+    matrix = tp.list_membership_matrix([('owner', 'a'), ('owner', 'b')])
+
+    assert matrix.shape == (3, 2)
+    assert matrix.users_in_at_least(2).index.tolist() == [2]
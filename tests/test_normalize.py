@@ -0,0 +1,84 @@
+"""Tests for the normalized statuses, users and entities output."""
+
+from twitterpandas.normalize import StatusTables, normalize_statuses
+
+
+def _user(id_, followers_count=10):
+    return {'id': id_, 'screen_name': 'user_%d' % id_, 'followers_count': followers_count}
+
+
+def _status(id_, user, **extra):
+    status = {
+        'id': id_,
+        'text': 'status %d' % id_,
+        'user': user,
+        'entities': {
+            'hashtags': [{'text': 'python', 'indices': [0, 7]}, {'text': 'pandas', 'indices': [8, 15]}],
+            'user_mentions': [{'id': 9, 'screen_name': 'user_9', 'name': 'Nine', 'indices': [16, 23]}],
+            'urls': [],
+        },
+    }
+    status.update(extra)
+    return status
+
+
+def _timeline():
+    quoted = _status(50, _user(3))
+    retweeted = _status(40, _user(2), quoted_status=quoted)
+    return [
+        _status(3, _user(1, followers_count=12)),
+        _status(2, _user(1), retweeted_status=retweeted),
+        _status(1, _user(1), quoted_status=quoted,
+                extended_entities={'media': [{'id': 7, 'type': 'photo', 'indices': [24, 30]},
+                                             {'id': 8, 'type': 'photo', 'indices': [24, 30]}]}),
+    ]
+
+
+def test_statuses_reference_users_by_id():
+    tables = normalize_statuses(_timeline())
+
+    assert isinstance(tables, StatusTables)
+    assert tables.statuses['id'].tolist() == [3, 2, 1]
+    assert tables.statuses['user_id'].tolist() == [1, 1, 1]
+    assert not any(c.startswith('user.') or c.startswith('entities') for c in tables.statuses.columns)
+    assert tables.statuses['retweeted_status_id'].tolist()[1] == 40
+
+
+def test_users_are_deduplicated_keeping_the_first():
+    users = normalize_statuses(_timeline()).users
+
+    assert sorted(users['id'].tolist()) == [1, 2, 3]
+    assert users.set_index('id').loc[1, 'followers_count'] == 12
+
+
+def test_entities_are_exploded_per_status():
+    tables = normalize_statuses(_timeline())
+
+    assert tables.hashtags[tables.hashtags['status_id'] == 3]['text'].tolist() == ['python', 'pandas']
+    assert tables.mentions['user_id'].unique().tolist() == [9]
+    assert tables.media['media_id'].tolist() == [7, 8]
+    assert len(tables.urls) == 0
+    assert list(tables.urls.columns)[:2] == ['status_id', 'position']
+
+
+def test_referenced_statuses_are_deduplicated():
+    referenced = normalize_statuses(_timeline()).referenced
+
+    assert sorted(referenced['id'].tolist()) == [40, 50]
+    assert referenced.set_index('id').loc[40, 'quoted_status_id'] == 50
+
+
+class _Status(object):
+    def __init__(self, data):
+        self._json = data
+
+
+def test_user_timeline_normalize(tp, cursor):
+    cursor.serve([_Status(s) for s in _timeline()])
+
+    flat = tp.user_timeline(screen_name='user_1')
+    tables = tp.user_timeline(screen_name='user_1', normalize=True)
+
+    assert 'user.screen_name' in flat.columns
+    assert len(tables.statuses) == len(flat)
+    assert len(tables.users) == 3
@@ -0,0 +1,79 @@
+"""Tests for picking the cheapest strategy and page size for a request."""
+
+import pandas as pd
+import pytest
+
+from twitterpandas.planner import RequestPlanner, WINDOW, page_size
+
+
+def test_page_size_uses_endpoint_maximum():
+    assert page_size('followers') == 200
+    assert page_size('followers_ids') == 5000
+    assert page_size('lookup_users') == 100
+    assert page_size('not_an_endpoint') is None
+
+
+def test_small_requests_page_full_objects():
+    plan = RequestPlanner().plan('followers', limit=150)
+
+    assert plan.strategy == 'list'
+    assert plan.page_size == 200
+    assert plan.calls == 1
+
+
+def test_large_requests_page_ids_and_hydrate():
+    plan = RequestPlanner().plan('followers', account_size=100000)
+
+    assert plan.strategy == 'ids'
+    assert plan.endpoints == ['followers_ids', 'lookup_users']
+    assert plan.calls == 20 + 1000
+
+
+def test_limit_caps_account_size():
+    plan = RequestPlanner().plan('friends', limit=10, account_size=100000)
+
+    assert plan.strategy == 'list'
+    assert plan.calls == 1
+
+
+def test_unknown_size_keeps_default_strategy():
+    assert RequestPlanner().plan('followers').strategy == 'list'
+    assert RequestPlanner().plan('friends').strategy == 'ids'
+
+
+def test_endpoint_item_caps_are_respected():
+    plan = RequestPlanner().plan('search_users', limit=5000)
+
+    assert plan.calls == 50
+
+
+def test_explain_uses_current_rate_limits():
+    now = pd.Timestamp('2016-01-01 00:00:00')
+    rate_limits = pd.DataFrame([{
+        'resource': 'followers',
+        'endpoint': '/followers/list',
+        'reset': now + pd.Timedelta(seconds=300),
+        'limit': 15,
+        'remaining': 0,
+    }])
+
+    plan = RequestPlanner(rate_limits=rate_limits, latency=0, now=now).plan('followers', limit=200)
+    df = plan.explain()
+
+    row = df[df['endpoint'] == 'followers'].iloc[0]
+    assert row['remaining'] == 0
+    assert row['seconds'] == 300
+    assert plan.strategy == 'ids'
+    assert df.loc[df['chosen'], 'endpoint'].tolist() == ['followers_ids', 'lookup_users']
+
+
+def test_waits_whole_windows_past_the_first_reset():
+    estimate = RequestPlanner(latency=0).estimate('followers', 200 * 31)
+
+    assert estimate['calls'] == 31
+    assert estimate['seconds'] == WINDOW * 2
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        RequestPlanner().plan('nope')
@@ -0,0 +1,114 @@
+import gc
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from twitterpandas.prefetch import PrefetchIterator
+
+
+class _Item(object):
+    def __init__(self, id_):
+        self._json = {'id': id_}
+
+
+class _SlowCursor(object):
+    """Stand-in for tweepy.Cursor whose pages take a while to arrive, recording the thread that fetched each."""
+
+    def __init__(self, ids, page_size=2, delay=0.0, **kwargs):
+        self.ids = ids
+        self.page_size = page_size
+        self.delay = delay
+        self.threads = []
+
+    def pages(self):
+        for start in range(0, len(self.ids), self.page_size):
+            time.sleep(self.delay)
+            self.threads.append(threading.current_thread().name)
+            yield [_Item(i) for i in self.ids[start:start + self.page_size]]
+
+
+def test_prefetch_iterator_keeps_order():
+    pages = list(PrefetchIterator(iter([[1, 2], [3], [4, 5]]), depth=1))
+
+    assert pages == [[1, 2], [3], [4, 5]]
+
+
+def test_prefetch_iterator_reads_ahead_up_to_depth():
+    fetched = []
+
+    def source():
+        for i in range(10):
+            fetched.append(i)
+            yield [i]
+
+    pages = PrefetchIterator(source(), depth=2)
+    assert next(pages) == [0]
+    time.sleep(0.2)
+
+    # two pages waiting in the queue and one more held by the fetching thread
+    assert len(fetched) <= 4
+    pages.close()
+
+
+def test_prefetch_iterator_reraises_fetch_errors():
+    def source():
+        yield [1]
+        raise ValueError('rate limited')
+
+    pages = PrefetchIterator(source(), depth=2)
+    assert next(pages) == [1]
+    with pytest.raises(ValueError):
+        next(pages)
+
+
+def test_prefetch_thread_stops_when_the_iterator_is_dropped():
+    def source():
+        for i in range(100):
+            yield [i]
+
+    pages = PrefetchIterator(source(), depth=1)
+    assert next(pages) == [0]
+    thread = pages._thread
+
+    # never closed, just let go of
+    del pages
+    gc.collect()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+
+
+def test_prefetch_iterator_stops_at_item_limit():
+    fetched = []
+
+    def source():
+        for i in range(10):
+            fetched.append(i)
+            yield [i, i]
+
+    pages = list(PrefetchIterator(source(), depth=4, limit=5))
+
+    assert len(pages) == 3
+    assert fetched == [0, 1, 2]
+
+
+def test_cursor_methods_fetch_pages_in_the_background(tp):
+    cursor = _SlowCursor(list(range(10, 0, -1)), delay=0.01)
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', return_value=cursor):
+        df = tp.user_timeline(screen_name='someone')
+
+    assert df['id'].tolist() == list(range(10, 0, -1))
+    assert set(cursor.threads) == {'twitterpandas-prefetch'}
+
+
+def test_prefetch_off_fetches_inline_with_the_same_result(make_client):
+    tp = make_client(prefetch=0)
+    cursor = _SlowCursor(list(range(10, 0, -1)))
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', return_value=cursor):
+        df = tp.user_timeline(screen_name='someone', limit=5)
+
+    assert df['id'].tolist() == [10, 9, 8, 7, 6]
+    assert cursor.threads == [threading.current_thread().name] * 3
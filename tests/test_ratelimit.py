@@ -0,0 +1,64 @@
+"""Tests for the client side rate limit budget."""
+
+import threading
+import time
+
+from twitterpandas.ratelimit import RateBudget
+
+
+class _Clock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_acquire_waits_for_the_window_to_slide():
+    clock = _Clock()
+    budget = RateBudget(2, window=60, clock=clock, sleep=clock.sleep)
+
+    budget.acquire()
+    budget.acquire()
+    assert budget.remaining == 0
+
+    budget.acquire()
+    assert clock.slept == [60]
+
+
+def test_for_endpoint_uses_remaining_calls():
+    assert RateBudget.for_endpoint('search').calls == 180
+    assert RateBudget.for_endpoint('search', remaining=10).calls == 10
+
+
+def test_wait_time_without_blocking():
+    clock = _Clock()
+    budget = RateBudget(1, window=60, clock=clock, sleep=clock.sleep)
+
+    assert budget.wait_time() == 0
+    budget.acquire()
+    clock.now = 15.0
+    assert budget.wait_time() == 45.0
+    assert clock.slept == []
+
+
+def test_acquire_gives_up_when_stopped():
+    budget = RateBudget(1, window=900)
+    budget.acquire()
+
+    stop = threading.Event()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(budget.acquire(stop=stop)))
+    waiter.start()
+    time.sleep(0.05)
+    stop.set()
+    waiter.join(1)
+
+    assert not waiter.is_alive()
+    assert results == [False]
+    assert budget.remaining == 0
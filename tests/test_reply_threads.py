@@ -0,0 +1,123 @@
+"""Tests for reconstructing reply threads with batched lookups."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from twitterpandas.threads import thread_roots
+
+# 1 <- 2 <- 3 <- 4, 1 <- 5, and 10 <- 11 where 10 has been deleted
+PARENTS = {1: None, 2: 1, 3: 2, 4: 3, 5: 1, 11: 10}
+
+
+class _Status(object):
+    def __init__(self, id_):
+        self._json = {'id': id_, 'text': 'status %d' % id_, 'in_reply_to_status_id': PARENTS[id_]}
+
+
+@pytest.fixture
+def tp(tp):
+    tp.client.statuses_lookup.side_effect = lambda id_=None: [_Status(i) for i in id_ if i in PARENTS]
+    return tp
+
+
+def test_thread_roots_with_pointer_jumping():
+    df = thread_roots([2, 3, 4, 5, 6], [1, 2, 3, 1, None])
+
+    assert df.loc[4, 'root_id'] == 1
+    assert df.loc[4, 'depth'] == 3
+    assert df.loc[5, 'depth'] == 1
+    assert df.loc[6, 'root_id'] == 6
+    assert df.loc[1, 'depth'] == 0
+
+
+def test_reply_threads_hydrates_one_level_per_call(tp):
+    statuses = pd.DataFrame({'id': [4, 5, 11], 'in_reply_to_status_id': [3, 1, 10]})
+
+    threads = tp.reply_threads(statuses)
+
+    # level 1: 1, 3 and 10; level 2: 2 (1 is a root and 10 is gone)
+    assert tp.client.statuses_lookup.call_count == 2
+    assert tp.client.statuses_lookup.call_args_list[0].kwargs['id_'] == [1, 3, 10]
+    assert threads.statuses['root_id'].tolist() == [1, 1, 10]
+    assert threads.statuses['depth'].tolist() == [3, 1, 1]
+    assert sorted(threads.edges['status_id'].tolist()) == [2, 3, 4, 5, 11]
+    assert sorted(threads.ancestors['id'].tolist()) == [1, 2, 3]
+
+
+def test_reply_threads_caches_known_links(tp):
+    tp.reply_threads(pd.DataFrame({'id': [4], 'in_reply_to_status_id': [3]}))
+    calls = tp.client.statuses_lookup.call_count
+
+    threads = tp.reply_threads(pd.DataFrame({'id': [3], 'in_reply_to_status_id': [2]}))
+
+    assert tp.client.statuses_lookup.call_count == calls
+    assert threads.statuses['depth'].tolist() == [2]
+    assert sorted(threads.edges['status_id'].tolist()) == [2, 3]
+
+
+def test_max_depth_stops_walking(tp):
+
+    threads = tp.reply_threads(pd.DataFrame({'id': [4], 'in_reply_to_status_id': [3]}), max_depth=1)
+
+    assert tp.client.statuses_lookup.call_count == 1
+    assert threads.statuses['root_id'].tolist() == [2]
+
+
+def test_walk_resumes_past_cached_links(tp):
+    tp.reply_threads(pd.DataFrame({'id': [4], 'in_reply_to_status_id': [3]}), max_depth=1)
+
+    threads = tp.reply_threads(pd.DataFrame({'id': [4], 'in_reply_to_status_id': [3]}))
+
+    looked_up = [c.kwargs['id_'] for c in tp.client.statuses_lookup.call_args_list]
+    assert looked_up == [[3], [2], [1]]
+    assert threads.statuses['root_id'].tolist() == [1]
+
+
+def test_snowflake_ids_keep_every_digit(tp):
+    root, reply, tail = 1234567890123456789, 1234567890123456801, 1234567890123456813
+    parents = {root: None, reply: root, tail: reply}
+
+    tp.client.statuses_lookup.side_effect = lambda id_=None: [
+        mock.MagicMock(_json={'id': i, 'in_reply_to_status_id': parents[i]}) for i in id_ if i in parents
+    ]
+
+    # a column with nulls in it is float64 and has lost the low digits, the _str column hasn't
+    statuses = pd.DataFrame({
+        'id': [tail, 42],
+        'in_reply_to_status_id': [float(reply), None],
+        'in_reply_to_status_id_str': [str(reply), None],
+    })
+    threads = tp.reply_threads(statuses)
+
+    assert [c.kwargs['id_'] for c in tp.client.statuses_lookup.call_args_list] == [[reply], [root]]
+    assert threads.statuses['root_id'].tolist() == [root, 42]
+    assert threads.statuses['depth'].tolist() == [2, 0]
+    assert sorted(threads.edges['in_reply_to_status_id'].tolist()) == [root, reply]
+
+    df = thread_roots([tail, reply], pd.array([reply, root], dtype='Int64'))
+    assert df.loc[tail, 'root_id'] == root
+
+
+def test_reply_cache_is_capped(tp):
+    tp.reply_cache_size = 3
+
+    tp.reply_threads(pd.DataFrame({'id': [4, 5, 11], 'in_reply_to_status_id': [3, 1, 10]}))
+
+    assert len(tp._reply_parents) == 3
+
+
+def test_reply_threads_share_the_cache_across_threads(tp):
+    tp.reply_cache_size = 2
+    statuses = pd.DataFrame({'id': [4, 5, 11], 'in_reply_to_status_id': [3, 1, 10]})
+
+    # a small cache evicted from by every call while the others read it
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: tp.reply_threads(statuses), range(200)))
+
+    for result in results:
+        assert result.statuses['root_id'].tolist() == [1, 1, 10]
+        assert result.statuses['depth'].tolist() == [3, 1, 1]
+    assert len(tp._reply_parents) == 2
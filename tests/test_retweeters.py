@@ -0,0 +1,45 @@
+"""Tests for batched retweeter edges."""
+
+import pytest
+
+RETWEETERS = {1: [10, 11, 12], 2: [], 3: [11, 13]}
+
+
+class _User(object):
+    def __init__(self, id_):
+        self._json = {'id': id_, 'screen_name': 'user_%d' % id_}
+
+
+@pytest.fixture
+def tp(tp):
+    tp.client.lookup_users.side_effect = lambda user_ids=None: [_User(i) for i in user_ids]
+    return tp
+
+
+@pytest.fixture(autouse=True)
+def cursor(cursor):
+    # each status's retweeter ids, 2 per page
+    return cursor.serve(lambda method, id=None: RETWEETERS[id], page_size=2)
+
+
+def test_retweeters_returns_edges_per_status(tp):
+    edges = tp.retweeters([1, 2, 3, 1])
+
+    assert list(edges.columns) == ['status_id', 'user_id']
+    assert list(zip(edges['status_id'], edges['user_id'])) == [(1, 10), (1, 11), (1, 12), (3, 11), (3, 13)]
+    assert str(edges['user_id'].dtype) == 'int64'
+    tp.client.lookup_users.assert_not_called()
+
+
+def test_retweeters_limit_per_status(tp):
+    edges = tp.retweeters([1, 3], limit=1)
+
+    assert edges['user_id'].tolist() == [10, 11]
+
+
+def test_retweeters_hydrates_distinct_users_once(tp):
+    edges, users = tp.retweeters([1, 3], hydrate=True)
+
+    assert len(edges) == 5
+    assert tp.client.lookup_users.call_count == 1
+    assert users['id'].tolist() == [10, 11, 12, 13]
@@ -0,0 +1,76 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from twitterpandas.sampling import sample_size, uniform_sample, population_statistics
+
+FOLLOWER_IDS = list(range(1, 20001))
+
+
+def _user(user_id):
+    return mock.MagicMock(_json={
+        'id': user_id,
+        'lang': 'en' if user_id % 2 else ('es' if user_id % 4 else 'fr'),
+        'verified': user_id % 10 == 0,
+        'location': 'Atlanta' if user_id % 3 == 0 else '',
+        'followers_count': user_id % 1000,
+    })
+
+
+@pytest.fixture
+def tp(tp):
+    tp.client.lookup_users.side_effect = lambda user_ids: [_user(user_id) for user_id in user_ids]
+    return tp
+
+
+def test_sample_size_and_uniform_sample():
+    # the textbook 385 for a large population, fewer for a small one
+    assert sample_size(10 ** 9) == 385
+    assert sample_size(20000) == 377
+    assert sample_size(100) == 80
+    assert sample_size(100, margin=0.001) == 100
+
+    ids = list(range(1000))
+    sample = uniform_sample(ids, 100, seed=7)
+    assert len(set(sample)) == 100
+    assert sample == uniform_sample(ids, 100, seed=7)
+    assert uniform_sample(ids[:10], 100) == ids[:10]
+
+
+def test_follower_sample_hydrates_only_the_sample(tp, cursor):
+    # followers_ids, 5000 ids per page
+    cursor.serve(FOLLOWER_IDS, page_size=5000)
+
+    result = tp.follower_sample(user_id=1, seed=3)
+
+    assert result.population == 20000
+    assert len(result.sample) == 377
+    assert tp.client.lookup_users.call_count == 4
+    assert all(len(c[1]['user_ids']) <= 100 for c in tp.client.lookup_users.call_args_list)
+
+    stats = result.statistics.set_index(['field', 'statistic', 'value'])
+    truths = {
+        ('lang', 'share', 'en'): 0.5,
+        ('lang', 'share', 'fr'): 0.25,
+        ('verified', 'share', True): 0.1,
+        ('has_location', 'share', True): 1 / 3.0,
+        ('followers_count', 'mean', None): np.mean([i % 1000 for i in FOLLOWER_IDS]),
+        ('followers_count', 'quantile', 0.5): 500,
+    }
+    for key, truth in truths.items():
+        row = stats.loc[key]
+        assert row['lower'] <= truth <= row['upper'], key
+        assert row['n'] == 377
+
+
+def test_intervals_narrow_with_the_finite_population_correction():
+    sample = pd.DataFrame({'verified': [True] * 50 + [False] * 50, 'followers_count': range(100)})
+
+    infinite = population_statistics(sample, categorical=['verified'], numeric=['followers_count'])
+    whole = population_statistics(sample, population=100, categorical=['verified'], numeric=['followers_count'])
+
+    width = lambda df: (df['upper'] - df['lower']).iloc[0]
+    assert width(infinite) > 0.15
+    assert width(whole) == 0
@@ -0,0 +1,134 @@
+"""Tests for time-sharded tweet search."""
+
+import queue
+import threading
+import time
+from unittest import mock
+
+import pandas as pd
+
+from twitterpandas.ratelimit import RateBudget
+from twitterpandas.snowflake import datetime_to_snowflake, shard_ids, snowflake_to_datetime
+
+
+class _FakeStatus(object):
+    def __init__(self, id_):
+        self._json = {'id': id_, 'text': 'status %d' % id_, 'user': {'id': 1}}
+
+
+class _FakeSearchCursor(object):
+    """Serves statuses from a shared pool that fall in the cursor's (since_id, max_id] range, 2 per page."""
+
+    def __init__(self, ids, since_id=None, max_id=None, **kwargs):
+        self.ids = sorted([i for i in ids if since_id < i <= max_id], reverse=True)
+
+    def pages(self):
+        for start in range(0, len(self.ids), 2):
+            yield [_FakeStatus(i) for i in self.ids[start:start + 2]]
+
+
+def _search_ids(since, until, n):
+    start = datetime_to_snowflake(since)
+    end = datetime_to_snowflake(until)
+    step = (end - start) // (n + 1)
+    return [start + step * (i + 1) for i in range(n)]
+
+
+def test_snowflake_round_trip():
+    dt = pd.Timestamp('2016-05-14 18:38:50')
+    assert snowflake_to_datetime(datetime_to_snowflake(dt)) == dt
+
+
+def test_shard_ids_cover_the_window():
+    bounds = shard_ids('2016-01-01', '2016-01-02', 4)
+
+    assert len(bounds) == 5
+    assert bounds[0] == datetime_to_snowflake('2016-01-01')
+    assert bounds[-1] == datetime_to_snowflake('2016-01-02')
+    assert bounds == sorted(bounds)
+
+
+def test_search_merges_shards_newest_first(tp):
+    since, until = '2016-01-01', '2016-01-02'
+    ids = _search_ids(since, until, 9)
+
+    def fake_cursor(method, **kwargs):
+        return _FakeSearchCursor(ids, **kwargs)
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', side_effect=fake_cursor) as cursor:
+        df = tp.search('pandas', since=since, until=until, shards=3)
+
+    assert cursor.call_count == 3
+    assert cursor.call_args.kwargs['count'] == 100
+    assert df['id'].tolist() == sorted(ids, reverse=True)
+
+
+def test_search_respects_limit(tp):
+    since, until = '2016-01-01', '2016-01-02'
+    ids = _search_ids(since, until, 9)
+
+    def fake_cursor(method, **kwargs):
+        return _FakeSearchCursor(ids, **kwargs)
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', side_effect=fake_cursor):
+        df = tp.search('pandas', since=since, until=until, shards=3, max_workers=1, limit=4)
+
+    assert len(df) == 4
+    assert df['id'].is_unique
+
+
+def test_search_limit_keeps_the_newest_statuses_when_older_shards_answer_first(tp):
+    since, until = '2016-01-01', '2016-01-02'
+    ids = _search_ids(since, until, 12)
+    newest_shard = shard_ids(since, until, 3)[-2]
+
+    def fake_cursor(method, **kwargs):
+        cursor = _FakeSearchCursor(ids, **kwargs)
+        if kwargs['since_id'] == newest_shard:
+            # the newest shard is the slowest to answer
+            pages = cursor.pages
+            cursor.pages = lambda: (time.sleep(0.05) or page for page in pages())
+        return cursor
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', side_effect=fake_cursor):
+        df = tp.search('pandas', since=since, until=until, shards=3, max_workers=3, limit=6)
+
+    assert df['id'].tolist() == sorted(ids, reverse=True)[:6]
+
+
+def test_search_stream_yields_frames_per_page(tp):
+    since, until = '2016-01-01', '2016-01-02'
+    ids = _search_ids(since, until, 6)
+
+    def fake_cursor(method, **kwargs):
+        return _FakeSearchCursor(ids, **kwargs)
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', side_effect=fake_cursor):
+        frames = list(tp.search('pandas', since=since, until=until, shards=2, stream=True))
+
+    assert all(isinstance(frame, pd.DataFrame) for frame in frames)
+    assert sorted(pd.concat(frames)['id'].tolist()) == sorted(ids)
+
+
+def test_a_stopped_shard_makes_no_more_calls(tp):
+    budget = RateBudget(1, window=900)
+    budget.acquire()
+    stop = threading.Event()
+    pages = queue.Queue()
+    fetched = []
+
+    def fake_cursor(method, **kwargs):
+        return mock.MagicMock(pages=lambda: (fetched.append(page) or [] for page in range(3)))
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', side_effect=fake_cursor):
+        shard = threading.Thread(target=tp._search_shard, args=(pages, 0, 'q', 1, 2, budget, stop))
+        shard.start()
+        time.sleep(0.05)
+        stop.set()
+        shard.join(1)
+
+    # it was waiting on the spent budget, and left without taking a call or fetching a page
+    assert not shard.is_alive()
+    assert pages.get_nowait() == (0, None)
+    assert fetched == []
+    assert budget.remaining == 0
@@ -0,0 +1,86 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from twitterpandas.sketch import FollowerSketch, SketchBank, hash_ids
+
+# three accounts: 0..59999, 30000..89999 (jaccard 1/3) and 200000..209999 (disjoint)
+FOLLOWERS = {
+    1: np.arange(0, 60000),
+    2: np.arange(30000, 90000),
+    3: np.arange(200000, 210000),
+}
+
+
+@pytest.fixture
+def tp(tp):
+    tp.client.lookup_users.side_effect = lambda user_ids: [
+        mock.MagicMock(_json={'id': user_id, 'followers_count': len(FOLLOWERS[user_id])}) for user_id in user_ids
+    ]
+    return tp
+
+
+@pytest.fixture
+def cursor(cursor):
+    # followers_ids, 5000 ids per page
+    return cursor.serve(lambda method, user_id=None, **kwargs: FOLLOWERS[user_id].tolist(), page_size=5000)
+
+
+def _pages(cursor):
+    # the user of each page fetched, in order
+    return [built.kwargs['user_id'] for built in cursor.built for _ in range(built.fetched)]
+
+
+def test_hashes_are_stable_and_sketches_estimate_counts():
+    assert hash_ids([1, 2]).tolist() == hash_ids(np.array([1, 2])).tolist()
+    assert len(set(hash_ids(np.arange(100000)).tolist())) == 100000
+
+    sketch = FollowerSketch(precision=12, k=128)
+    for start in range(0, 60000, 5000):
+        sketch.update(np.arange(start, start + 5000))
+    # repeated ids don't count twice
+    sketch.update(np.arange(0, 5000))
+
+    assert sketch.seen == 65000
+    assert len(sketch.minhash) == 128
+    assert abs(sketch.cardinality() - 60000) / 60000 < 0.05
+
+    small = FollowerSketch(precision=12)
+    small.update(range(50))
+    assert round(small.cardinality()) == 50
+
+
+def test_client_builds_and_persists_a_bank(tp, cursor, tmp_path):
+    path = str(tmp_path / 'sketches.npz')
+
+    bank = tp.follower_sketches([1, 2], path=path, precision=12, k=512)
+
+    assert all(bank[user_id].complete for user_id in [1, 2])
+    assert abs(bank.union() - 90000) / 90000 < 0.05
+
+    jaccard = bank.jaccard()
+    assert abs(jaccard.loc[1, 2] - 1 / 3.0) < 0.07
+    assert abs(bank.overlap().loc[1, 2] - 30000) / 30000 < 0.2
+
+    # the saved bank is reused, only the new account is paged
+    cursor.built = []
+    bank = tp.follower_sketches([1, 2, 3], path=path)
+
+    assert set(_pages(cursor)) == {3}
+    assert bank.precision == 12
+    assert SketchBank.load(path).user_ids == [1, 2, 3]
+    assert bank.jaccard().loc[1, 3] < 0.01
+    expected = np.array([60000, 60000, 10000])
+    assert (np.abs(bank.cardinality().values - expected) / expected < 0.05).all()
+
+
+def test_early_stop_scales_up_from_the_sample(tp, cursor):
+    bank = tp.follower_sketches([1, 2], precision=12, k=512, target_error=0.005)
+
+    # sqrt(0.25 / n * (60000 - n) / 59999) first drops to 0.005 at n = 8000ish, two pages of 5000
+    assert _pages(cursor) == [1, 1, 2, 2]
+    assert not bank[1].complete
+    assert bank[1].seen == 10000
+    assert bank[1].sampling_error() <= 0.005
+    assert bank.cardinality().to_dict() == {1: 60000.0, 2: 60000.0}
@@ -0,0 +1,75 @@
+import os
+
+import pandas as pd
+import pytest
+
+from twitterpandas.spool import SpoolWriter, spool_parts, read_part, parse_spool
+
+
+class _User(object):
+    def __init__(self, id_):
+        self._json = {'id': id_, 'screen_name': 'user_%d' % id_, 'status': {'id': id_ * 10, 'entities': {'urls': []}}}
+
+
+@pytest.fixture
+def cursor(cursor):
+    return cursor.serve([_User(i) for i in range(1, 11)], page_size=3)
+
+
+def screen_names_only(items):
+    return pd.DataFrame({'screen_name': [item['screen_name'] for item in items]})
+
+
+def test_spool_writer_rolls_parts_and_round_trips(tmp_path):
+    with SpoolWriter(str(tmp_path), part_size=4) as writer:
+        writer.write_page([{'id': 1}, {'id': 2}, {'id': 3}])
+        writer.write_page([{'id': 4}, {'id': 5}])
+        writer.write_page([6])
+
+    parts = spool_parts(str(tmp_path))
+    assert len(parts) == 2
+    assert [item for part in parts for item in read_part(part)] == [{'id': i} for i in range(1, 6)] + [6]
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+
+
+def test_spool_writes_raw_pages_up_to_limit(tp, cursor, tmp_path):
+    written = tp.spool('followers', str(tmp_path), limit=7, screen_name='someone')
+
+    assert written == 7
+    assert cursor.call_args.kwargs['screen_name'] == 'someone'
+    items = [item for part in spool_parts(str(tmp_path)) for item in read_part(part)]
+    assert [item['id'] for item in items] == list(range(1, 8))
+    # stored raw, not flattened
+    assert items[0]['status']['entities'] == {'urls': []}
+
+
+def test_parse_spool_matches_flattened_output_and_reruns_with_new_parser(tp, cursor, tmp_path):
+    spool_dir = str(tmp_path / 'spool')
+
+    tp.spool('followers', spool_dir, part_size=4)
+    # a second run spools the same users again
+    tp.spool('followers', spool_dir, part_size=4)
+
+    df = tp.parse_spool(spool_dir, max_workers=2)
+    assert df['id'].tolist() == list(range(1, 11))
+    assert df.loc[0, 'status.id'] == 10
+    assert 'status.entities.urls' in df.columns
+
+    names = parse_spool(spool_dir, parser=screen_names_only, max_workers=2, dedupe=False)
+    assert list(names.columns) == ['screen_name']
+    assert len(names) == 20
+
+
+def test_parse_spool_to_parquet(tmp_path):
+    spool_dir, out_dir = str(tmp_path / 'spool'), str(tmp_path / 'parquet')
+    with SpoolWriter(spool_dir, part_size=2) as writer:
+        writer.write_page([1, 2])
+        writer.write_page([3])
+
+    paths = parse_spool(spool_dir, output=out_dir, max_workers=1)
+    assert len(paths) == 2
+    assert pd.concat([pd.read_parquet(p) for p in paths])['id'].tolist() == [1, 2, 3]
+
+    # re-parsing replaces the parquet files rather than adding to them
+    assert parse_spool(spool_dir, output=out_dir, max_workers=1) == paths
+    assert len(os.listdir(out_dir)) == 2
@@ -0,0 +1,104 @@
+"""Tests for streaming into dataframe micro-batches, against a local fake stream endpoint."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+import pytest
+
+from twitterpandas import stream as streaming
+from twitterpandas.stream import TweetStream
+
+
+def _status(id_):
+    return {'id': id_, 'text': 'status %d' % id_, 'user': {'id': 1, 'screen_name': 'example'}}
+
+
+class _FakeStreamHandler(BaseHTTPRequestHandler):
+    lines = []
+    requests = []
+
+    def _serve(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        type(self).requests.append((self.command, self.path, self.rfile.read(length).decode('utf-8')))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        for line in type(self).lines:
+            self.wfile.write(line.encode('utf-8') + b'\r\n')
+            self.wfile.flush()
+
+    do_GET = _serve
+    do_POST = _serve
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_stream():
+    _FakeStreamHandler.requests = []
+    _FakeStreamHandler.lines = (
+        [json.dumps(_status(i)) for i in range(1, 4)] +
+        ['', json.dumps({'limit': {'track': 7}})] +
+        [json.dumps(_status(i)) for i in range(4, 6)]
+    )
+    server = HTTPServer(('127.0.0.1', 0), _FakeStreamHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:%d/1.1/statuses/filter.json' % server.server_port
+    server.shutdown()
+    server.server_close()
+
+
+def test_batches_flush_by_row_count(fake_stream):
+    stream = TweetStream(fake_stream, batch_size=2, flush_interval=60, max_retries=0).start()
+
+    frames = list(stream.batches())
+
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+    assert [i for frame in frames for i in frame['id']] == [1, 2, 3, 4, 5]
+    assert 'user.screen_name' in frames[0].columns
+    assert stream.metrics['received'] == 5
+    assert stream.metrics['undelivered'] == 7
+    assert stream.metrics['batches'] == 3
+
+
+def test_full_buffer_drops_oldest(fake_stream):
+    stream = TweetStream(fake_stream, batch_size=10, buffer_size=3, max_retries=0).start()
+    stream._thread.join(5)
+
+    frames = list(stream.batches())
+
+    assert [i for frame in frames for i in frame['id']] == [3, 4, 5]
+    assert stream.metrics['dropped'] == 2
+    assert stream.metrics['high_water'] == 3
+
+
+def test_filter_stream_posts_parameters(tp, fake_stream):
+    tp.client.auth.apply_auth.return_value = None
+
+    with mock.patch.object(streaming, 'FILTER_URL', fake_stream):
+        stream = tp.filter_stream(track=['pandas', 'python'], languages=['en'], batch_size=5, max_retries=0)
+        frames = list(stream)
+
+    method, path, body = _FakeStreamHandler.requests[0]
+    assert method == 'POST'
+    assert 'track=pandas%2Cpython' in body
+    assert 'language=en' in body
+    assert sum(len(frame) for frame in frames) == 5
+
+
+def test_batches_come_back_in_the_clients_backend(tp, fake_stream):
+    pyarrow = pytest.importorskip('pyarrow')
+    tp.backend = 'pyarrow'
+    tp.client.auth.apply_auth.return_value = None
+
+    with mock.patch.object(streaming, 'FILTER_URL', fake_stream):
+        frames = list(tp.filter_stream(track=['pandas'], batch_size=5, max_retries=0))
+
+    assert all(isinstance(frame, pyarrow.Table) for frame in frames)
+    assert [i for frame in frames for i in frame.column('id').to_pylist()] == [1, 2, 3, 4, 5]
+    assert 'user.screen_name' in frames[0].column_names
@@ -0,0 +1,232 @@
+import functools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from twitterpandas.ratelimit import RateBudget
+from twitterpandas.userstore import UserStore
+
+PAGES = 3
+PER_PAGE = 10
+
+
+class _Model(object):
+    def __init__(self, data):
+        self._json = data
+        self._api = None
+
+
+def _user(user_id):
+    return {'id': user_id, 'screen_name': 'user%d' % user_id, 'followers_count': user_id, 'lang': 'en'}
+
+
+def _status(status_id):
+    return {'id': status_id, 'text': 'status %d' % status_id, 'user': _user(status_id % 7 + 1)}
+
+
+def _page_ids(page):
+    return [page * PER_PAGE + k + 1 for k in range(PER_PAGE)]
+
+
+def _api_call(method):
+    @functools.wraps(method)
+    def call(self, *args, **kwargs):
+        with self._lock:
+            self.threads.add(threading.get_ident())
+        # two threads inside one API at once is what a client per thread is there to prevent
+        if not self._busy.acquire(blocking=False):
+            with self._lock:
+                self.overlaps += 1
+            return method(self, *args, **kwargs)
+        try:
+            time.sleep(0.0005)
+            return method(self, *args, **kwargs)
+        finally:
+            self._busy.release()
+
+    return call
+
+
+class _FakeAPI(object):
+    """Stand-in for tweepy.API with canned pages, recording the threads that use it."""
+
+    built = []
+
+    def __init__(self):
+        self.threads = set()
+        self.overlaps = 0
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        _FakeAPI.built.append(self)
+
+    @_api_call
+    def followers(self, page=0, **kwargs):
+        return [_Model(_user(i)) for i in _page_ids(page)]
+
+    friends = search_users = list_members = list_subscribers = followers
+
+    @_api_call
+    def followers_ids(self, page=0, **kwargs):
+        return _page_ids(page)
+
+    friends_ids = retweeters = followers_ids
+
+    @_api_call
+    def home_timeline(self, page=0, **kwargs):
+        return [_Model(_status(1000 - i)) for i in _page_ids(page)]
+
+    user_timeline = retweets_of_me = favorites = list_timeline = home_timeline
+
+    @_api_call
+    def lookup_users(self, user_ids=None, screen_names=None):
+        if screen_names is not None:
+            user_ids = [int(name[len('user'):]) for name in screen_names]
+        return [_Model(_user(int(i))) for i in user_ids]
+
+    @_api_call
+    def get_user(self, id=None, user_id=None, screen_name=None):
+        return _Model(_user(int(user_id if user_id is not None else screen_name[len('user'):])))
+
+    @_api_call
+    def me(self):
+        return _Model(_user(1))
+
+    @_api_call
+    def statuses_lookup(self, id_=None, **kwargs):
+        return [_Model(_status(int(i))) for i in id_]
+
+    @_api_call
+    def get_status(self, id_):
+        return _Model(_status(int(id_)))
+
+    @_api_call
+    def retweets(self, id_, count):
+        return [_Model(_status(id_ * 100 + i)) for i in range(count)]
+
+
+class _FakeCursor(object):
+    """Stand-in for tweepy.Cursor, calling the method once per page."""
+
+    def __init__(self, method, **kwargs):
+        self.method = method
+        self.kwargs = kwargs
+
+    def pages(self):
+        for page in range(PAGES):
+            yield self.method(page=page, **self.kwargs)
+
+
+def test_each_thread_gets_its_own_api(make_client):
+    tp = make_client(client=None, _api_factory=mock.MagicMock(side_effect=lambda: object()))
+
+    barrier = threading.Barrier(4)
+
+    def apis(_):
+        barrier.wait()
+        return threading.get_ident(), tp.client, tp.client
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        seen = list(executor.map(apis, range(4)))
+
+    # one per thread, kept for that thread's later calls
+    assert all(first is second for _, first, second in seen)
+    assert len({id(first) for _, first, _ in seen}) == len({thread for thread, _, _ in seen}) == 4
+    assert tp._api_factory.call_count == 4
+
+    # a client that is assigned is used by every thread
+    shared = mock.MagicMock()
+    tp.client = shared
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert all(api is shared for api in executor.map(lambda _: tp.client, range(8)))
+
+
+def test_rate_budgets_are_shared_across_threads(tp):
+    barrier = threading.Barrier(8)
+
+    def budget(_):
+        barrier.wait()
+        return tp.rate_budget('list_members')
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        budgets = list(executor.map(budget, range(8)))
+
+    assert all(b is budgets[0] for b in budgets)
+    assert budgets[0].calls == 900
+    assert tp.rate_budget('retweeters') is not budgets[0]
+
+    # calls taken at once from many threads are all counted, none lost
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: budgets[0].acquire(), range(400)))
+    assert budgets[0].remaining == 500
+
+
+def test_read_methods_from_many_threads(make_client, tmpdir):
+    _FakeAPI.built = []
+    tp = make_client(client=None, _api_factory=_FakeAPI, batch_window=0.01,
+                     user_store=UserStore(str(tmpdir.join('users.db'))))
+
+    # roomy windows, so the test checks the accounting without waiting on it
+    tp._budgets = {endpoint: RateBudget(100000) for endpoint in ['list_members', 'list_timeline', 'retweeters']}
+
+    n = PAGES * PER_PAGE
+    lists = [('owner', 'a'), ('owner', 'b')]
+    calls = [
+        (lambda: tp.followers(screen_name='a'), n),
+        (lambda: tp.followers(screen_name='a', strategy='ids'), n),
+        (lambda: tp.friends(screen_name='a', strategy='list'), n),
+        (lambda: len(tp.followers(screen_name='a', lazy=True).head(5)), 5),
+        (lambda: tp.friends_friendships(screen_name='a'), n),
+        (lambda: tp.search_users(query='q'), n),
+        (lambda: tp.follower_sample(screen_name='a', size=5, seed=1).population, n),
+        (lambda: tp.me(), 1),
+        (lambda: tp.home_timeline(), n),
+        (lambda: tp.user_timeline(screen_name='a'), n),
+        (lambda: tp.retweets_of_me(), n),
+        (lambda: tp.favorites(), n),
+        (lambda: tp.statuses_lookup(id_=[1, 2, 3]), 3),
+        (lambda: tp.retweets(5, 3), 3),
+        (lambda: tp.list_timeline('owner', 'a'), n),
+        (lambda: tp.list_members('owner', 'a'), n),
+        (lambda: tp.list_subscribers('owner', 'a'), n),
+        (lambda: tp.multi_list_members(lists), 2 * n),
+        (lambda: tp.multi_list_timeline(lists), 2 * n),
+        (lambda: tp.retweeters([1, 2]), 2 * n),
+    ]
+    for user_id in range(25, 45):
+        calls.append((lambda user_id=user_id: tp.get_user(user_id=user_id)['id'].tolist(), [user_id]))
+        calls.append((lambda user_id=user_id: tp.get_user(screen_name='user%d' % user_id)['id'].tolist(), [user_id]))
+        calls.append((lambda user_id=user_id: tp.get_status(user_id)['id'].tolist(), [user_id]))
+
+    def worker(seed):
+        order = list(calls) * 2
+        random.Random(seed).shuffle(order)
+        for call, expected in order:
+            result = call()
+            assert (result if isinstance(expected, list) or isinstance(result, int) else len(result)) == expected
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', _FakeCursor):
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for future in [executor.submit(worker, seed) for seed in range(16)]:
+                future.result()
+
+    # every api was only ever used by the thread that built it, prefetch and pool threads included
+    assert len(_FakeAPI.built) > 16
+    assert all(len(api.threads) <= 1 for api in _FakeAPI.built)
+    assert sum(api.overlaps for api in _FakeAPI.built) == 0
+
+    # every call of the budgeted methods was counted against the one shared budget of its endpoint, a call is taken
+    # before each page and once more before finding the cursor has ended
+    budgets = tp._budgets
+    taken = {endpoint: budget.calls - budget.remaining for endpoint, budget in budgets.items()}
+    runs = 16 * 2
+    assert taken == {
+        'list_members': runs * len(lists) * (PAGES + 1),
+        'list_timeline': runs * len(lists) * (PAGES + 1),
+        'retweeters': runs * 2 * (PAGES + 1),
+    }
+
+    assert tp.list_watermarks()['since_id'].tolist() == [999, 999]
+    assert len(tp.user_store.users()) > 0
+    tp.user_store.close()
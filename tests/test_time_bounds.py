@@ -0,0 +1,89 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from twitterpandas.snowflake import (datetime_to_snowflake, snowflake_to_datetime, snowflakes_to_datetimes,
+                                     datetimes_to_snowflakes, id_bounds)
+
+NOW = pd.Timestamp('2016-06-01 12:00:00')
+
+
+class _Status(object):
+    def __init__(self, id_):
+        self._json = {'id': id_, 'text': 'status %d' % id_}
+
+
+class _FakeTimelineCursor(object):
+    """Stand-in for tweepy.Cursor over a timeline with one status an hour, newest first, 3 per page."""
+
+    def __init__(self, method, since_id=None, max_id=None, **kwargs):
+        self.since_id = since_id
+        self.max_id = max_id
+        self.kwargs = kwargs
+        self.fetched = 0
+        ids = [datetime_to_snowflake(NOW - pd.Timedelta(hours=h)) + 1 for h in range(100)]
+        self.ids = [i for i in ids if (max_id is None or i <= max_id) and (since_id is None or i > since_id)]
+
+    def pages(self):
+        for start in range(0, len(self.ids), 3):
+            self.fetched += 1
+            yield [_Status(i) for i in self.ids[start:start + 3]]
+
+
+def test_vectorized_conversions_match_the_scalar_ones():
+    times = pd.Series([pd.Timestamp('2015-01-01'), pd.Timestamp('2016-06-01 12:34:56.789'), pd.NaT], index=[3, 1, 2])
+    ids = datetimes_to_snowflakes(times)
+
+    assert list(ids.index) == [3, 1, 2]
+    assert ids[3] == datetime_to_snowflake('2015-01-01')
+    assert pd.isna(ids[2])
+
+    back = snowflakes_to_datetimes(ids)
+    assert back[1] == snowflake_to_datetime(ids[1]) == pd.Timestamp('2016-06-01 12:34:56.789')
+    assert pd.isna(back[2])
+
+    raw = datetimes_to_snowflakes(['2015-01-01', '2016-01-01'])
+    assert isinstance(raw, np.ndarray)
+    assert list(snowflakes_to_datetimes(raw)) == [pd.Timestamp('2015-01-01'), pd.Timestamp('2016-01-01')]
+
+
+def test_id_bounds_keeps_the_tighter_bound():
+    since_id, max_id = id_bounds('2016-01-01', '2016-01-02')
+    assert since_id == datetime_to_snowflake('2016-01-01') - 1
+    assert max_id == datetime_to_snowflake('2016-01-02') - 1
+
+    assert id_bounds('2016-01-01', since_id=2 ** 62)[0] == 2 ** 62
+    assert id_bounds(end='2016-01-02', max_id=5) == (None, 5)
+    assert id_bounds(start='2001-01-01') == (None, None)
+
+
+def test_user_timeline_start_stops_at_the_page_that_crosses_it(tp):
+    cursors = []
+
+    def make_cursor(*args, **kwargs):
+        cursors.append(_FakeTimelineCursor(*args, **kwargs))
+        return cursors[-1]
+
+    with mock.patch('twitterpandas.client.tweepy.Cursor', side_effect=make_cursor):
+        df = tp.user_timeline(screen_name='someone', start=NOW - pd.Timedelta(hours=6.5),
+                              end=NOW - pd.Timedelta(hours=1.5))
+
+    created = snowflakes_to_datetimes(df['id'])
+    assert len(df) == 5
+    assert created.max() < NOW - pd.Timedelta(hours=1.5)
+    assert created.min() >= NOW - pd.Timedelta(hours=6.5)
+    # the start bound isn't sent, the pages are cut off once one reaches it
+    assert cursors[0].since_id is None
+    assert cursors[0].max_id == datetime_to_snowflake(NOW - pd.Timedelta(hours=1.5)) - 1
+    assert cursors[0].fetched == 2
+
+
+def test_favorites_sends_both_bounds(tp):
+    with mock.patch('twitterpandas.client.tweepy.Cursor', side_effect=_FakeTimelineCursor) as patched:
+        df = tp.favorites(start=NOW - pd.Timedelta(hours=3.5), end=NOW)
+
+    # end is exclusive, so the status from exactly NOW is left out
+    assert len(df) == 3
+    assert patched.call_args.kwargs['since_id'] == datetime_to_snowflake(NOW - pd.Timedelta(hours=3.5)) - 1
+    assert patched.call_args.kwargs['max_id'] == datetime_to_snowflake(NOW) - 1
@@ -0,0 +1,85 @@
+"""Tests for the concurrent trends collector and the local trend store."""
+
+import pandas as pd
+import pytest
+import tweepy
+
+from twitterpandas.trends import TrendStore
+
+
+def _trends_place(id=None, exclude=None):
+    return [{
+        'as_of': '2016-05-14T18:00:00Z',
+        'created_at': '2016-05-14T17:55:00Z',
+        'locations': [{'woeid': id, 'name': 'place %d' % id}],
+        'trends': [
+            {'name': '#python', 'query': '%23python', 'tweet_volume': 100 * id, 'promoted_content': None},
+            {'name': '#pandas', 'query': '%23pandas', 'tweet_volume': None, 'promoted_content': None},
+        ],
+    }]
+
+
+def test_trends_place_ranks_topics(tp):
+    tp.client.trends_place.side_effect = _trends_place
+
+    df = tp.trends_place(id_=1)
+
+    assert df['rank'].tolist() == [1, 2]
+    assert df['promoted_content'].isnull().all()
+
+
+def test_collector_caches_catalog_and_stores_snapshots(tp, tmpdir):
+    tp.client.trends_available.return_value = [{'woeid': w, 'name': 'place %d' % w} for w in [1, 2, 3]]
+    tp.client.trends_place.side_effect = _trends_place
+
+    collector = tp.trends_collector(store=str(tmpdir), max_workers=3)
+    first = collector.collect()
+    collector.collect()
+
+    assert tp.client.trends_available.call_count == 1
+    assert tp.client.trends_place.call_count == 6
+    assert len(first) == 6
+
+    stored = collector.store.read(woeids=[2])
+    assert len(stored) == 4
+    assert stored['as_of'].iloc[0] == pd.Timestamp('2016-05-14 18:00:00')
+    assert str(stored['name'].dtype) == 'category'
+
+
+def test_history_pivots_one_trend_over_time(tp, tmpdir):
+    tp.client.trends_place.side_effect = _trends_place
+    store = TrendStore(str(tmpdir))
+
+    store.append(tp.trends_place(id_=1))
+    later = tp.trends_place(id_=1)
+    later['as_of'] = '2016-05-15T18:00:00Z'
+    later['rank'] = [2, 1]
+    store.append(later)
+
+    history = store.history('#python')
+    assert history[1].tolist() == [1, 2]
+
+    assert len(store.read(start='2016-05-15')) == 2
+    assert len(store.read(end='2016-05-14 23:00')) == 2
+
+    # aware bounds are compared in utc, 20:00 in new york is midnight utc on the 15th
+    assert len(store.read(start=pd.Timestamp('2016-05-14 20:00', tz='America/New_York'))) == 2
+    assert len(store.read(start=pd.Timestamp('2016-05-14 13:00', tz='America/New_York'))) == 4
+    assert len(store.read(end='2016-05-14T20:00:00+02:00')) == 2
+
+
+def test_a_failed_location_keeps_the_rest_of_the_round(tp, tmpdir):
+    def trends_place(id=None, exclude=None):
+        if id == 2:
+            raise tweepy.TweepError('Sorry, that page does not exist.')
+        return _trends_place(id=id)
+
+    tp.client.trends_place.side_effect = trends_place
+    collector = tp.trends_collector(store=str(tmpdir), max_workers=3)
+
+    with pytest.warns(UserWarning, match='1 of 3'):
+        df = collector.collect(woeids=[1, 2, 3])
+
+    assert sorted(set(df['woeid'])) == [1, 3]
+    assert len(collector.store.read()) == 4
+    assert collector.failures.values.tolist() == [[2, 'Sorry, that page does not exist.']]
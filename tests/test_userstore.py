@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from twitterpandas.userstore import UserStore
+
+
+def _user(user_id, followers_count=10, description='hi'):
+    return mock.MagicMock(_json={
+        'id': user_id,
+        'screen_name': 'User%d' % user_id,
+        'followers_count': followers_count,
+        'description': description,
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = UserStore(str(tmp_path / 'users.db'), max_age=60)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def tp(tp, store):
+    tp.client.lookup_users.side_effect = lambda user_ids: [_user(user_id) for user_id in user_ids]
+    tp.user_store = store
+    return tp
+
+
+def test_store_tracks_freshness_and_history(tmp_path):
+    store = UserStore(str(tmp_path / 'users.db'), max_age=60)
+
+    store.put([{'id': 1, 'screen_name': 'Alice', 'followers_count': 10, 'description': 'a'}], fetched_at=time.time() - 120)
+    store.put([{'id': 2, 'screen_name': 'bob', 'followers_count': 5}])
+
+    # 1 is stale, 2 is fresh, and screen names match regardless of case
+    assert [u['id'] for u in store.get(user_ids=[1, 2, 3])] == [2]
+    assert [u['id'] for u in store.get(user_ids=[1, 2], max_age=3600)] == [1, 2]
+    assert [u['id'] for u in store.get(screen_names=['BOB', 'alice'])] == [2]
+
+    store.put([{'id': 1, 'screen_name': 'Alice', 'followers_count': 12, 'description': 'a', 'lang': 'en'}])
+    history = store.history(1)
+    assert history[['field', 'old', 'new']].values.tolist() == [['followers_count', 10, 12]]
+    assert len(store.users()) == 2
+    store.close()
+
+
+def test_history_stays_a_chain_when_threads_store_the_same_user(tmp_path):
+    store = UserStore(str(tmp_path / 'users.db'))
+    store.put([{'id': 1, 'followers_count': 0}], fetched_at=1)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda count: store.put([{'id': 1, 'followers_count': count}], fetched_at=1), range(1, 201)))
+
+    # each change starts from the one before it, none recorded twice or against a row already replaced
+    changes = store.history(1)[['old', 'new']].values.tolist()
+    assert len(changes) == 200
+    assert [old for old, _ in changes] == [0] + [new for _, new in changes[:-1]]
+    assert changes[-1][1] == store.get(user_ids=[1], max_age=float('inf'))[0]['followers_count']
+    store.close()
+
+
+def test_lookups_only_fetch_missing_or_stale_users(tp, store):
+
+    assert len(tp._lookup_users(list(range(1, 151)))) == 150
+    assert tp.client.lookup_users.call_count == 2
+
+    # 1..150 are fresh, only the rest are fetched, in one call
+    users = tp._lookup_users(list(range(100, 201)))
+    assert [u['id'] for u in users] == list(range(100, 201))
+    assert tp.client.lookup_users.call_count == 3
+    assert tp.client.lookup_users.call_args[1]['user_ids'] == list(range(151, 201))
+
+    # get_user by id or screen name comes from the store
+    assert tp.get_user(user_id=5)['screen_name'].iloc[0] == 'User5'
+    assert tp.get_user(screen_name='user6')['id'].iloc[0] == 6
+    assert tp.get_user(id_='7')['id'].iloc[0] == 7
+    assert not tp.client.get_user.called
+
+    tp.client.get_user.return_value = _user(500, followers_count=99)
+    assert tp.get_user(user_id=500)['followers_count'].iloc[0] == 99
+    assert store.get(user_ids=[500])[0]['followers_count'] == 99
+
+
+def test_user_methods_write_to_the_store(tp, store, cursor):
+    cursor.serve([_user(1, followers_count=10), _user(2)])
+    tp.followers(user_id=9, strategy='list')
+    tp.list_members('owner', 'slug')
+    assert set(store.users()['id']) == {1, 2}
+    assert store.history().empty
+
+    # a later fetch with a new count is kept as one history row
+    cursor.serve([_user(1, followers_count=20), _user(2)])
+    tp.search_users('q')
+
+    assert store.history()[['user_id', 'field', 'old', 'new']].values.tolist() == [[1, 'followers_count', 10, 20]]
+    assert store.get(user_ids=[1])[0]['followers_count'] == 20
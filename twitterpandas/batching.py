@@ -0,0 +1,107 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: coalesces concurrent single key lookups into shared in-flight results and batched calls
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import threading
+from concurrent.futures import Future
+
+__author__ = 'willmcginnis'
+
+
+class _Batch(object):
+    def __init__(self):
+        self.keys = []
+        self.full = threading.Event()
+
+
+class BatchLoader(object):
+    """
+    Turns single key lookups from many threads into batched calls, in the style of a DataLoader.  A key already being
+    looked up isn't looked up again: every caller asking for it waits on the same result.  A new key joins the open
+    batch; the thread that opened the batch waits up to window seconds (or until max_batch keys have joined), then
+    makes one call for all of them and hands each caller its own result.  Nothing runs in the background, the batch is
+    fetched on a caller's thread, and results aren't kept once delivered.
+
+    """
+
+    def __init__(self, fetch_many, max_batch=100, window=0.005):
+        """
+
+        :param fetch_many: a function taking a list of up to max_batch keys and returning a dict of key to result, keys missing from it raise KeyError for their callers
+        :param max_batch: (optional, default=100) the most keys per call
+        :param window: (optional, default=0.005) seconds to wait for more keys before making a call
+        :return:
+
+        """
+
+        self.fetch_many = fetch_many
+        self.max_batch = max_batch
+        self.window = window
+        self.calls = 0
+
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._open = None
+
+    def load(self, key):
+        """
+        Returns the result for one key, blocking until the batch it is in has been fetched.
+
+        :param key:
+        :return:
+        """
+
+        lead = None
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = Future()
+                if self._open is None:
+                    lead = self._open = _Batch()
+
+                batch = self._open
+                batch.keys.append(key)
+                if len(batch.keys) >= self.max_batch:
+                    # close it, the next new key opens another
+                    batch.full.set()
+                    self._open = None
+
+        if lead is not None:
+            self._fetch(lead)
+
+        return future.result()
+
+    def _fetch(self, batch):
+        batch.full.wait(self.window)
+        with self._lock:
+            if self._open is batch:
+                self._open = None
+            futures = [(key, self._futures[key]) for key in batch.keys]
+            self.calls += 1
+
+        try:
+            results = self.fetch_many(list(batch.keys))
+        except BaseException as e:
+            results, error = {}, e
+        else:
+            error = None
+
+        for key, future in futures:
+            if error is not None:
+                future.set_exception(error)
+            elif key in results:
+                future.set_result(results[key])
+            else:
+                future.set_exception(KeyError(key))
+
+        # keys are shared while in flight, later lookups go to the api again
+        with self._lock:
+            for key, future in futures:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
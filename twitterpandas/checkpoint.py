@@ -0,0 +1,120 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: crash-safe checkpoints of a cursor's position and fetched pages, for resuming long crawls
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import os
+import json
+
+__author__ = 'willmcginnis'
+
+
+class Checkpoint(object):
+    """
+    The progress of one cursor crawl, kept in an append-only JSON-lines state file.  The first line says which endpoint
+    and parameters the crawl is for, then each fetched page is one line holding its items and the cursor position
+    (next_cursor or max_id) to continue from after it, and a last line marks the crawl as done.  A page and its
+    position are written in the same line and synced to disk before the page is used, so a crash leaves either the
+    whole page or none of it, and resuming neither skips nor repeats items.
+
+    """
+
+    def __init__(self, path, endpoint=None, params=None):
+        """
+
+        :param path: the state file, it is created if it doesn't exist and resumed from if it does
+        :param endpoint: (optional) the name of the endpoint being crawled, to check a resumed file against
+        :param params: (optional) the parameters of the crawl, to check a resumed file against
+        :return:
+
+        """
+
+        self.path = path
+        self.endpoint = endpoint
+        self.params = self._jsonable(params or {})
+        self.position = None
+        self.items = []
+        self.pages = 0
+        self.done = False
+
+        if os.path.exists(self.path):
+            self._load()
+        else:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            self._append({'endpoint': self.endpoint, 'params': self.params})
+
+    @staticmethod
+    def _jsonable(params):
+        return json.loads(json.dumps({k: v for k, v in params.items() if v is not None}, default=str))
+
+    def _load(self):
+        valid = 0
+        with open(self.path, 'rb') as f:
+            for n, line in enumerate(f):
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('unterminated line')
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # a line torn by a crash mid-write, everything before it is intact
+                    break
+
+                if n == 0:
+                    found = (record.get('endpoint'), record.get('params'))
+                    if self.endpoint is not None and found != (self.endpoint, self.params):
+                        raise ValueError('The checkpoint at %s is for %s %s, not %s %s' % (
+                            self.path, record.get('endpoint'), record.get('params'), self.endpoint, self.params))
+                    self.endpoint = record.get('endpoint')
+                    self.params = record.get('params')
+                elif record.get('done'):
+                    self.done = True
+                else:
+                    self.items.extend(record['items'])
+                    self.position = record.get('position')
+                    self.pages += 1
+
+                valid += len(line)
+
+        # drop a torn tail so the next page starts on a fresh line
+        if valid < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid)
+
+    def _append(self, record):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record, default=str))
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def save_page(self, items, position=None):
+        """
+        Records a fetched page and the cursor position after it.
+
+        :param items: the raw items in the page
+        :param position: the cursor arguments to continue from, e.g. {'cursor': 1234} or {'max_id': 1234}, None if the cursor doesn't expose one
+        :return:
+        """
+
+        self._append({'position': position, 'items': items})
+        self.items.extend(items)
+        self.position = position
+        self.pages += 1
+
+    def finish(self):
+        """
+        Marks the crawl as done, resuming it again only returns the saved items.
+
+        :return:
+        """
+
+        if not self.done:
+            self._append({'done': True})
+            self.done = True
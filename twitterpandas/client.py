@@ -8,11 +8,39 @@
 
 """
 
+import os
+import json
+import functools
 import warnings
 import sys
 import time
+import threading
+import queue
 import tweepy
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from twitterpandas.prefetch import PrefetchIterator
+from twitterpandas.batching import BatchLoader
+from twitterpandas.checkpoint import Checkpoint
+from twitterpandas.crawler import GraphCrawler
+from twitterpandas.planner import RequestPlanner, page_size
+from twitterpandas.ratelimit import RateBudget
+from twitterpandas.sampling import FollowerSample, sample_size, uniform_sample, population_statistics
+from twitterpandas.sketch import SketchBank
+from twitterpandas.snowflake import shard_ids, id_bounds
+from twitterpandas.spool import SpoolWriter, flatten_items, parse_spool
+from twitterpandas.trends import TrendsCollector
+from twitterpandas.userstore import UserStore
+from twitterpandas.geo import LocationResolver
+from twitterpandas.frames import build_frame, check_backend, to_pandas
+from twitterpandas.lazy import LazyFrame
+from twitterpandas.membership import MembershipMatrix
+from twitterpandas.normalize import normalize_statuses
+from twitterpandas.threads import ReplyThreads, id_values, thread_roots
+from twitterpandas import stream as streaming
+from twitterpandas.utils import flatten_dict
 
 __author__ = 'willmcginnis'
 
@@ -23,9 +51,18 @@ class TwitterPandas(object):
     """
     The primary interface into twitter pandas, the client.
 
+    One client can be shared by a pool of worker threads.  Each thread makes its calls through its own tweepy API (see
+    client), the rate budgets the client paces calls with are shared per endpoint and locked (see rate_budget), and the
+    state the client keeps between calls (the user store, batch loaders and list watermarks) is locked too.  Concurrent
+    calls should not share a resume checkpoint file.
+
     """
 
-    def __init__(self, oauth_token, oauth_secret, consumer_key, consumer_secret, timeout=60):
+    # the most reply links reply_threads keeps between calls, the oldest are dropped first
+    reply_cache_size = 1000000
+
+    def __init__(self, oauth_token, oauth_secret, consumer_key, consumer_secret, timeout=60, prefetch=2,
+                 user_store=None, batch_window=None, backend='pandas'):
         """
         Basic interface to twitter pandas is pretty much a wrapper around tweepy.  As such, we take in very similar args
         to the main constructor.
@@ -35,16 +72,35 @@ class TwitterPandas(object):
         :param consumer_key:
         :param consumer_secret:
         :param timeout:
+        :param prefetch: (optional, default=2) the number of pages cursor methods fetch ahead on a background thread while the current page is parsed, 0 to turn it off
+        :param user_store: (optional) a UserStore, or the path of a SQLite file for one, that every user returned is written to and that get_user and id hydration check first, only fetching users missing from it or stale
+        :param batch_window: (optional) for clients shared between threads: concurrent get_user or get_status calls for the same id share one request, and calls for different ids arriving within this many seconds are merged into one 100-wide lookup
+        :param backend: (optional, default=pandas) what the user and status methods return: pandas for dataframes, pyarrow for pyarrow Tables or polars for polars DataFrames (needs the polars extra), built column by column from the pages (see frames.to_pandas to convert back)
         :return:
 
         """
 
+        # the state kept between calls, and the lock that guards creating and updating it
+        self._client = None
+        self._local = threading.local()
+        self._state_lock = threading.Lock()
+        self._loaders = {}
+        self._budgets = {}
+        self._list_watermarks = {}
+        self._reply_parents = OrderedDict()
+
+        self.prefetch = prefetch
+        self.backend = check_backend(backend)
+        self.user_store = UserStore(user_store) if isinstance(user_store, str) else user_store
+        self.batch_window = batch_window
+
         # configure OAUTH
         auth = tweepy.OAuthHandler(consumer_key, consumer_secret)
         auth.set_access_token(oauth_token, oauth_secret)
 
-        # set up tweepy client
-        self.client = tweepy.API(
+        # set up tweepy clients, one per thread as it first needs one (see client)
+        self._api_factory = functools.partial(
+            tweepy.API,
             auth,
             wait_on_rate_limit=True,
             wait_on_rate_limit_notify=True,
@@ -54,6 +110,29 @@ class TwitterPandas(object):
             retry_errors={401, 404, 500, 503},
         )
 
+    @property
+    def client(self):
+        """
+        The tweepy API of the calling thread.  tweepy keeps the state of the last call (its response, whether it came
+        from the cache) on the API object, so each thread gets its own, built with the same credentials and settings the
+        first time that thread makes a call.  A client assigned to this attribute is used by every thread instead.
+
+        :return:
+        """
+
+        if self._client is not None:
+            return self._client
+
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = self._local.api = self._api_factory()
+
+        return api
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
     # #################################################################
     # #####  Internal functions and protected methods             #####
     # #################################################################
@@ -82,18 +161,379 @@ class TwitterPandas(object):
         :return:
         """
 
-        for _ in range(layers):
-            data = [(k, v) if not isinstance(v, dict) else [(k + '.' + k2, v2) for k2, v2 in v.items()] for k, v in
-                    data.items()]
-            data = [item for sublist in data for item in sublist if isinstance(sublist, list)] + [y for y in data if
-                                                                                                  not isinstance(y,
-                                                                                                                 list)]
-            data = dict(data)
+        return flatten_dict(data, layers=layers, drop_deeper=drop_deeper)
+
+    def _lookup_users(self, user_ids):
+        """
+        Hydrates a list of user ids 100 at a time with users/lookup, returning flattened user dicts in the same order as
+        the ids passed (ids that no longer exist are skipped).
+
+        :param user_ids:
+        :return:
+        """
+
+        batch = page_size('lookup_users')
+
+        # users fresh in the store aren't fetched again
+        by_id = {}
+        if self.user_store is not None:
+            by_id = {user['id']: user for user in self.user_store.get(user_ids=user_ids)}
+        missing = [user_id for user_id in user_ids if user_id not in by_id]
+
+        for start in range(0, len(missing), batch):
+            data = self.retry_call(self.client.lookup_users, 5, user_ids=list(missing[start:start + batch]))
+            fetched = [self._flatten_dict(user._json, layers=3, drop_deeper=True) for user in data]
+            self._store_users(fetched)
+            for user in fetched:
+                by_id[user.get('id')] = user
+
+        return [by_id[user_id] for user_id in user_ids if user_id in by_id]
+
+    def _lookup_screen_names(self, screen_names):
+        """
+        Hydrates a list of screen names 100 at a time with users/lookup, returning flattened user dicts.
+
+        :param screen_names:
+        :return:
+        """
+
+        batch = page_size('lookup_users')
+
+        ds = []
+        for start in range(0, len(screen_names), batch):
+            data = self.retry_call(self.client.lookup_users, 5, screen_names=list(screen_names[start:start + batch]))
+            ds.extend(self._flatten_dict(user._json, layers=3, drop_deeper=True) for user in data)
+
+        return self._store_users(ds)
+
+    def _loader(self, name):
+        """
+        The BatchLoader for users by id (users), users by lowercased screen name (screen_names) or statuses by id
+        (statuses), created on first use and shared by every thread.
+
+        :param name:
+        :return:
+        """
+
+        with self._state_lock:
+            if name not in self._loaders:
+                fetch_many = {
+                    'users': lambda keys: {user['id']: user for user in self._lookup_users(keys)},
+                    'screen_names': lambda keys: {
+                        user['screen_name'].lower(): user for user in self._lookup_screen_names(keys)
+                    },
+                    'statuses': lambda keys: {status['id']: status for status in self._lookup_statuses(keys)},
+                }[name]
+                self._loaders[name] = BatchLoader(fetch_many, max_batch=page_size('lookup_users'),
+                                                  window=self.batch_window)
+
+            return self._loaders[name]
+
+    def _store_users(self, users):
+        """
+        Writes flattened user dicts to the user store, if there is one, and returns them.
+
+        :param users:
+        :return:
+        """
+
+        if self.user_store is not None:
+            self.user_store.put(users)
+
+        return users
+
+    @staticmethod
+    def _page_count(limit, endpoint):
+        """
+        The count to ask an endpoint for: its largest page, or just the limit if that fits in one page.
+
+        :param limit:
+        :param endpoint:
+        :return:
+        """
+
+        count = page_size(endpoint)
+        if limit is not None and count is not None:
+            count = min(limit, count)
+
+        return count
+
+    def _lookup_statuses(self, status_ids):
+        """
+        Hydrates a list of status ids 100 at a time with statuses/lookup, returning the raw json of those that still
+        exist.
+
+        :param status_ids:
+        :return:
+        """
+
+        batch = page_size('statuses_lookup')
+
+        ds = []
+        for start in range(0, len(status_ids), batch):
+            data = self.retry_call(self.client.statuses_lookup, 5, id_=list(status_ids[start:start + batch]))
+            ds.extend(status._json for status in data)
+
+        return ds
+
+    def _cursor_ids(self, endpoint, limit=None, resume=None, **kwargs):
+        """
+        Pages through one of the id endpoints at its maximum page size, returning a list of up to limit ids.
+
+        :param endpoint:
+        :param limit:
+        :param resume: (optional) a checkpoint file path to save progress to and resume from
+        :return:
+        """
+
+        return list(self._iter_ids(endpoint, limit=limit, resume=resume, **kwargs))
+
+    def _iter_ids(self, endpoint, limit=None, resume=None, prefetch=None, **kwargs):
+        """
+        Generator of the ids of one of the id endpoints, paged at its maximum page size.
+
+        :param endpoint:
+        :param limit:
+        :param resume: (optional) a checkpoint file path to save progress to and resume from
+        :param prefetch: (optional) overrides the client's read-ahead
+        :return:
+        """
+
+        checkpoint = self._checkpoint(resume, endpoint, **kwargs)
+        curr = self._cursor(
+            self._endpoint(endpoint),
+            checkpoint,
+            count=self._page_count(limit, endpoint),
+            **kwargs
+        )
+
+        return self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=prefetch)
+
+    def _frame(self, rows):
+        """
+        Builds a frame in the client's backend from an iterable of flat row dicts, column by column.
+
+        :param rows:
+        :return:
+        """
+
+        return build_frame(rows, backend=self.backend)
+
+    def _user_frame(self, users):
+        """
+        Builds the result of a user method from raw user dicts, flattening each a few layers and writing them to the
+        user store.  Without a store the users are flattened straight into the frame's columns as they arrive.
+
+        :param users:
+        :return:
+        """
+
+        rows = (self._flatten_dict(user, layers=3, drop_deeper=True) for user in users)
+        if self.user_store is not None:
+            rows = self._store_users(list(rows))
+
+        return self._frame(rows)
+
+    def _checkpoint(self, resume, endpoint, **params):
+        """
+        The Checkpoint for a crawl of endpoint with params, from the state file resume (created if it doesn't exist),
+        or None if resume is None.
+
+        :param resume:
+        :param endpoint:
+        :param params:
+        :return:
+        """
+
+        if resume is None:
+            return None
+        if isinstance(resume, Checkpoint):
+            return resume
+
+        return Checkpoint(resume, endpoint=endpoint, params=params)
+
+    def _endpoint(self, endpoint):
+        """
+        The tweepy method of an endpoint, for cursors.  A cursor's pages may be fetched on a prefetch thread, so with a
+        client per thread the method returned makes each call through the API of the thread making it, rather than
+        sharing the API of the thread that built the cursor.
+
+        :param endpoint: the name of the tweepy method
+        :return:
+        """
+
+        method = getattr(self.client, endpoint)
+        if self._client is not None:
+            return method
+
+        def call(*args, **kwargs):
+            return getattr(self.client, endpoint)(*args, **kwargs)
+
+        # tweepy.Cursor picks how to page from this
+        if hasattr(method, 'pagination_mode'):
+            call.pagination_mode = method.pagination_mode
+
+        return call
+
+    @staticmethod
+    def _cursor(method, checkpoint=None, **kwargs):
+        """
+        A tweepy cursor over method, starting from where a checkpoint left off if one is passed.
+
+        :param method:
+        :param checkpoint:
+        :return:
+        """
+
+        if checkpoint is not None and checkpoint.position:
+            kwargs.update(checkpoint.position)
+
+        return tweepy.Cursor(method, **kwargs)
+
+    @staticmethod
+    def _cursor_position(curr):
+        """
+        The arguments that start a new cursor where this one will continue from: its next_cursor for cursor paged
+        endpoints or its max_id for id paged ones, None if it has neither.
+
+        :param curr:
+        :return:
+        """
+
+        iterator = getattr(curr, 'iterator', None)
+        if isinstance(getattr(iterator, 'next_cursor', None), int):
+            return {'cursor': iterator.next_cursor}
+        if isinstance(getattr(iterator, 'max_id', None), int):
+            return {'max_id': iterator.max_id}
+
+        return None
+
+    def _pages(self, curr, budget=None, limit=None, positions=False, min_id=None, prefetch=None):
+        """
+        Generator of the pages of a cursor.  Unless the client's prefetch is 0, the next pages are fetched on a
+        background thread while the caller works through the current one.  If a RateBudget is passed a call is taken
+        from it before each page, and with a limit no page is fetched once the pages so far hold that many items.  With
+        positions each page comes with the cursor position after it, as (page, position).  With a min_id, for cursors
+        paging newest first, no page is fetched after one that reaches an id at or below it.  prefetch overrides the
+        client's read-ahead, e.g. 0 for a caller that may stop after any page.
+
+        :param curr:
+        :param budget:
+        :param limit:
+        :param positions:
+        :param min_id:
+        :param prefetch:
+        :return:
+        """
+
+        def fetch():
+            # runs on the prefetch thread, so the position is read right after its own page was fetched
+            n = 0
+            pages = iter(curr.pages())
+            while limit is None or n < limit:
+                if budget is not None:
+                    budget.acquire()
+                try:
+                    page = next(pages)
+                except StopIteration:
+                    return
+                n += len(page)
+                yield (page, self._cursor_position(curr)) if positions else page
+
+                # everything after this page is older still
+                if min_id is not None and any(getattr(item, '_json', item)['id'] <= min_id for item in page):
+                    return
+
+        depth = self.prefetch if prefetch is None else prefetch
+        if not depth:
+            for page in fetch():
+                yield page
+            return
+
+        pages = PrefetchIterator(fetch(), depth=depth)
+        try:
+            for page in pages:
+                yield page
+        finally:
+            # stop fetching if the caller stopped early
+            pages.close()
+
+    def _iter_items(self, curr, limit=None, budget=None, checkpoint=None, min_id=None, prefetch=None):
+        """
+        Generator of each item in a cursor, page by page, stopping at limit.  Model objects come back as their raw
+        json, ids as they are.  If a RateBudget is passed a call is taken from it before each page.  If a Checkpoint is
+        passed its saved items come first, then each new page is saved to it, with the cursor position after it, before
+        its items are yielded.  With a min_id, for cursors paging newest first, items at or below it are dropped and
+        paging stops at the first page that reaches it.  prefetch overrides the client's read-ahead, as in _pages.
+
+        :param curr:
+        :param limit:
+        :param budget:
+        :param checkpoint:
+        :param min_id:
+        :param prefetch:
+        :return:
+        """
+
+        n = 0
+        skip = 0
+        if checkpoint is not None:
+            for item in checkpoint.items:
+                yield item
+                n += 1
+
+                if limit is not None:
+                    if n >= limit:
+                        return
+
+            # a next_cursor of 0 means the last page was saved, but the crawl stopped before it was marked done
+            if checkpoint.done or checkpoint.position == {'cursor': 0}:
+                return
+
+            # without a position to continue from the cursor starts over, so skip what was already saved
+            if checkpoint.pages and checkpoint.position is None:
+                skip = len(checkpoint.items)
+
+        remaining = limit - n + skip if limit is not None else None
+        pages = self._pages(curr, budget=budget, limit=remaining, positions=True, min_id=min_id, prefetch=prefetch)
+        for page, position in pages:
+            page = [getattr(item, '_json', item) for item in page]
+            if min_id is not None:
+                page = [item for item in page if item['id'] > min_id]
+            if skip:
+                page, skip = page[skip:], max(skip - len(page), 0)
+                if not page:
+                    continue
+
+            if checkpoint is not None:
+                checkpoint.save_page(page, position)
+
+            for item in page:
+                yield item
+                n += 1
+
+                if limit is not None:
+                    if n >= limit:
+                        return
+
+        if checkpoint is not None:
+            checkpoint.finish()
+
+    def _status_frame(self, statuses, normalize=False):
+        """
+        Builds the result of a status method from raw status dicts: one flattened dataframe, or with normalize a
+        StatusTables bundle of separate statuses, users, entity and referenced status dataframes.
+
+        :param statuses:
+        :param normalize:
+        :return:
+        """
 
-        if drop_deeper:
-            data = {k: v for k, v in data.items() if not isinstance(v, dict) or isinstance(v, list)}
+        if normalize:
+            return normalize_statuses(statuses)
 
-        return data
+        # flatten each one a few layers and then discard anything nested farther, straight into the frame's columns
+        return self._frame(self._flatten_dict(status, layers=3, drop_deeper=True) for status in statuses)
 
     def __str__(self):
         """
@@ -159,6 +599,40 @@ class TwitterPandas(object):
 
         return df
 
+    def plan(self, method, limit=None, account_size=None, live=False):
+        """
+        Works out the cheapest way to serve a call to one of the cursor-backed methods, and what it will cost.  The
+        returned plan has the chosen strategy and page size, and an explain() method that returns a dataframe with the
+        estimated calls and wall time of every strategy considered.
+
+        :param method: the name of the method, e.g. followers
+        :param limit: the limit the method would be called with
+        :param account_size: (optional) the total number of items available, e.g. the user's followers_count
+        :param live: (optional, default=False) if True, uses the calls remaining in the current rate limit windows
+        :return:
+        """
+
+        rate_limits = self.rate_limit_status() if live else None
+        planner = RequestPlanner(rate_limits=rate_limits)
+
+        return planner.plan(method, limit=limit, account_size=account_size)
+
+    def rate_budget(self, endpoint):
+        """
+        Returns the RateBudget of an endpoint, created from its window limit on first use and then shared by every
+        method and thread using this client, so calls made at once from a pool of workers are counted against one
+        window instead of each call starting a window of its own.
+
+        :param endpoint: the name of the tweepy method, e.g. list_members
+        :return:
+        """
+
+        with self._state_lock:
+            if endpoint not in self._budgets:
+                self._budgets[endpoint] = RateBudget.for_endpoint(endpoint)
+
+            return self._budgets[endpoint]
+
     # #################################################################
     # #####  Trends Methods                                       #####
     # #################################################################
@@ -195,14 +669,15 @@ class TwitterPandas(object):
             created_at = trend.get('created_at')
             woeid = trend.get('locations', [{}])[0].get('woeid')
             name = trend.get('locations', [{}])[0].get('name')
-            for trend_topic in trend.get('trends', []):
+            for rank, trend_topic in enumerate(trend.get('trends', []), 1):
                 ds.append({
                     'as_of': as_of,
                     'created_at': created_at,
                     'woeid': woeid,
                     'location_name': name,
+                    'rank': rank,
                     'name': trend_topic.get('name'),
-                    'promoted_content': trend_topic.get('name'),
+                    'promoted_content': trend_topic.get('promoted_content'),
                     'query': trend_topic.get('query'),
                     'tweet_volume': trend_topic.get('tweet_volume'),
                     'url': trend_topic.get('url')
@@ -231,10 +706,40 @@ class TwitterPandas(object):
 
         return df
 
+    def location_resolver(self, coordinates, catalog=None, place_types=None):
+        """
+        Returns a LocationResolver, which maps whole arrays or Series of coordinates to their nearest trend location
+        locally, giving the same answer as trends_closest without a call per coordinate.
+
+        :param coordinates: a dataframe with woeid, lat and long columns for the locations in the catalog
+        :param catalog: (optional) a cached trends_available dataframe, fetched if not passed
+        :param place_types: (optional) a list of placeType.name values to limit matches to, e.g. ['Town']
+        :return:
+        """
+
+        if catalog is None:
+            catalog = self.trends_available()
+
+        return LocationResolver.from_catalog(catalog, coordinates, place_types=place_types)
+
+    def trends_collector(self, store=None, max_workers=8, catalog_ttl=24 * 60 * 60):
+        """
+        Returns a TrendsCollector, which caches the trends_available catalog and fetches many locations concurrently
+        within the trends rate limit, appending each snapshot to a local time series store.
+
+        :param store: (optional) a path to keep the trend store in, if None snapshots are only returned
+        :param max_workers: (optional, default=8) the number of locations to fetch at once
+        :param catalog_ttl: (optional, default=1 day) how long the trends_available catalog is cached, in seconds
+        :return:
+        """
+
+        return TrendsCollector(self, store=store, max_workers=max_workers, catalog_ttl=catalog_ttl)
+
     # #################################################################
     # #####  User Methods                                         #####
     # #################################################################
-    def followers(self, id_=None, user_id=None, screen_name=None, limit=None):
+    def followers(self, id_=None, user_id=None, screen_name=None, limit=None, strategy=None, resume=None,
+                  lazy=False):
         """
         Returns a dataframe of all data about followers for the user tied to the API keys.
 
@@ -242,33 +747,47 @@ class TwitterPandas(object):
         :param user_id: Specifies the ID of the user. Helpful for disambiguating when a valid user ID is also a valid screen name.
         :param screen_name: Specifies the screen name of the user. Helpful for disambiguating when a valid screen name is also a user ID.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param strategy: (optional) list to page full user objects, or ids to page ids and hydrate them 100 at a time. By default the cheapest for the limit is picked, see plan().
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.followers,
+        # a lazy result may only need the first page, which full user objects give in one call
+        if strategy is None:
+            strategy = 'list' if lazy else self.plan('followers', limit=limit).strategy
+
+        if strategy == 'ids':
+            ids = self._iter_ids('followers_ids', limit=limit, resume=resume, prefetch=0 if lazy else None, id=id_,
+                                 user_id=user_id, screen_name=screen_name)
+            if lazy:
+                return LazyFrame(ids, self._frame,
+                                 hydrate=lambda page: {user['id']: user for user in self._lookup_users(page)},
+                                 batch=page_size('lookup_users'))
+            return self._frame(self._lookup_users(list(ids)))
+
+        checkpoint = self._checkpoint(resume, 'followers', id=id_, user_id=user_id, screen_name=screen_name)
+
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('followers'),
+            checkpoint,
             id=id_,
             user_id=user_id,
-            screen_name=screen_name
+            screen_name=screen_name,
+            count=self._page_count(limit, 'followers')
         )
 
-        # page through it and parse results
-        ds = []
-        for follower in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(follower._json, layers=3, drop_deeper=True))
-
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        if lazy:
+            return LazyFrame(self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=0), self._user_frame)
 
-        # form the dataframe
-        df = pd.DataFrame(ds)
+        # page through it and parse results, flattening the raw json a few layers and discarding anything nested farther
+        df = self._user_frame(self._iter_items(curr, limit=limit, checkpoint=checkpoint))
 
         return df
 
-    def friends(self, id_=None, user_id=None, screen_name=None, limit=None):
+    def friends(self, id_=None, user_id=None, screen_name=None, limit=None, strategy=None, resume=None,
+                lazy=False):
         """
         Returns a dataframe of all data about friends for the user tied to the API keys.
 
@@ -276,39 +795,89 @@ class TwitterPandas(object):
         :param user_id: Specifies the ID of the user. Helpful for disambiguating when a valid user ID is also a valid screen name.
         :param screen_name: Specifies the screen name of the user. Helpful for disambiguating when a valid screen name is also a user ID.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param strategy: (optional) list to page full user objects, or ids to page ids and hydrate them 100 at a time. By default the cheapest for the limit is picked, see plan().
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.friends_ids,
+        # a lazy result may only need the first page, which full user objects give in one call
+        if strategy is None:
+            strategy = 'list' if lazy else self.plan('friends', limit=limit).strategy
+
+        if strategy == 'ids':
+            ids = self._iter_ids('friends_ids', limit=limit, resume=resume, prefetch=0 if lazy else None, id=id_,
+                                 user_id=user_id, screen_name=screen_name)
+            if lazy:
+                return LazyFrame(ids, self._frame,
+                                 hydrate=lambda page: {user['id']: user for user in self._lookup_users(page)},
+                                 batch=page_size('lookup_users'))
+            return self._frame(self._lookup_users(list(ids)))
+
+        checkpoint = self._checkpoint(resume, 'friends', id=id_, user_id=user_id, screen_name=screen_name)
+
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('friends'),
+            checkpoint,
             id=id_,
             user_id=user_id,
-            screen_name=screen_name
+            screen_name=screen_name,
+            count=self._page_count(limit, 'friends')
         )
 
-        # page through it and parse results
-        frames = []
-        for friend_id in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            frames.append(self.get_user(user_id=friend_id))
-
-            if limit is not None:
-                if len(frames) >= limit:
-                    break
+        if lazy:
+            return LazyFrame(self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=0), self._user_frame)
 
-        # form the dataframe
-        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        # page through it and parse results, flattening the raw json a few layers and discarding anything nested farther
+        df = self._user_frame(self._iter_items(curr, limit=limit, checkpoint=checkpoint))
 
         return df
 
-    def search_users(self, query=None, limit=None):
+    def follower_sample(self, id_=None, user_id=None, screen_name=None, size=None, confidence=0.95, margin=0.05,
+                        seed=None, resume=None, top=10):
+        """
+        Estimates the make up of a user's followers without hydrating all of them: pages the full follower id list
+        (5000 per call), draws a uniform random sample, hydrates only that 100 at a time, and returns a FollowerSample
+        of the sampled users (sample), population estimates with confidence intervals (statistics, see
+        population_statistics) and the number of followers (population).
+
+        :param id_: Specifies the ID or screen name of the user.
+        :param user_id: Specifies the ID of the user. Helpful for disambiguating when a valid user ID is also a valid screen name.
+        :param screen_name: Specifies the screen name of the user. Helpful for disambiguating when a valid screen name is also a user ID.
+        :param size: (optional) the number of followers to sample, by default enough for any share to be within margin at the given confidence
+        :param confidence: (optional, default=0.95) the confidence level of the sample size and the intervals
+        :param margin: (optional, default=0.05) the half width of the interval of a share, used when size isn't given
+        :param seed: (optional) a seed for a repeatable sample
+        :param resume: (optional) a checkpoint file path for paging the id list
+        :param top: (optional, default=10) the most values to give shares of per categorical field, e.g. lang
+        :return:
+        """
+
+        ids = self._cursor_ids('followers_ids', resume=resume, id=id_, user_id=user_id, screen_name=screen_name)
+        population = len(ids)
+
+        if size is None:
+            size = sample_size(population, confidence=confidence, margin=margin)
+
+        # hydrate only the sampled ids, accounts gone since the id list was paged are dropped
+        sample = pd.DataFrame(self._lookup_users(uniform_sample(ids, size, seed=seed)))
+
+        return FollowerSample(
+            sample=sample,
+            statistics=population_statistics(sample, population=population, confidence=confidence, top=top),
+            population=population
+        )
+
+    def search_users(self, query=None, limit=None, resume=None, lazy=False):
         """
         Lets you structure a query and returns a dataframe with all of the users that match that query (max 1000 results
         as per API rules)
 
         :param query: The query to run against people search.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
@@ -316,27 +885,68 @@ class TwitterPandas(object):
             warnings.warn(
                 'WARNING: twitter\'s API will only return 1000 results, so we do too. Your limit isn\'t really doing anything here')
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.search_users,
-            q=query
-        )
+        checkpoint = self._checkpoint(resume, 'search_users', q=query)
 
-        # page through it and parse results
-        ds = []
-        for user in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(user._json, layers=3, drop_deeper=True))
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('search_users'),
+            checkpoint,
+            q=query,
+            count=self._page_count(limit, 'search_users')
+        )
 
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        if lazy:
+            return LazyFrame(self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=0), self._user_frame)
 
-        # form the dataframe
-        df = pd.DataFrame(ds)
+        # page through it and parse results, flattening the raw json a few layers and discarding anything nested farther
+        df = self._user_frame(self._iter_items(curr, limit=limit, checkpoint=checkpoint))
 
         return df
 
+    def _stored_user(self, id_=None, user_id=None, screen_name=None):
+        """
+        The fresh stored user for a get_user call, or None.  An id_ of digits is tried as an id first, then as a screen
+        name.
+
+        :return:
+        """
+
+        found = []
+        if user_id is not None:
+            found = self.user_store.get(user_ids=[user_id])
+        elif screen_name is not None:
+            found = self.user_store.get(screen_names=[screen_name])
+        elif id_ is not None:
+            if str(id_).isdigit():
+                found = self.user_store.get(user_ids=[id_])
+            found = found or self.user_store.get(screen_names=[str(id_)])
+
+        return found[0] if found else None
+
+    def _batched_user(self, id_=None, user_id=None, screen_name=None):
+        """
+        The user for a get_user call through the batch loaders, or None if it wasn't found or the id_ could be either
+        an id or a screen name, so the caller falls back to users/show.
+
+        :return:
+        """
+
+        if user_id is None and screen_name is None and id_ is not None:
+            if isinstance(id_, int):
+                user_id = id_
+            elif not str(id_).isdigit():
+                screen_name = id_
+
+        try:
+            if user_id is not None:
+                return self._loader('users').load(int(user_id))
+            if screen_name is not None:
+                return self._loader('screen_names').load(screen_name.lower())
+        except KeyError:
+            return None
+
+        return None
+
     def get_user(self, id_=None, user_id=None, screen_name=None, ):
         """
         Returns a dataframe with just one row, which contains all the information we have about that specific user.
@@ -347,6 +957,16 @@ class TwitterPandas(object):
         :return:
         """
 
+        if self.user_store is not None:
+            stored = self._stored_user(id_=id_, user_id=user_id, screen_name=screen_name)
+            if stored is not None:
+                return self._frame([stored])
+
+        if self.batch_window is not None:
+            batched = self._batched_user(id_=id_, user_id=user_id, screen_name=screen_name)
+            if batched is not None:
+                return self._frame([batched])
+
         data = self.retry_call(
             self.client.get_user,
             5,
@@ -359,7 +979,7 @@ class TwitterPandas(object):
         ds = [self._flatten_dict(data._json, layers=3, drop_deeper=True)]
 
         # form the dataframe
-        df = pd.DataFrame(ds)
+        df = self._frame(self._store_users(ds))
 
         return df
 
@@ -376,51 +996,55 @@ class TwitterPandas(object):
         ds = [self._flatten_dict(data._json, layers=3, drop_deeper=True)]
 
         # form the dataframe
-        df = pd.DataFrame(ds)
+        df = self._frame(ds)
 
         return df
 
     # #################################################################
     # #####  Timeline Methods                                     #####
     # #################################################################
-    def home_timeline(self, since_id=None, max_id=None, limit=None):
+    def home_timeline(self, since_id=None, max_id=None, limit=None, normalize=False, resume=None, start=None,
+                      end=None, lazy=False):
         """
 
         :param since_id: Returns only statuses with an ID greater than (that is, more recent than) the specified ID.
         :param max_id: Returns only statuses with an ID less than (that is, older than) or equal to the specified ID.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param normalize: (optional, default=False) if True, returns a StatusTables bundle of separate statuses, users, hashtags, mentions, urls, media and referenced status dataframes instead of one flat dataframe
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param start: (optional) the oldest created_at to return, paging stops at the first page that reaches it
+        :param end: (optional) return only statuses created before this time
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.home_timeline,
+        # the time window becomes snowflake id bounds, the lower one is checked page by page instead of sent as since_id
+        min_id, max_id = id_bounds(start, end, since_id, max_id)
+        checkpoint = self._checkpoint(resume, 'home_timeline', since_id=since_id, max_id=max_id, min_id=min_id)
+
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('home_timeline'),
+            checkpoint,
             since_id=since_id,
             max_id=max_id,
-            count=limit
+            count=self._page_count(limit, 'home_timeline')
         )
 
-        # page through it and parse results
-        ds = []
-        for status in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(status._json, layers=3, drop_deeper=True))
-
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
-
-        # form the dataframe
-        df = pd.DataFrame(ds)
+        # page through it keeping the raw json, or with lazy only as far as the result is used
+        items = self._iter_items(curr, limit=limit, checkpoint=checkpoint, min_id=min_id, prefetch=0 if lazy else None)
+        if lazy:
+            return LazyFrame(items, lambda statuses: self._status_frame(statuses, normalize=normalize))
 
-        return df
+        return self._status_frame(items, normalize=normalize)
 
-    def statuses_lookup(self, id_=None, include_entities=None, trim_user=None, limit=None):
+    def statuses_lookup(self, id_=None, include_entities=None, trim_user=None, limit=None, normalize=False):
         """
 
         :param id_: A list of Tweet IDs to lookup, up to 100
         :param include_entities: A boolean indicating whether or not to include [entities](https://dev.twitter.com/docs/entities) in the returned tweets. Defaults to False.
         :param trim_user: A boolean indicating if user IDs should be provided, instead of full user information. Defaults to False.
+        :param normalize: (optional, default=False) if True, returns a StatusTables bundle of separate statuses, users, hashtags, mentions, urls, media and referenced status dataframes instead of one flat dataframe
         :return:
         """
 
@@ -431,15 +1055,10 @@ class TwitterPandas(object):
             trim_user=trim_user
         )
 
-        # page through it and parse results
-        ds = [self._flatten_dict(x._json, layers=3, drop_deeper=True) for x in data]
-
-        # form the dataframe
-        df = pd.DataFrame(ds)
-
-        return df
+        return self._status_frame([x._json for x in data], normalize=normalize)
 
-    def user_timeline(self, id_=None, user_id=None, screen_name=None, since_id=None, max_id=None, limit=None):
+    def user_timeline(self, id_=None, user_id=None, screen_name=None, since_id=None, max_id=None, limit=None,
+                      normalize=False, resume=None, start=None, end=None, lazy=False):
         """
 
         :param id_: Specifies the ID or screen name of the user.
@@ -448,99 +1067,373 @@ class TwitterPandas(object):
         :param since_id: Returns only statuses with an ID greater than (that is, more recent than) the specified ID.
         :param max_id: Returns only statuses with an ID less than (that is, older than) or equal to the specified ID.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param normalize: (optional, default=False) if True, returns a StatusTables bundle of separate statuses, users, hashtags, mentions, urls, media and referenced status dataframes instead of one flat dataframe
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param start: (optional) the oldest created_at to return, paging stops at the first page that reaches it
+        :param end: (optional) return only statuses created before this time
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.user_timeline,
+        # the time window becomes snowflake id bounds, the lower one is checked page by page instead of sent as since_id
+        min_id, max_id = id_bounds(start, end, since_id, max_id)
+        checkpoint = self._checkpoint(
+            resume,
+            'user_timeline',
             id=id_,
             user_id=user_id,
             screen_name=screen_name,
             since_id=since_id,
             max_id=max_id,
-            count=limit
+            min_id=min_id,
         )
 
-        # page through it and parse results
-        ds = []
-        for status in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(status._json, layers=3, drop_deeper=True))
-
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('user_timeline'),
+            checkpoint,
+            id=id_,
+            user_id=user_id,
+            screen_name=screen_name,
+            since_id=since_id,
+            max_id=max_id,
+            count=self._page_count(limit, 'user_timeline')
+        )
 
-        # form the dataframe
-        df = pd.DataFrame(ds)
+        # page through it keeping the raw json, or with lazy only as far as the result is used
+        items = self._iter_items(curr, limit=limit, checkpoint=checkpoint, min_id=min_id, prefetch=0 if lazy else None)
+        if lazy:
+            return LazyFrame(items, lambda statuses: self._status_frame(statuses, normalize=normalize))
 
-        return df
+        return self._status_frame(items, normalize=normalize)
 
-    def retweets_of_me(self, since_id=None, max_id=None, limit=None):
+    def retweets_of_me(self, since_id=None, max_id=None, limit=None, normalize=False, resume=None, lazy=False):
         """
 
         :param since_id: Returns only statuses with an ID greater than (that is, more recent than) the specified ID.
         :param max_id: Returns only statuses with an ID less than (that is, older than) or equal to the specified ID.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param normalize: (optional, default=False) if True, returns a StatusTables bundle of separate statuses, users, hashtags, mentions, urls, media and referenced status dataframes instead of one flat dataframe
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.retweets_of_me,
+        checkpoint = self._checkpoint(resume, 'retweets_of_me', since_id=since_id, max_id=max_id)
+
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('retweets_of_me'),
+            checkpoint,
             since_id=since_id,
             max_id=max_id,
-            count=limit
+            count=self._page_count(limit, 'retweets_of_me')
         )
 
-        # page through it and parse results
-        ds = []
-        for status in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(status._json, layers=3, drop_deeper=True))
+        # page through it keeping the raw json, or with lazy only as far as the result is used
+        items = self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=0 if lazy else None)
+        if lazy:
+            return LazyFrame(items, lambda statuses: self._status_frame(statuses, normalize=normalize))
 
-            if limit is not None:
-                if len(ds) >= limit:
+        return self._status_frame(items, normalize=normalize)
+
+    # #################################################################
+    # #####  Search Methods                                       #####
+    # #################################################################
+    def _search_shard(self, pages, index, query, since_id, max_id, budget, stop, **kwargs):
+        """
+        Pages one id range of a search into the pages queue as (index, page), then puts (index, None) on it to mark the
+        shard as done.
+
+        :return:
+        """
+
+        try:
+            curr = tweepy.Cursor(
+                self._endpoint('search'),
+                q=query,
+                since_id=since_id,
+                max_id=max_id,
+                count=page_size('search'),
+                **kwargs
+            )
+
+            it = iter(curr.pages())
+            while not stop.is_set():
+                # the budget is shared with other searches, a stopped shard gives up its wait and makes no more calls
+                if not budget.acquire(stop=stop) or stop.is_set():
+                    break
+                try:
+                    page = next(it)
+                except StopIteration:
                     break
+                pages.put((index, [status._json for status in page]))
+        except Exception as e:
+            pages.put((index, e))
+        finally:
+            pages.put((index, None))
 
-        # form the dataframe
-        df = pd.DataFrame(ds)
+    def _search_pages(self, query, since, until, shards, max_workers, limit, **kwargs):
+        """
+        Generator of lists of raw statuses, one per page fetched, deduplicated on id and stopping once limit statuses
+        have been yielded.  Without a limit pages are yielded from any shard as they arrive.  With one they are yielded
+        newest shard first, each shard's once every newer shard is done (the older ones read ahead meanwhile), so the
+        limit is filled with the most recent statuses.
 
-        return df
+        :return:
+        """
+
+        bounds = shard_ids(since, until, shards)
+        budget = self.rate_budget('search')
+        pages = queue.Queue()
+        stop = threading.Event()
+
+        # newest first, and submitted in that order so the newest start first
+        ranges = list(zip(bounds[:-1], bounds[1:]))[::-1]
+
+        executor = ThreadPoolExecutor(max_workers=max(min(max_workers, len(ranges)), 1))
+        try:
+            for index, (since_id, max_id) in enumerate(ranges):
+                executor.submit(self._search_shard, pages, index, query, since_id, max_id, budget, stop, **kwargs)
+
+            held = [[] for _ in ranges]
+            done = [False] * len(ranges)
+            newest = 0
+            seen = set()
+            while not all(done):
+                index, page = pages.get()
+                if page is None:
+                    done[index] = True
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    held[index].append(page)
+
+                # the pages that can go out now
+                if limit is None:
+                    ready, held[index] = held[index], []
+                else:
+                    ready = []
+                    while newest < len(ranges):
+                        ready.extend(held[newest])
+                        held[newest] = []
+                        if not done[newest]:
+                            break
+                        newest += 1
+
+                for page in ready:
+                    ds = []
+                    for status in page:
+                        if status['id'] in seen:
+                            continue
+                        seen.add(status['id'])
+                        ds.append(status)
+
+                        if limit is not None and len(seen) >= limit:
+                            break
+
+                    if ds:
+                        yield ds
+
+                    if limit is not None and len(seen) >= limit:
+                        return
+        finally:
+            stop.set()
+            executor.shutdown(wait=False)
+
+    def search(self, query, since=None, until=None, shards=4, max_workers=4, limit=None, stream=False, normalize=False,
+               start=None, end=None, **kwargs):
+        """
+        Returns a dataframe of statuses matching a query.  The time window is split into shards of snowflake id ranges,
+        which are paged concurrently within the search rate limit and merged without duplicates.
+
+        :param query: the search query, with the same operators as twitter search.
+        :param since: (optional) the oldest time to search from, defaults to 7 days ago (as far back as the API goes)
+        :param until: (optional) the newest time to search to, defaults to now
+        :param shards: (optional, default=4) the number of id ranges to split the window into
+        :param max_workers: (optional, default=4) the number of shards to page at once
+        :param limit: the maximum number of rows to return, the most recent ones (optional, default None for all rows)
+        :param stream: (optional, default=False) if True, returns a generator of dataframes, one per page fetched, in the order they arrive (newest shard first with a limit)
+        :param normalize: (optional, default=False) if True, returns a StatusTables bundle of separate statuses, users, hashtags, mentions, urls, media and referenced status dataframes instead of one flat dataframe
+        :param start: (optional) the same as since, like the timeline methods' start
+        :param end: (optional) the same as until, like the timeline methods' end
+        :param kwargs: any other parameters to the search endpoint, e.g. lang or result_type
+        :return:
+        """
+
+        since = start if start is not None else since
+        until = end if end is not None else until
+        if until is None:
+            until = pd.Timestamp.utcnow().tz_localize(None)
+        if since is None:
+            since = pd.Timestamp(until) - pd.Timedelta(days=7)
+
+        pages = self._search_pages(query, since, until, shards, max_workers, limit, **kwargs)
+
+        if stream:
+            return (self._status_frame(ds, normalize=normalize) for ds in pages)
+
+        # newest first
+        ds = sorted([status for page in pages for status in page], key=lambda status: status['id'], reverse=True)
+
+        return self._status_frame(ds, normalize=normalize)
+
+    # #################################################################
+    # #####  Streaming Methods                                    #####
+    # #################################################################
+    def filter_stream(self, track=None, follow=None, locations=None, languages=None, batch_size=1000,
+                      flush_interval=5.0, buffer_size=10000, max_retries=5):
+        """
+        Connects to the filter stream and returns a started TweetStream.  Iterate over it (or its batches() method) to
+        get frames of statuses in the client's backend, flattened the same way as home_timeline, every batch_size rows
+        or flush_interval seconds.  Call stop() on it to disconnect, and check metrics for buffer depth and dropped
+        statuses.
+
+        :param track: a list of phrases to track
+        :param follow: a list of user ids to follow
+        :param locations: a list of bounding boxes, as a flat list of sw long, sw lat, ne long, ne lat values
+        :param languages: a list of BCP 47 language codes
+        :param batch_size: (optional, default=1000) the most rows per dataframe
+        :param flush_interval: (optional, default=5.0) the most seconds between dataframes, if any rows are waiting
+        :param buffer_size: (optional, default=10000) the most statuses held between batches before the oldest are dropped
+        :param max_retries: (optional, default=5) the number of times to reconnect, with backoff, after a disconnect
+        :return:
+        """
+
+        params = {}
+        for key, value in [('track', track), ('follow', follow), ('locations', locations), ('language', languages)]:
+            if value is not None:
+                params[key] = ','.join([str(x) for x in value])
+
+        return streaming.TweetStream(
+            streaming.FILTER_URL,
+            params=params,
+            auth=self.client.auth.apply_auth(),
+            method='POST',
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            buffer_size=buffer_size,
+            max_retries=max_retries,
+            backend=self.backend
+        ).start()
+
+    def sample_stream(self, languages=None, batch_size=1000, flush_interval=5.0, buffer_size=10000, max_retries=5):
+        """
+        Connects to the sample stream (a small random sample of all public statuses) and returns a started
+        TweetStream, see filter_stream.
+
+        :param languages: a list of BCP 47 language codes
+        :param batch_size: (optional, default=1000) the most rows per dataframe
+        :param flush_interval: (optional, default=5.0) the most seconds between dataframes, if any rows are waiting
+        :param buffer_size: (optional, default=10000) the most statuses held between batches before the oldest are dropped
+        :param max_retries: (optional, default=5) the number of times to reconnect, with backoff, after a disconnect
+        :return:
+        """
+
+        params = {}
+        if languages is not None:
+            params['language'] = ','.join(languages)
+
+        return streaming.TweetStream(
+            streaming.SAMPLE_URL,
+            params=params,
+            auth=self.client.auth.apply_auth(),
+            method='GET',
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            buffer_size=buffer_size,
+            max_retries=max_retries,
+            backend=self.backend
+        ).start()
+
+    # #################################################################
+    # #####  Spool Methods                                        #####
+    # #################################################################
+    def spool(self, endpoint, path, limit=None, part_size=10000, **kwargs):
+        """
+        Stage one of a two stage crawl: pages through a cursor endpoint (e.g. followers, followers_ids, user_timeline)
+        at its largest page size and writes the raw json of every item to gzipped JSON-lines files in path, without
+        flattening anything.  Running it again adds to the spool.  Parse the spool afterwards, as many times as needed,
+        with parse_spool.
+
+        :param endpoint: the name of the tweepy API method to page through
+        :param path: the spool directory
+        :param limit: the maximum number of items to write (optional, default None for all of them)
+        :param part_size: (optional, default=10000) the number of items per spool file
+        :param kwargs: the arguments to the endpoint, e.g. screen_name
+        :return: the number of items written
+        """
+
+        # create a tweepy cursor to safely return the data
+        curr = tweepy.Cursor(
+            self._endpoint(endpoint),
+            count=self._page_count(limit, endpoint),
+            **kwargs
+        )
+
+        # write each page as it arrives, the next one is fetched in the meantime
+        with SpoolWriter(path, part_size=part_size) as writer:
+            for page in self._pages(curr, limit=limit):
+                items = [getattr(item, '_json', item) for item in page]
+                if limit is not None:
+                    items = items[:limit - writer.items]
+                writer.write_page(items)
+
+        return writer.items
+
+    def parse_spool(self, path, output=None, parser=flatten_items, max_workers=None, dedupe=True):
+        """
+        Stage two of a two stage crawl: parses the files written by spool on a process pool, into one dataframe or, with
+        output, into a parquet file per spool file (needs pyarrow).  Nothing is fetched, so it can be re-run against the
+        same spool, e.g. with a different parser.
+
+        :param path: the spool directory
+        :param output: (optional) a directory to write parquet files to instead of returning a dataframe
+        :param parser: (optional) a module level function taking an iterator of raw items and returning a dataframe, defaults to flattening each a few layers like the other methods
+        :param max_workers: (optional) the number of worker processes, defaults to the number of cpus
+        :param dedupe: (optional, default=True) drop rows with repeated ids from the returned dataframe
+        :return:
+        """
+
+        return parse_spool(path, output=output, parser=parser, max_workers=max_workers, dedupe=dedupe)
 
     # #################################################################
     # #####  Favorite Methods                                     #####
     # #################################################################
-    def favorites(self, id_=None, limit=None):
+    def favorites(self, id_=None, limit=None, normalize=False, resume=None, start=None, end=None, lazy=False):
         """
         Returns a dataframe of all data about followers for the user tied to the API keys.
 
         :param id_: Specifies the ID or screen name of the user.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param normalize: (optional, default=False) if True, returns a StatusTables bundle of separate statuses, users, hashtags, mentions, urls, media and referenced status dataframes instead of one flat dataframe
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param start: (optional) return only statuses created at or after this time
+        :param end: (optional) return only statuses created before this time
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.favorites,
+        # favorites come in the order they were favorited, not created, so the id bounds are left to the API
+        since_id, max_id = id_bounds(start, end)
+        checkpoint = self._checkpoint(resume, 'favorites', id_=id_, since_id=since_id, max_id=max_id)
+
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('favorites'),
+            checkpoint,
             id_=id_,
+            since_id=since_id,
+            max_id=max_id,
+            count=self._page_count(limit, 'favorites')
         )
 
-        # page through it and parse results
-        ds = []
-        for favorite in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(favorite._json, layers=3, drop_deeper=True))
+        # page through it keeping the raw json, or with lazy only as far as the result is used
+        items = self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=0 if lazy else None)
+        if lazy:
+            return LazyFrame(items, lambda statuses: self._status_frame(statuses, normalize=normalize))
 
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
-
-        # form the dataframe
-        df = pd.DataFrame(ds)
-
-        return df
+        return self._status_frame(items, normalize=normalize)
 
     # #################################################################
     # #####  Saved Searches Methods                               #####
@@ -598,197 +1491,187 @@ class TwitterPandas(object):
     # #################################################################
     # #####  Direct Message Methods                               #####
     # #################################################################
-    def direct_messages(self, since_id=None, max_id=None, limit=1, page=1, full_text=False, include_user_data=False):
+    def _direct_message_pages(self, endpoint, since_id=None, max_id=None, limit=None, full_text=False):
         """
-        Returns direct messages sent to the user tied to the API keys, in the form
-        of a Pandas DataFrame
+        Generator of pages of direct messages, paging back through the whole history by max_id until the endpoint
+        stops returning new messages or limit messages have been returned.
 
-        :param since_id:
-        :param max_id:
-        :param count:
-        :param page:
-        :param full_text:
         :return:
         """
 
-        # get direct messages sent to the user from the API
-        data = self.client.direct_messages(since_id=since_id, max_id=max_id,
-                                           count=limit, page=page, full_text=full_text)
-
-        ds = []
-        for direct_message in data:
-            dict_data = self._flatten_dict(direct_message.__dict__)
-
-            temp_data_dict = {}
-
-            temp_data_dict['created_at'] = dict_data['created_at']
-            temp_data_dict['id'] = dict_data['id']
-            temp_data_dict['id_str'] = dict_data['id_str']
-
-            if dict_data['entities.urls']:
-                # only pull one type of URL from entities.url to avoid
-                # multiple, repetitive data per row in the entities.url column
-                for dictionary in dict_data['entities.urls']:
-                    temp_data_dict['entities.urls_url'] = dictionary['url']
-
-            if dict_data['entities.user_mentions']:
-                for dictionary in dict_data['entities.user_mentions']:
-                    temp_data_dict['entities.user_mentions_id_str'] = dictionary['id_str']
-                    temp_data_dict['entities.user_mentions_name'] = dictionary['name']
-                    temp_data_dict['entities.user_mentions_screen_name'] = dictionary['screen_name']
-
-            if dict_data['entities.hashtags']:
-                for dictionary in dict_data['entities.hashtags']:
-                    temp_data_dict['entities.hashtags_text'] = dictionary['text']
-
-            # includes a large amount of data so this uses
-            # a user-settable boolean to add in recipient and sender info
-            if include_user_data:
-                sender_data = self._flatten_dict(dict_data['sender']._json)
-                recipient_data = self._flatten_dict(dict_data['recipient']._json)
+        seen = set()
+        while limit is None or len(seen) < limit:
+            data = self.retry_call(
+                getattr(self.client, endpoint),
+                5,
+                since_id=since_id,
+                max_id=max_id,
+                count=self._page_count(None if limit is None else limit - len(seen), endpoint),
+                full_text=full_text
+            )
 
-                sender_data = {key if "sender_" in key else "sender_{}".format(key): value
-                               for key, value in sender_data.items()}
-                recipient_data = {key if "recipient_" in key else "recipient_{}".format(key): value
-                                  for key, value in recipient_data.items()}
-
-                # uses translation table to map everything outside of the bmp
-                temp_data_dict['full_text'] = dict_data['text'].translate(NON_BMP_MAP)
-
-                temp_data_dict.update(sender_data)
-                temp_data_dict.update(recipient_data)
+            page = [message for message in data if message.id not in seen]
+            if limit is not None:
+                page = page[:limit - len(seen)]
+            if not page:
+                return
 
-            ds.append(temp_data_dict)
+            seen.update(message.id for message in page)
+            yield page
 
-        df = pd.DataFrame(ds)
-        return df
+            max_id = min(message.id for message in page) - 1
 
-    def get_direct_message(self, id_=None, include_user_data=False):
+    @staticmethod
+    def _direct_message_entities(messages):
         """
-        Returns a single direct message object sent to the user tied to the API keys
-        in the form of a Pandas DataFrame
+        Returns a dict of long format dataframes, one per entity type (urls, user_mentions and hashtags), with a row per
+        entity keyed by message_id and the entity's position within the message.
 
-        :param since_id:
-        :param id_:
-        :param full_text:
+        :param messages:
         :return:
         """
 
-        # get direct messages sent to the user from the API
-        data = self.client.get_direct_message(id=id_)
+        tables = {}
+        for kind in ['urls', 'user_mentions', 'hashtags']:
+            ds = []
+            for message in messages:
+                for position, entity in enumerate((message.entities or {}).get(kind) or []):
+                    row = flatten_dict(entity, layers=1, drop_deeper=True)
+                    row['message_id'] = message.id
+                    row['position'] = position
+                    ds.append(row)
 
-        ds = []
-        dict_data = self._flatten_dict(data.__dict__)
+            df = pd.DataFrame(ds)
+            if len(df) > 0:
+                df = df[['message_id', 'position'] + [c for c in df.columns if c not in ('message_id', 'position')]]
+            else:
+                df = pd.DataFrame(columns=['message_id', 'position'])
+            tables[kind] = df
 
-        temp_data_dict = {}
+        return tables
 
-        temp_data_dict['created_at'] = dict_data['created_at']
-        temp_data_dict['id'] = dict_data['id']
-        temp_data_dict['id_str'] = dict_data['id_str']
+    def _direct_message_frame(self, messages, include_user_data=False):
+        """
+        Builds the dataframe for a list of direct messages column by column, with the sender and recipient users only
+        when include_user_data is set.  The entities. columns keep the last url, mention and hashtag of each message,
+        see direct_message_entities for all of them.
 
-        if dict_data['entities.urls']:
-            # only pull one type of URL from entities.url to avoid
-            # multiple, repetitive data per row in the entities.url column
-            for dictionary in dict_data['entities.urls']:
-                temp_data_dict['entities.urls_url'] = dictionary['url']
+        :return:
+        """
 
-        if dict_data['entities.user_mentions']:
-            for dictionary in dict_data['entities.user_mentions']:
-                temp_data_dict['entities.user_mentions_id_str'] = dictionary['id_str']
-                temp_data_dict['entities.user_mentions_name'] = dictionary['name']
-                temp_data_dict['entities.user_mentions_screen_name'] = dictionary['screen_name']
+        df = pd.DataFrame({
+            'created_at': [message.created_at for message in messages],
+            'id': [message.id for message in messages],
+            'id_str': [message.id_str for message in messages],
+        }, columns=['created_at', 'id', 'id_str'])
 
-        if dict_data['entities.hashtags']:
-            for dictionary in dict_data['entities.hashtags']:
-                temp_data_dict['entities.hashtags_text'] = dictionary['text']
+        # only pull the last entity of each type to avoid multiple, repetitive data per row in the entities. columns
+        for kind, fields in [('urls', ['url']), ('user_mentions', ['id_str', 'name', 'screen_name']),
+                             ('hashtags', ['text'])]:
+            last = [((message.entities or {}).get(kind) or [None])[-1] for message in messages]
+            if any(entity is not None for entity in last):
+                for field in fields:
+                    column = 'entities.%s_%s' % (kind, field)
+                    df[column] = [None if entity is None else entity[field] for entity in last]
 
         # includes a large amount of data so this uses
         # a user-settable boolean to add in recipient and sender info
-        if include_user_data:
-            sender_data = self._flatten_dict(dict_data['sender']._json)
-            recipient_data = self._flatten_dict(dict_data['recipient']._json)
+        if include_user_data and messages:
+            # uses translation table to map everything outside of the bmp
+            df['full_text'] = [message.text.translate(NON_BMP_MAP) for message in messages]
 
-            sender_data = {key if "sender_" in key else "sender_{}".format(key): value
-                           for key, value in sender_data.items()}
-            recipient_data = {key if "recipient_" in key else "recipient_{}".format(key): value
-                              for key, value in recipient_data.items()}
+            for role in ['sender', 'recipient']:
+                users = pd.DataFrame([self._flatten_dict(getattr(message, role)._json) for message in messages])
+                users.columns = [c if role + '_' in c else '%s_%s' % (role, c) for c in users.columns]
+                df = pd.concat([df, users], axis=1)
 
-            # uses translation table to map everything outside of the bmp
-            temp_data_dict['full_text'] = dict_data['text'].translate(NON_BMP_MAP)
+        return df
 
-            temp_data_dict.update(sender_data)
-            temp_data_dict.update(recipient_data)
+    def _direct_messages(self, endpoint, since_id, max_id, limit, full_text, page, stream, build):
+        if page is not None:
+            warnings.warn('page is deprecated and ignored, direct messages are paged back through by max_id, use limit',
+                          DeprecationWarning, stacklevel=3)
 
-        ds.append(temp_data_dict)
+        pages = self._direct_message_pages(endpoint, since_id=since_id, max_id=max_id, limit=limit, full_text=full_text)
 
-        df = pd.DataFrame(ds)
-        return df
+        if stream:
+            return (build(page) for page in pages)
 
-    def sent_direct_messages(self, since_id=None, max_id=None, limit=1, page=1, full_text=False,
-                             include_user_data=False):
+        return build([message for page in pages for message in page])
+
+    def direct_messages(self, since_id=None, max_id=None, limit=None, page=None, full_text=False,
+                        include_user_data=False, stream=False):
         """
-        Returns direct message objects sent by the user tied to the API keys
-        in the form of a Pandas DataFrame
+        Returns direct messages sent to the user tied to the API keys, in the form of a Pandas DataFrame, paging back
+        through the whole history.
 
-        :param since_id:
-        :param max_id:
-        :param count:
-        :param page:
-        :param full_text:
+        :param since_id: Returns only direct messages with an ID greater than (that is, more recent than) the specified ID.
+        :param max_id: Returns only direct messages with an ID less than (that is, older than) or equal to the specified ID.
+        :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param page: deprecated and ignored, the whole history is paged through up to limit
+        :param full_text: (optional, default=False) asks for the full, untruncated text of each message
+        :param include_user_data: (optional, default=False) adds full_text and the sender_ and recipient_ user columns
+        :param stream: (optional, default=False) if True, returns a generator of dataframes, one per page
         :return:
         """
 
-        # get direct messages sent by the user from the API
-        data = self.client.sent_direct_messages(since_id=since_id, max_id=max_id,
-                                                count=limit, page=page, full_text=full_text)
-
-        ds = []
-        for direct_message in data:
-            dict_data = self._flatten_dict(direct_message.__dict__)
+        return self._direct_messages('direct_messages', since_id, max_id, limit, full_text, page, stream,
+                                     functools.partial(self._direct_message_frame, include_user_data=include_user_data))
 
-            temp_data_dict = {}
+    def get_direct_message(self, id_=None, include_user_data=False):
+        """
+        Returns a single direct message object sent to the user tied to the API keys
+        in the form of a Pandas DataFrame
 
-            temp_data_dict['created_at'] = dict_data['created_at']
-            temp_data_dict['id'] = dict_data['id']
-            temp_data_dict['id_str'] = dict_data['id_str']
+        :param id_: The ID of the direct message.
+        :param include_user_data: (optional, default=False) adds full_text and the sender_ and recipient_ user columns
+        :return:
+        """
 
-            if dict_data['entities.urls']:
-                # only pull one type of URL from entities.url to avoid
-                # multiple, repetitive data per row in the entities.url column
-                for dictionary in dict_data['entities.urls']:
-                    temp_data_dict['entities.urls_url'] = dictionary['url']
+        # get direct messages sent to the user from the API
+        data = self.client.get_direct_message(id=id_)
 
-            if dict_data['entities.user_mentions']:
-                for dictionary in dict_data['entities.user_mentions']:
-                    temp_data_dict['entities.user_mentions_id_str'] = dictionary['id_str']
-                    temp_data_dict['entities.user_mentions_name'] = dictionary['name']
-                    temp_data_dict['entities.user_mentions_screen_name'] = dictionary['screen_name']
+        return self._direct_message_frame([data], include_user_data)
 
-            if dict_data['entities.hashtags']:
-                for dictionary in dict_data['entities.hashtags']:
-                    temp_data_dict['entities.hashtags_text'] = dictionary['text']
+    def sent_direct_messages(self, since_id=None, max_id=None, limit=None, page=None, full_text=False,
+                             include_user_data=False, stream=False):
+        """
+        Returns direct message objects sent by the user tied to the API keys, in the form of a Pandas DataFrame, paging
+        back through the whole history.
 
-            # includes a large amount of data so this uses
-            # a user-settable boolean to add in recipient and sender info
-            if include_user_data:
-                sender_data = self._flatten_dict(dict_data['sender']._json)
-                recipient_data = self._flatten_dict(dict_data['recipient']._json)
+        :param since_id: Returns only direct messages with an ID greater than (that is, more recent than) the specified ID.
+        :param max_id: Returns only direct messages with an ID less than (that is, older than) or equal to the specified ID.
+        :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param page: deprecated and ignored, the whole history is paged through up to limit
+        :param full_text: (optional, default=False) asks for the full, untruncated text of each message
+        :param include_user_data: (optional, default=False) adds full_text and the sender_ and recipient_ user columns
+        :param stream: (optional, default=False) if True, returns a generator of dataframes, one per page
+        :return:
+        """
 
-                sender_data = {key if "sender_" in key else "sender_{}".format(key): value
-                               for key, value in sender_data.items()}
-                recipient_data = {key if "recipient_" in key else "recipient_{}".format(key): value
-                                  for key, value in recipient_data.items()}
+        return self._direct_messages('sent_direct_messages', since_id, max_id, limit, full_text, page, stream,
+                                     functools.partial(self._direct_message_frame, include_user_data=include_user_data))
 
-                # uses translation table to map everything outside of the bmp
-                temp_data_dict['full_text'] = dict_data['text'].translate(NON_BMP_MAP)
+    def direct_message_entities(self, id_=None, sent=False, since_id=None, max_id=None, limit=None, stream=False):
+        """
+        Returns the urls, user_mentions and hashtags of direct messages as a dict of long format Pandas DataFrames, one
+        row per entity keyed by message_id and the entity's position within the message.
 
-                temp_data_dict.update(sender_data)
-                temp_data_dict.update(recipient_data)
+        :param id_: (optional) the ID of a single direct message, otherwise the history is paged through as in direct_messages
+        :param sent: (optional, default=False) if True, the messages sent by the user tied to the API keys rather than those sent to it
+        :param since_id: Returns only direct messages with an ID greater than (that is, more recent than) the specified ID.
+        :param max_id: Returns only direct messages with an ID less than (that is, older than) or equal to the specified ID.
+        :param limit: the maximum number of messages to return entities for (optional, default None for all messages)
+        :param stream: (optional, default=False) if True, returns a generator of the above, one per page
+        :return:
+        """
 
-            ds.append(temp_data_dict)
+        if id_ is not None:
+            return self._direct_message_entities([self.client.get_direct_message(id=id_)])
 
-        df = pd.DataFrame(ds)
-        return df
+        endpoint = 'sent_direct_messages' if sent else 'direct_messages'
+        return self._direct_messages(endpoint, since_id, max_id, limit, False, None, stream,
+                                     self._direct_message_entities)
 
     # #################################################################
     # #####  Friendship Methods                                   #####
@@ -863,7 +1746,7 @@ class TwitterPandas(object):
 
         return df
 
-    def friends_friendships(self, id_=None, screen_name=None, user_id=None, limit=None, rich=False):
+    def friends_friendships(self, id_=None, screen_name=None, user_id=None, limit=None, rich=False, resume=None):
         """
         Returns a dataframe with the informatino about the friends of a user.  If rich is set to false, the only thing
         returned is a list of ids.  Otherwise, the full friendship of all friends is returned.
@@ -873,27 +1756,24 @@ class TwitterPandas(object):
         :param screen_name: Specifies the screen name of the user. Helpful for disambiguating when a valid screen name is also a user ID.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
         :param rich: (optional, default=False) specifies whether to return rich or sparse output data.
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.friends_ids,
+        checkpoint = self._checkpoint(resume, 'friends_ids', id=id_, user_id=user_id, screen_name=screen_name)
+
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('friends_ids'),
+            checkpoint,
             id=id_,
             user_id=user_id,
-            screen_name=screen_name
-
+            screen_name=screen_name,
+            count=self._page_count(limit, 'friends_ids')
         )
 
         # page through it and parse results
-        ds = []
-
-        for friend in curr.items():
-            ds.append(friend)
-
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        ds = list(self._iter_items(curr, limit=limit, checkpoint=checkpoint))
 
         # form the dataframe itself depending on configured richness
         if rich:
@@ -910,7 +1790,7 @@ class TwitterPandas(object):
 
         return df
 
-    def followers_friendships(self, id_=None, screen_name=None, user_id=None, limit=None, rich=False):
+    def followers_friendships(self, id_=None, screen_name=None, user_id=None, limit=None, rich=False, resume=None):
         """
         Returns an array containing the IDs of users following the specified user.
 
@@ -919,25 +1799,24 @@ class TwitterPandas(object):
         :param screen_name: Specifies the screen name of the user. Helpful for disambiguating when a valid screen name is also a user ID.
         :param limit: the maximum number of rows to return (optional, default None for all rows)
         :param rich: (optional, default=False) specifies whether to return rich or sparse output data.
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
         :return:
         """
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.followers_ids,
+        checkpoint = self._checkpoint(resume, 'followers_ids', id=id_, user_id=user_id, screen_name=screen_name)
+
+        # create a tweepy cursor to safely return the data, from where the checkpoint left off if resuming
+        curr = self._cursor(
+            self._endpoint('followers_ids'),
+            checkpoint,
             id=id_,
             user_id=user_id,
-            screen_name=screen_name
+            screen_name=screen_name,
+            count=self._page_count(limit, 'followers_ids')
         )
 
         # page through it and parse results
-        ds = []
-        for follower in curr.items():
-            ds.append(follower)
-
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        ds = list(self._iter_items(curr, limit=limit, checkpoint=checkpoint))
 
         # form the dataframe itself depending on configured richness
         if rich:
@@ -954,10 +1833,117 @@ class TwitterPandas(object):
 
         return df
 
+    def graph_crawler(self, path, seeds=None, max_hops=2, max_nodes=1000, directions=('followers', 'friends'),
+                      priority=None, max_neighbors=None):
+        """
+        Returns a GraphCrawler, which crawls the follow graph out from seed users over followers_ids and friends_ids,
+        keeping its frontier, progress and edges in a SQLite file so it can be stopped and resumed.  Call run() on it to
+        crawl, and edges() / nodes() to get the results as dataframes.
+
+        :param path: the SQLite file to keep the crawl in, created if it doesn't exist and resumed if it does
+        :param seeds: (optional) user ids to start from, more can be added with add_seeds()
+        :param max_hops: (optional, default=2) how far from the seeds to go
+        :param max_nodes: (optional, default=1000) the most users to expand, seeds included
+        :param directions: (optional) which edges to follow, followers and/or friends
+        :param priority: (optional) how to order users within a hop: None for the order they were found in, followers_count to look them up and go by follower count, or a function taking a list of user ids and returning a priority for each (higher first, None or NaN for unknown, which go last)
+        :param max_neighbors: (optional) the most ids to page per user and direction
+        :return:
+        """
+
+        crawler = GraphCrawler(self, path, max_hops=max_hops, max_nodes=max_nodes, directions=directions,
+                               priority=priority, max_neighbors=max_neighbors)
+        if seeds is not None:
+            crawler.add_seeds(seeds)
+
+        return crawler
+
+    def follower_sketches(self, user_ids, path=None, precision=14, k=256, target_error=None, limit=None):
+        """
+        Returns a SketchBank of fixed size HyperLogLog and MinHash sketches of the followers of each account, built
+        page by page from followers_ids, for estimating follower counts, unions and overlap / Jaccard between accounts
+        without keeping any ids.  With a path the bank is loaded from and saved to that npz file after each account,
+        and accounts already complete in it are skipped.
+
+        With target_error each account stops paging once the followers added so far pin down any share of its
+        followers (e.g. the share that also follow another account) to within that standard error, and its overlaps are
+        scaled up from the sample.  followers_ids returns the most recent followers first, so a sample leans toward
+        them.
+
+        :param user_ids: a list of user ids
+        :param path: (optional) an npz file to keep the sketches in
+        :param precision: (optional, default=14) log2 of the number of HyperLogLog registers, for a new bank
+        :param k: (optional, default=256) the number of MinHash values, for a new bank
+        :param target_error: (optional) stop paging an account once the sampling error is below this, e.g. 0.01
+        :param limit: (optional) the most ids to add per account
+        :return:
+        """
+
+        if path is not None and os.path.exists(path):
+            bank = SketchBank.load(path)
+        else:
+            bank = SketchBank(precision=precision, k=k)
+
+        user_ids = [user_id for user_id in user_ids if user_id not in bank or not bank[user_id].complete]
+
+        # follower counts, to know how much of an account a partial sketch covers
+        totals = {}
+        if user_ids and (target_error is not None or limit is not None):
+            totals = {u['id']: u.get('followers_count') for u in self._lookup_users(user_ids)}
+
+        for user_id in user_ids:
+            sketch = bank.new_sketch(total=totals.get(user_id))
+
+            # create a tweepy cursor to safely return the data
+            curr = self._cursor(
+                self._endpoint('followers_ids'),
+                user_id=user_id,
+                count=self._page_count(limit, 'followers_ids')
+            )
+
+            # no read ahead when stopping early, it would spend calls on pages that are never used
+            pages = self._pages(curr, limit=limit, prefetch=0 if target_error is not None else None)
+            try:
+                for page in pages:
+                    sketch.update(page[:limit - sketch.seen] if limit is not None else page)
+                    if target_error is not None and sketch.sampling_error() <= target_error:
+                        break
+                else:
+                    sketch.complete = limit is None or sketch.seen < limit
+            finally:
+                pages.close()
+
+            if sketch.total is not None and sketch.seen >= sketch.total:
+                sketch.complete = True
+
+            bank[user_id] = sketch
+            if path is not None:
+                bank.save(path)
+
+        return bank
+
     # #################################################################
     # #####  List Methods                                         #####
     # #################################################################
-    def list_timeline(self, owner, slug, since_id=None, max_id=None, limit=None):
+    def _list_cursor(self, endpoint, owner, slug, limit=None, checkpoint=None, **kwargs):
+        """
+        A tweepy cursor over one of the list endpoints, at its largest page size, starting from where a checkpoint left
+        off if one is passed.
+
+        :return:
+        """
+
+        # create a tweepy cursor to safely return the data
+        return self._cursor(
+            self._endpoint(endpoint),
+            checkpoint,
+            owner_screen_name=owner,
+            slug=slug,
+            count=self._page_count(limit, endpoint),
+            **kwargs
+        )
+
+    def list_timeline(self, owner, slug, since_id=None, max_id=None, limit=None, normalize=False, resume=None,
+                      start=None, end=None, lazy=False):
         """
         Show tweet timeline for members of the specified list.
 
@@ -966,129 +1952,345 @@ class TwitterPandas(object):
         :param limit: the maximum number of rows to return (optional, default None for all rows)
         :param since_id: Returns only statuses with an ID greater than (that is, more recent than) the specified ID.
         :param max_id: Returns only statuses with an ID less than (that is, older than) or equal to the specified ID.
+        :param normalize: (optional, default=False) if True, returns a StatusTables bundle of separate statuses, users, hashtags, mentions, urls, media and referenced status dataframes instead of one flat dataframe
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param start: (optional) the oldest created_at to return, paging stops at the first page that reaches it
+        :param end: (optional) return only statuses created before this time
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        data = self.client.list_timeline(
-            owner,
-            slug,
-            since_id=since_id,
-            max_id=max_id
-        )
-
-        # page through it and parse results
-        ds = []
-        for timeline_item in data:
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(timeline_item._json, layers=3, drop_deeper=True))
+        # the time window becomes snowflake id bounds, the lower one is checked page by page instead of sent as since_id
+        min_id, max_id = id_bounds(start, end, since_id, max_id)
+        checkpoint = self._checkpoint(resume, 'list_timeline', owner_screen_name=owner, slug=slug, since_id=since_id,
+                                      max_id=max_id, min_id=min_id)
+        curr = self._list_cursor('list_timeline', owner, slug, limit=limit, checkpoint=checkpoint, since_id=since_id,
+                                 max_id=max_id)
 
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        # page through it keeping the raw json, or with lazy only as far as the result is used
+        items = self._iter_items(curr, limit=limit, checkpoint=checkpoint, min_id=min_id, prefetch=0 if lazy else None)
+        if lazy:
+            return LazyFrame(items, lambda statuses: self._status_frame(statuses, normalize=normalize))
 
-        # form the dataframe
-        df = pd.DataFrame(ds)
-
-        return df
+        return self._status_frame(items, normalize=normalize)
 
     def get_list(self, owner=None, slug=None, limit=None):
         """
-        Show the specified list. Private lists will only be shown if the authenticated user owns the specified list.
+        Show the specified list, as a one row dataframe. Private lists will only be shown if the authenticated user owns the specified list.
 
         :param owner: the screen name of the owner of the list
         :param slug: the slug name or numerical ID of the list
-        :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param limit: unused, a list is always one row
         :return:
         """
 
         data = self.client.get_list(
-            owner,
-            slug
+            owner_screen_name=owner,
+            slug=slug
         )
 
-        # page through it and parse results
-        ds = []
-        for timeline_item in data:
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(timeline_item._json, layers=3, drop_deeper=True))
-
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        # get the raw json, flatten it one layer and then discard anything nested farther
+        ds = [self._flatten_dict(data._json, layers=3, drop_deeper=True)]
 
         # form the dataframe
         df = pd.DataFrame(ds)
 
         return df
 
-    def list_members(self, owner=None, slug=None, limit=None):
+    def list_members(self, owner=None, slug=None, limit=None, resume=None, lazy=False):
         """
         Returns the members of the specified list.
 
         :param owner: the screen name of the owner of the list
         :param slug: the slug name or numerical ID of the list
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # TODO: fix when it's fixed in tweepy: https://github.com/tweepy/tweepy/issues/697
-
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.get_list,
-            owner=owner,
-            slug=slug
-        )
-
-        ds = []
-
-        for list_item in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(list_item._json, layers=3, drop_deeper=True))
+        checkpoint = self._checkpoint(resume, 'list_members', owner_screen_name=owner, slug=slug)
+        curr = self._list_cursor('list_members', owner, slug, limit=limit, checkpoint=checkpoint)
 
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        if lazy:
+            return LazyFrame(self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=0), self._user_frame)
 
-        # form the dataframe
-        df = pd.DataFrame(ds)
+        # page through it and parse results, flattening the raw json a few layers and discarding anything nested farther
+        df = self._user_frame(self._iter_items(curr, limit=limit, checkpoint=checkpoint))
 
         return df
 
-    def list_subscribers(self, owner=None, slug=None, limit=None):
+    def list_subscribers(self, owner=None, slug=None, limit=None, resume=None, lazy=False):
         """
         Returns the subscribers of the specified list.
 
         :param owner: the screen name of the owner of the list
         :param slug: the slug name or numerical ID of the list
         :param limit: the maximum number of rows to return (optional, default None for all rows)
+        :param resume: (optional) a checkpoint file path; progress is saved there page by page, and if the file exists the crawl picks up where it stopped, without repeating rows
+        :param lazy: (optional, default=False) return a LazyFrame instead, which fetches pages only as head(), slicing or iteration need them, and to_frame() for the full result
         :return:
         """
 
-        # TODO: fix when it's fixed in tweepy: https://github.com/tweepy/tweepy/issues/697
+        checkpoint = self._checkpoint(resume, 'list_subscribers', owner_screen_name=owner, slug=slug)
+        curr = self._list_cursor('list_subscribers', owner, slug, limit=limit, checkpoint=checkpoint)
 
-        # create a tweepy cursor to safely return the data
-        curr = tweepy.Cursor(
-            self.client.list_subscribers,
-            owner=owner,
-            slug=slug
-        )
+        if lazy:
+            return LazyFrame(self._iter_items(curr, limit=limit, checkpoint=checkpoint, prefetch=0), self._user_frame)
 
-        # page through it and parse results
-        ds = []
-        for list_item in curr.items():
-            # get the raw json, flatten it one layer and then discard anything nested farther
-            ds.append(self._flatten_dict(list_item._json, layers=3, drop_deeper=True))
+        # page through it and parse results, flattening the raw json a few layers and discarding anything nested farther
+        df = self._user_frame(self._iter_items(curr, limit=limit, checkpoint=checkpoint))
 
-            if limit is not None:
-                if len(ds) >= limit:
-                    break
+        return df
 
-        # form the dataframe
-        df = pd.DataFrame(ds)
+    def _multi_list(self, endpoint, lists, limit, max_workers, since_ids=None):
+        """
+        Fetches one list endpoint for many (owner, slug) pairs on a thread pool, sharing the endpoint's rate budget, and
+        returns one dataframe with list_owner and list_slug columns tagging each row.
+
+        :return:
+        """
+
+        budget = self.rate_budget(endpoint)
+        since_ids = since_ids or {}
+
+        def fetch(key):
+            owner, slug = key
+            kwargs = {}
+            if since_ids.get(key) is not None:
+                kwargs['since_id'] = since_ids[key]
+            curr = self._list_cursor(endpoint, owner, slug, limit=limit, **kwargs)
+
+            ds = [self._flatten_dict(item, layers=3, drop_deeper=True)
+                  for item in self._iter_items(curr, limit=limit, budget=budget)]
+            if endpoint != 'list_timeline':
+                self._store_users(ds)
+
+            return [dict(row, list_owner=owner, list_slug=slug) for row in ds]
+
+        lists = [tuple(key) for key in lists]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, lists))
+
+        df = self._frame(row for ds in results for row in ds)
+
+        return df
+
+    def multi_list_members(self, lists, limit=None, max_workers=4):
+        """
+        Returns the members of many lists, fetched concurrently, as one dataframe with list_owner and list_slug columns.
+
+        :param lists: a list of (owner screen name, slug) pairs
+        :param limit: the maximum number of rows to return per list (optional, default None for all rows)
+        :param max_workers: (optional, default=4) the number of lists to fetch at once
+        :return:
+        """
+
+        return self._multi_list('list_members', lists, limit, max_workers)
+
+    def multi_list_subscribers(self, lists, limit=None, max_workers=4):
+        """
+        Returns the subscribers of many lists, fetched concurrently, as one dataframe with list_owner and list_slug
+        columns.
+
+        :param lists: a list of (owner screen name, slug) pairs
+        :param limit: the maximum number of rows to return per list (optional, default None for all rows)
+        :param max_workers: (optional, default=4) the number of lists to fetch at once
+        :return:
+        """
+
+        return self._multi_list('list_subscribers', lists, limit, max_workers)
+
+    def multi_list_timeline(self, lists, since_ids=None, limit=None, max_workers=4):
+        """
+        Returns the timelines of many lists, fetched concurrently, as one dataframe with list_owner and list_slug
+        columns.  Each list only returns statuses newer than its watermark, the newest status id seen for it on the
+        last call, so calling this repeatedly only fetches what is new.  See list_watermarks.
+
+        A list that returns limit rows may have stopped short of its watermark, so its watermark is left where it was
+        (moving it would skip the statuses in between for good), and the next call fetches from the same place.
+
+        :param lists: a list of (owner screen name, slug) pairs
+        :param since_ids: (optional) a dict of (owner, slug) to since_id, overriding the stored watermarks
+        :param limit: the maximum number of rows to return per list (optional, default None for all rows); lists cut short by it keep their watermark
+        :param max_workers: (optional, default=4) the number of lists to fetch at once
+        :return:
+        """
+
+        watermarks = self._list_watermarks
+        lists = [tuple(key) for key in lists]
+        if since_ids is None:
+            with self._state_lock:
+                since_ids = {key: watermarks.get(key) for key in lists}
+
+        df = self._multi_list('list_timeline', lists, limit, max_workers, since_ids=since_ids)
+
+        if len(df) > 0:
+            ids = to_pandas(df, columns=['list_owner', 'list_slug', 'id'])
+            newest = ids.groupby(['list_owner', 'list_slug'])['id'].agg(['max', 'size'])
+            with self._state_lock:
+                for key, (since_id, fetched) in newest.iterrows():
+                    # only a list that was fetched all the way back to its watermark moves it
+                    if limit is None or fetched < limit:
+                        watermarks[key] = max(since_id, watermarks.get(key) or 0)
+
+        return df
+
+    def list_membership_matrix(self, lists, max_workers=4):
+        """
+        Returns a MembershipMatrix of the members of many lists, a sparse users by lists matrix with maps between user
+        ids and rows and (owner, slug) and columns.  Only the member ids are kept from each page as it is fetched.
+
+        :param lists: a list of (owner screen name, slug) pairs
+        :param max_workers: (optional, default=4) the number of lists to fetch at once
+        :return:
+        """
+
+        budget = self.rate_budget('list_members')
+
+        def fetch(key):
+            curr = self._list_cursor('list_members', key[0], key[1])
+            return np.fromiter((item['id'] for item in self._iter_items(curr, budget=budget)), dtype='int64')
+
+        lists = [tuple(key) for key in lists]
+        matrix = MembershipMatrix()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for key, user_ids in zip(lists, executor.map(fetch, lists)):
+                matrix.add_list(key, user_ids)
+
+        return matrix
+
+    @staticmethod
+    def _user_selectors(users):
+        """
+        Returns (kind, values) for a dataframe, series or list of users, where kind is user_id or screen_name.  Frames
+        use their id column if they have one, otherwise screen_name.  Series or lists of numbers, or of strings that
+        are all digits (like id_str), are taken as ids; pass all digit screen names in a screen_name column.
+
+        :param users:
+        :return:
+        """
+
+        users = to_pandas(users)
+        if isinstance(users, pd.DataFrame):
+            if 'id' in users.columns:
+                users = users['id']
+            elif 'screen_name' in users.columns:
+                users = users['screen_name']
+            else:
+                raise ValueError('A dataframe of users needs an id or screen_name column')
+
+            if users.name == 'screen_name':
+                return 'screen_name', users.dropna().drop_duplicates().tolist()
+
+        # a list with a None in it would otherwise be made float64
+        if isinstance(users, pd.Series):
+            users = users.dropna()
+        else:
+            users = pd.Series(list(users), dtype=object).dropna().infer_objects()
+
+        if not pd.api.types.is_numeric_dtype(users) and not users.astype(str).str.fullmatch(r'\d+').all():
+            return 'screen_name', users.drop_duplicates().tolist()
+
+        # numbers or digit strings, converted without going through float64
+        user_ids, _ = id_values(users.astype(str) if users.dtype == object else users)
+
+        return 'user_id', pd.unique(user_ids).tolist()
+
+    def _bulk_list_members(self, endpoint, owner, slug, users, progress):
+        """
+        Adds or removes users from a list 100 at a time with the create_all / destroy_all endpoints, paced by the
+        endpoint's rate budget.  If progress is a path, each batch's outcome is appended to it as a line of json, with
+        the endpoint, owner and slug it was for, and members already done for the same list in an earlier run are
+        skipped, so one progress file can be shared by several lists.
+
+        :return:
+        """
+
+        kind, members = self._user_selectors(users)
+        status = 'added' if endpoint == 'add_list_members' else 'removed'
+
+        done = {}
+        if progress is not None and os.path.exists(progress):
+            with open(progress) as f:
+                for line in f:
+                    record = json.loads(line)
+                    same_list = (record.get('endpoint') == endpoint and record.get('owner') == owner and
+                                 str(record.get('slug')) == str(slug))
+                    if same_list and record['status'] == status:
+                        done.update((member, record['batch']) for member in record['members'])
+
+        ds = [{'member': m, 'batch': done[m], 'status': 'skipped', 'error': None} for m in members if m in done]
+        todo = [m for m in members if m not in done]
+
+        budget = self.rate_budget(endpoint)
+        batch_size = page_size(endpoint)
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start + batch_size]
+            batch_id = '%s:%d' % (time.strftime('%Y%m%dT%H%M%S'), start // batch_size)
+
+            budget.acquire()
+            try:
+                self.retry_call(getattr(self.client, endpoint), 5, slug=slug, owner_screen_name=owner, **{kind: batch})
+                outcome, error = status, None
+            except tweepy.TweepError as e:
+                outcome, error = 'failed', str(e)
+
+            if progress is not None:
+                with open(progress, 'a') as f:
+                    f.write(json.dumps({'batch': batch_id, 'endpoint': endpoint, 'owner': owner, 'slug': slug,
+                                        'status': outcome, 'members': batch}) + '\n')
+
+            ds.extend({'member': m, 'batch': batch_id, 'status': outcome, 'error': error} for m in batch)
+
+        df = pd.DataFrame(ds, columns=['member', 'batch', 'status', 'error'])
 
         return df
 
+    def add_list_members(self, owner, slug, users, progress=None):
+        """
+        Adds many users to a list, 100 per call, and returns a dataframe with the outcome for each member (added,
+        failed, or skipped when done in an earlier run recorded in progress).
+
+        :param owner: the screen name of the owner of the list
+        :param slug: the slug name or numerical ID of the list
+        :param users: a dataframe with an id or screen_name column, or a series or list of user ids (numbers or digit strings) or screen names
+        :param progress: (optional) a path to record progress in, so an interrupted run can be resumed by calling again; records are kept per list, so one file can serve several
+        :return:
+        """
+
+        return self._bulk_list_members('add_list_members', owner, slug, users, progress)
+
+    def remove_list_members(self, owner, slug, users, progress=None):
+        """
+        Removes many users from a list, 100 per call, and returns a dataframe with the outcome for each member
+        (removed, failed, or skipped when done in an earlier run recorded in progress).
+
+        :param owner: the screen name of the owner of the list
+        :param slug: the slug name or numerical ID of the list
+        :param users: a dataframe with an id or screen_name column, or a series or list of user ids (numbers or digit strings) or screen names
+        :param progress: (optional) a path to record progress in, so an interrupted run can be resumed by calling again; records are kept per list, so one file can serve several
+        :return:
+        """
+
+        return self._bulk_list_members('remove_list_members', owner, slug, users, progress)
+
+    def list_watermarks(self):
+        """
+        Returns a dataframe of the since_id watermark kept for each list fetched with multi_list_timeline.
+
+        :return:
+        """
+
+        with self._state_lock:
+            watermarks = dict(self._list_watermarks)
+
+        return pd.DataFrame(
+            [{'list_owner': owner, 'list_slug': slug, 'since_id': since_id}
+             for (owner, slug), since_id in sorted(watermarks.items())],
+            columns=['list_owner', 'list_slug', 'since_id']
+        )
+
     # #################################################################
     # #####  Status Methods                                       #####
     # #################################################################
@@ -1099,15 +2301,165 @@ class TwitterPandas(object):
         :param id_: The numerical ID of the status.
         :return:
         """
-        data = self.client.get_status(id_)
 
-        ds = [self._flatten_dict(data._json, layers=3, drop_deeper=True)]
+        status = None
+        if self.batch_window is not None:
+            try:
+                status = self._loader('statuses').load(int(id_))
+            except KeyError:
+                # not returned by statuses/lookup, let statuses/show raise the error
+                pass
+
+        if status is None:
+            status = self.client.get_status(id_)._json
+
+        ds = [self._flatten_dict(status, layers=3, drop_deeper=True)]
 
         # form the dataframe
-        df = pd.DataFrame(ds)
+        df = self._frame(ds)
 
         return df
 
+    def reply_threads(self, statuses, max_depth=None):
+        """
+        Reconstructs the reply threads a dataframe of statuses belongs to.  Level by level, every in_reply_to_status_id
+        that isn't known yet is hydrated in 100-wide statuses_lookup calls, so a thread costs a call per 100 statuses
+        per level rather than one per hop.  Reply links seen before are cached on the client (up to reply_cache_size of
+        them) and not fetched again.  Ids are kept as int64 throughout: in_reply_to_status_id_str is used when the
+        statuses have it, since a float in_reply_to_status_id column (as pandas makes one with nulls) has lost digits.
+
+        Returns a ReplyThreads of:
+
+         * edges: a dataframe of status_id, in_reply_to_status_id for every reply link found
+         * statuses: the statuses passed in, with root_id and depth columns added
+         * ancestors: the statuses fetched to walk up the threads, flattened
+
+        All three are pandas dataframes whatever the client's backend.
+
+        :param statuses: a dataframe (of any backend) of statuses with id and in_reply_to_status_id (or in_reply_to_status_id_str) columns
+        :param max_depth: (optional) the most levels to walk up, default None to walk to the roots
+        :return:
+        """
+
+        statuses = to_pandas(statuses)
+        column = 'in_reply_to_status_id'
+        if 'in_reply_to_status_id_str' in statuses.columns:
+            column = 'in_reply_to_status_id_str'
+        status_ids, _ = id_values(statuses['id'])
+        parent_ids, has_parent = id_values(statuses[column])
+
+        # the links this call uses, merged into the shared cache at the end
+        parents = {}
+        for status_id, parent_id, known in zip(status_ids.tolist(), parent_ids.tolist(), has_parent.tolist()):
+            parents[status_id] = parent_id if known else None
+
+        def climb(ids):
+            # follows each id up the links already known, returning the first unknown status of each thread
+            unknown = set()
+            with self._state_lock:
+                cache = self._reply_parents
+                for parent_id in ids:
+                    while parent_id is not None:
+                        if parent_id not in parents:
+                            if parent_id not in cache:
+                                unknown.add(parent_id)
+                                break
+                            parents[parent_id] = cache[parent_id]
+                        parent_id = parents[parent_id]
+            return unknown
+
+        frontier = climb(set(parent_ids[has_parent].tolist()))
+
+        ancestors = []
+        level = 0
+        while frontier and (max_depth is None or level < max_depth):
+            frontier = sorted(frontier)
+            found = self._lookup_statuses(frontier)
+            for status in found:
+                parents[status['id']] = status.get('in_reply_to_status_id')
+            ancestors.extend(found)
+
+            # deleted or protected statuses end their thread where we can see it
+            for status_id in set(frontier) - set(status['id'] for status in found):
+                parents[status_id] = None
+
+            frontier = climb({parents[s] for s in frontier if parents[s] is not None})
+            level += 1
+
+        # the links reachable from the statuses passed in, the cache may hold others
+        links = {}
+        todo = status_ids.tolist()
+        while todo:
+            status_id = todo.pop()
+            if status_id in links or status_id not in parents:
+                continue
+            links[status_id] = parents[status_id]
+            if links[status_id] is not None:
+                todo.append(links[status_id])
+
+        edges = pd.DataFrame(
+            [(child, parent) for child, parent in links.items() if parent is not None],
+            columns=['status_id', 'in_reply_to_status_id']
+        )
+
+        roots = thread_roots(list(links.keys()), list(links.values()))
+        df = statuses
+        if len(statuses) > 0:
+            found = roots.reindex(status_ids)
+            df = statuses.assign(root_id=found['root_id'].values, depth=found['depth'].values)
+
+        # drop the oldest links once the cache is full
+        with self._state_lock:
+            cache = self._reply_parents
+            cache.update(parents)
+            while len(cache) > self.reply_cache_size:
+                cache.popitem(last=False)
+
+        # thread results are pandas whatever the backend, like the statuses they are joined to
+        ancestors = pd.DataFrame([self._flatten_dict(status, layers=3, drop_deeper=True) for status in ancestors])
+
+        return ReplyThreads(edges=edges, statuses=df, ancestors=ancestors)
+
+    def retweeters(self, status_ids, hydrate=False, limit=None, max_workers=4):
+        """
+        Returns a compact status_id, user_id edge table of who retweeted each of many statuses, paging the retweeter
+        ids endpoint for each status on a thread pool that shares its rate budget.
+
+        :param status_ids: a series (of any backend) or list of status ids
+        :param hydrate: (optional, default=False) if True, returns (edges, users) where users has one row per distinct retweeter, looked up 100 at a time
+        :param limit: the maximum number of retweeters to return per status (optional, default None for all of them)
+        :param max_workers: (optional, default=4) the number of statuses to page at once
+        :return:
+        """
+
+        budget = self.rate_budget('retweeters')
+
+        def fetch(status_id):
+            # create a tweepy cursor to safely return the data
+            curr = tweepy.Cursor(self._endpoint('retweeters'), id=status_id)
+
+            user_ids = []
+            for page in self._pages(curr, budget=budget, limit=limit):
+                user_ids.extend(page)
+
+            return np.asarray(user_ids[:limit], dtype='int64')
+
+        status_ids, known = id_values(to_pandas(status_ids))
+        status_ids = pd.unique(status_ids[known]).tolist()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, status_ids))
+
+        edges = pd.DataFrame({
+            'status_id': np.repeat(np.asarray(status_ids, dtype='int64'), [len(r) for r in results]),
+            'user_id': np.concatenate(results) if results else np.empty(0, dtype='int64'),
+        }, columns=['status_id', 'user_id'])
+
+        if hydrate:
+            users = pd.DataFrame(self._lookup_users(edges['user_id'].drop_duplicates().tolist()))
+            return edges, users
+
+        return edges
+
     def retweets(self, id_=None, count=None):
         """
         Returns up to 100* of the first retweets of the given tweet.
@@ -1134,5 +2486,5 @@ class TwitterPandas(object):
             ds.append(self._flatten_dict(retweet._json, layers=3, drop_deeper=True))
 
         # form the dataframe
-        df = pd.DataFrame(ds)
+        df = self._frame(ds)
         return df
@@ -0,0 +1,368 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: a resumable, rate limit aware breadth first crawler of the follow graph over the id endpoints
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import math
+import sqlite3
+import time
+
+import pandas as pd
+import tweepy
+
+from twitterpandas.graph import FollowGraph
+from twitterpandas.planner import page_size
+
+__author__ = 'willmcginnis'
+
+# the id endpoint paged for each direction, and whether the user is the source or the target of the edges it gives
+DIRECTIONS = {
+    'followers': ('followers_ids', 'target'),
+    'friends': ('friends_ids', 'source'),
+}
+SIDES = dict(DIRECTIONS.values())
+
+# the priority of users whose priority is unknown, so they are admitted last
+UNKNOWN = float('-inf')
+
+SCHEMA = [
+    # user_id is unique rather than the primary key, so rowid keeps the order users were found in
+    '''CREATE TABLE IF NOT EXISTS nodes (
+        user_id INTEGER NOT NULL UNIQUE,
+        hop INTEGER NOT NULL,
+        priority REAL,
+        admitted INTEGER NOT NULL DEFAULT 0
+    )''',
+    'CREATE INDEX IF NOT EXISTS nodes_next ON nodes (admitted, hop, priority)',
+    '''CREATE TABLE IF NOT EXISTS tasks (
+        user_id INTEGER NOT NULL,
+        endpoint TEXT NOT NULL,
+        hop INTEGER NOT NULL,
+        priority REAL,
+        cursor INTEGER NOT NULL DEFAULT -1,
+        fetched INTEGER NOT NULL DEFAULT 0,
+        done INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        PRIMARY KEY (user_id, endpoint)
+    )''',
+    'CREATE INDEX IF NOT EXISTS tasks_next ON tasks (endpoint, done, hop, priority)',
+    '''CREATE TABLE IF NOT EXISTS edges (
+        source INTEGER NOT NULL,
+        target INTEGER NOT NULL,
+        PRIMARY KEY (source, target)
+    ) WITHOUT ROWID''',
+]
+
+
+def _rank(priority):
+    # None and NaN are unknown, SQLite would store NaN as NULL, which reads as not ranked yet
+    if priority is None:
+        return UNKNOWN
+    priority = float(priority)
+    return UNKNOWN if math.isnan(priority) else priority
+
+
+class GraphCrawler(object):
+    """
+    Crawls the follow graph out from some seed users, a hop at a time, through followers_ids and friends_ids.  All of
+    its state lives in one SQLite file: the frontier of discovered users (each kept once, with the hop it was first
+    found at and an optional priority), the paging progress of each user being expanded, and the edges found so far, as
+    a deduplicated (source, target) table meaning source follows target.  Each page is written in one transaction
+    along with the cursor to continue from, so a crawl can be stopped or crash at any point and run() picks it back up.
+
+    Users are expanded in order of hop and then priority, up to max_nodes of them, and only users short of max_hops are
+    expanded.  Each direction's endpoint has its own rate budget, and every step pages whichever endpoint can make a
+    call soonest, so one being rate limited doesn't hold up the other.
+
+    A user whose ids twitter refuses (e.g. a protected account, a 401, or a suspended one) is marked done with the error
+    kept on its task, so the crawl goes on past it.  Errors without a response, such as a dropped connection, are raised
+    and leave the task to be retried by the next run().
+
+    """
+
+    def __init__(self, twitter_pandas, path, max_hops=2, max_nodes=1000, directions=('followers', 'friends'),
+                 priority=None, max_neighbors=None, budgets=None):
+        """
+
+        :param twitter_pandas: a TwitterPandas client
+        :param path: the SQLite file to keep the crawl in, created if it doesn't exist and resumed if it does
+        :param max_hops: (optional, default=2) how far from the seeds to go, users found at max_hops are recorded but not expanded
+        :param max_nodes: (optional, default=1000) the most users to expand, seeds included
+        :param directions: (optional) which edges to follow, followers and/or friends
+        :param priority: (optional) how to order users within a hop: None for the order they were found in, followers_count to look them up and go by follower count, or a function taking a list of user ids and returning a priority for each (higher first, None or NaN for unknown, which go last)
+        :param max_neighbors: (optional) the most ids to page per user and direction, to keep accounts with huge followings from taking the whole budget
+        :param budgets: (optional) a dict of endpoint name to RateBudget, defaults to the client's shared budget of each endpoint (see TwitterPandas.rate_budget)
+        :return:
+
+        """
+
+        unknown = set(directions) - set(DIRECTIONS)
+        if unknown:
+            raise ValueError('Unknown directions: %s' % ', '.join(sorted(unknown)))
+
+        self.twitter_pandas = twitter_pandas
+        self.path = path
+        self.max_hops = max_hops
+        self.max_nodes = max_nodes
+        self.directions = list(directions)
+        self.priority = priority
+        self.max_neighbors = max_neighbors
+
+        self.endpoints = [DIRECTIONS[direction][0] for direction in self.directions]
+        self.budgets = dict(budgets or {})
+        for endpoint in self.endpoints:
+            if endpoint not in self.budgets:
+                self.budgets[endpoint] = twitter_pandas.rate_budget(endpoint)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            for statement in SCHEMA:
+                self._db.execute(statement)
+
+            # crawls started before failed tasks were recorded
+            columns = [row[1] for row in self._db.execute('PRAGMA table_info(tasks)')]
+            if 'error' not in columns:
+                self._db.execute('ALTER TABLE tasks ADD COLUMN error TEXT')
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _priorities(self, user_ids):
+        if self.priority is None:
+            return [0.0] * len(user_ids)
+        if self.priority == 'followers_count':
+            users = {u['id']: u for u in self.twitter_pandas._lookup_users(list(user_ids))}
+            return [_rank(users.get(user_id, {}).get('followers_count', -1)) for user_id in user_ids]
+        return [_rank(p) for p in self.priority(list(user_ids))]
+
+    def add_seeds(self, user_ids):
+        """
+        Adds users to crawl out from, at hop 0.
+
+        :param user_ids: a list of user ids
+        :return:
+        """
+
+        user_ids = [int(user_id) for user_id in user_ids]
+        with self._db:
+            self._db.executemany(
+                'INSERT OR IGNORE INTO nodes (user_id, hop, priority) VALUES (?, 0, NULL)',
+                [(user_id,) for user_id in user_ids]
+            )
+
+    def _admit(self):
+        """
+        Starts expanding the next users from the frontier, while the node budget allows.  Priorities are only worked
+        out here, for users about to be admitted, so users that are never expanded are never looked up.
+        """
+
+        admitted = self._db.execute('SELECT COUNT(*) FROM nodes WHERE admitted = 1').fetchone()[0]
+        while admitted < self.max_nodes:
+            row = self._db.execute(
+                'SELECT MIN(hop) FROM nodes WHERE admitted = 0 AND hop < ?', (self.max_hops,)
+            ).fetchone()
+            if row[0] is None:
+                return
+            hop = row[0]
+
+            # the next hop waits until this one is fully paged, so it is ranked as a whole
+            expanding = self._db.execute('SELECT MIN(hop) FROM tasks WHERE done = 0').fetchone()[0]
+            if expanding is not None and expanding < hop:
+                return
+
+            # fill in the priorities of this hop, 100 users at a time
+            unranked = [r[0] for r in self._db.execute(
+                'SELECT user_id FROM nodes WHERE admitted = 0 AND hop = ? AND priority IS NULL '
+                'ORDER BY rowid LIMIT 100',
+                (hop,)
+            )]
+            if unranked:
+                with self._db:
+                    self._db.executemany(
+                        'UPDATE nodes SET priority = ? WHERE user_id = ?',
+                        list(zip(self._priorities(unranked), unranked))
+                    )
+                continue
+
+            batch = self._db.execute(
+                'SELECT user_id, priority FROM nodes WHERE admitted = 0 AND hop = ? '
+                'ORDER BY priority DESC, rowid LIMIT ?',
+                (hop, self.max_nodes - admitted)
+            ).fetchall()
+            with self._db:
+                for user_id, priority in batch:
+                    self._db.execute('UPDATE nodes SET admitted = 1 WHERE user_id = ?', (user_id,))
+                    self._db.executemany(
+                        'INSERT OR IGNORE INTO tasks (user_id, endpoint, hop, priority) VALUES (?, ?, ?, ?)',
+                        [(user_id, endpoint, hop, priority) for endpoint in self.endpoints]
+                    )
+            admitted += len(batch)
+
+    def _next_task(self, endpoint):
+        return self._db.execute(
+            'SELECT user_id, hop, cursor, fetched FROM tasks WHERE endpoint = ? AND done = 0 '
+            'ORDER BY hop, priority DESC, rowid LIMIT 1',
+            (endpoint,)
+        ).fetchone()
+
+    def _fetch(self, endpoint, user_id, cursor):
+        # create a tweepy cursor to safely return the data, starting from the saved position
+        curr = tweepy.Cursor(
+            getattr(self.twitter_pandas.client, endpoint),
+            user_id=user_id,
+            cursor=cursor,
+            count=page_size(endpoint)
+        )
+
+        page = next(iter(curr.pages()), [])
+        position = self.twitter_pandas._cursor_position(curr) or {'cursor': 0}
+
+        return list(page), position['cursor']
+
+    def step(self):
+        """
+        Fetches one page for whichever endpoint can make a call soonest, waiting if none can make one now.
+
+        :return: False if there was nothing left to do
+        """
+
+        self._admit()
+
+        tasks = [(endpoint, self._next_task(endpoint)) for endpoint in self.endpoints]
+        tasks = [(endpoint, task) for endpoint, task in tasks if task is not None]
+        if not tasks:
+            return False
+
+        endpoint, (user_id, hop, cursor, fetched) = min(tasks, key=lambda t: self.budgets[t[0]].wait_time())
+        self.budgets[endpoint].acquire()
+
+        try:
+            ids, next_cursor = self._fetch(endpoint, user_id, cursor)
+        except tweepy.RateLimitError:
+            raise
+        except tweepy.TweepError as e:
+            if getattr(e, 'response', None) is None:
+                raise
+
+            # twitter won't give this user's ids, record why and move on
+            with self._db:
+                self._db.execute(
+                    'UPDATE tasks SET done = 1, error = ? WHERE user_id = ? AND endpoint = ?',
+                    (str(e), user_id, endpoint)
+                )
+            return True
+        if self.max_neighbors is not None:
+            ids = ids[:max(self.max_neighbors - fetched, 0)]
+        done = next_cursor == 0 or not ids
+        if self.max_neighbors is not None and fetched + len(ids) >= self.max_neighbors:
+            done = True
+
+        edges = [(user_id, other) if SIDES[endpoint] == 'source' else (other, user_id) for other in ids]
+
+        # the page, the users it found and where to continue from are saved together
+        with self._db:
+            self._db.executemany('INSERT OR IGNORE INTO edges (source, target) VALUES (?, ?)', edges)
+            self._db.executemany(
+                'INSERT OR IGNORE INTO nodes (user_id, hop, priority) VALUES (?, ?, NULL)',
+                [(other, hop + 1) for other in ids]
+            )
+            self._db.execute(
+                'UPDATE tasks SET cursor = ?, fetched = ?, done = ? WHERE user_id = ? AND endpoint = ?',
+                (next_cursor, fetched + len(ids), int(done), user_id, endpoint)
+            )
+
+        return True
+
+    def run(self, max_calls=None, max_seconds=None):
+        """
+        Crawls until the frontier is exhausted, or max_calls pages have been fetched or max_seconds have passed.  Can be
+        called again, in this process or another, to carry on.
+
+        :param max_calls: (optional) the most pages to fetch in this run
+        :param max_seconds: (optional) the most seconds to run for
+        :return: a dict of progress counts, see status()
+        """
+
+        started = time.time()
+        calls = 0
+        while max_calls is None or calls < max_calls:
+            if max_seconds is not None and time.time() - started >= max_seconds:
+                break
+            if not self.step():
+                break
+            calls += 1
+
+        return self.status()
+
+    def status(self):
+        """
+        Returns a dict of counts: users found, users admitted for expansion, users fully expanded (including those that
+        failed), pages left to fetch for admitted users, tasks that failed with an error, and edges found.
+
+        :return:
+        """
+
+        def count(sql):
+            return self._db.execute(sql).fetchone()[0]
+
+        return {
+            'nodes': count('SELECT COUNT(*) FROM nodes'),
+            'admitted': count('SELECT COUNT(*) FROM nodes WHERE admitted = 1'),
+            'expanded': count('SELECT COUNT(*) FROM (SELECT user_id FROM tasks GROUP BY user_id HAVING MIN(done) = 1)'),
+            'pending': count('SELECT COUNT(*) FROM tasks WHERE done = 0'),
+            'failed': count('SELECT COUNT(*) FROM tasks WHERE error IS NOT NULL'),
+            'edges': count('SELECT COUNT(*) FROM edges'),
+        }
+
+    def failures(self):
+        """
+        Returns a dataframe of the user_id, endpoint and error of every task twitter refused.
+
+        :return:
+        """
+
+        return pd.read_sql_query(
+            'SELECT user_id, endpoint, error FROM tasks WHERE error IS NOT NULL ORDER BY rowid', self._db
+        )
+
+    def nodes(self):
+        """
+        Returns a dataframe of every user found, with the hop it was found at, its priority (if worked out) and whether
+        it was admitted for expansion.
+
+        :return:
+        """
+
+        return pd.read_sql_query('SELECT user_id, hop, priority, admitted FROM nodes ORDER BY hop, rowid', self._db)
+
+    def edges(self, chunksize=None):
+        """
+        Returns the edges found so far as a dataframe of int64 source and target columns, where source follows target,
+        or with chunksize a generator of dataframes of up to that many edges.
+
+        :param chunksize:
+        :return:
+        """
+
+        return pd.read_sql_query('SELECT source, target FROM edges', self._db, chunksize=chunksize)
+
+    def graph(self):
+        """
+        Returns the edges found so far as a FollowGraph, a sparse adjacency matrix for reciprocity, degree and overlap
+        queries (needs scipy).
+
+        :return:
+        """
+
+        return FollowGraph.from_edges(self.edges())
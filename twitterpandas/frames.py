@@ -0,0 +1,256 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: builds result frames column by column, as pandas dataframes, pyarrow tables or polars dataframes
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+BACKENDS = ['pandas', 'pyarrow', 'polars']
+
+
+def check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError('backend must be one of %s, not %s' % (', '.join(BACKENDS), backend))
+
+    # polars is an optional extra
+    if backend == 'polars':
+        try:
+            import polars  # noqa: F401
+        except ImportError:
+            raise ImportError('the polars backend needs polars, install it with pip install twitter-pandas[polars]')
+
+    return backend
+
+
+def _as_strings(values):
+    import pyarrow as pa
+
+    return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+
+def _arrow_column(values):
+    import pyarrow as pa
+
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        # mixed types in one field, e.g. a number in some rows and a string in others, are kept as strings
+        return _as_strings(values)
+
+
+def _promote(tables):
+    import pyarrow as pa
+
+    # chunks can differ in columns or in types (a column that was all null in one chunk), unify them
+    try:
+        return pa.concat_tables(tables, promote_options='permissive')
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        raise
+    except TypeError:
+        # pyarrow before 14 has no promote_options
+        return pa.concat_tables(tables, promote=True)
+
+
+def _concat_tables(tables):
+    import pyarrow as pa
+
+    if len(tables) == 1:
+        return tables[0]
+
+    try:
+        return _promote(tables)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+
+    # a field with types that can't be promoted, e.g. a string in one chunk and a number in another, becomes strings
+    types = {}
+    for table in tables:
+        for field in table.schema:
+            if not pa.types.is_null(field.type):
+                types.setdefault(field.name, set()).add(field.type)
+    mixed = [name for name, found in types.items() if len(found) > 1]
+
+    unified = []
+    for table in tables:
+        for name in mixed:
+            if name in table.column_names:
+                i = table.column_names.index(name)
+                table = table.set_column(i, name, _as_strings(table.column(name).to_pylist()))
+        unified.append(table)
+
+    return _promote(unified)
+
+
+class ColumnBuilder(object):
+    """
+    Builds a frame from flat row dicts, such as flattened users or statuses, one row at a time straight into a list per
+    column, so the rows never have to exist as a list of dicts.  Columns are in the order they are first seen and rows
+    without a field get NaN (null in arrow), the same as pd.DataFrame over the list of dicts would give.
+
+    For the pyarrow and polars backends the columns are converted to an arrow table every chunk_size rows and the python
+    values let go, which keeps the peak memory of a large pull near one chunk of python objects.  polars is handed the
+    arrow table without a copy.
+
+    """
+
+    def __init__(self, backend='pandas', chunk_size=50000):
+        """
+
+        :param backend: (optional, default=pandas) pandas, pyarrow or polars
+        :param chunk_size: (optional, default=50000) rows per arrow chunk for the pyarrow and polars backends
+        :return:
+
+        """
+
+        self.backend = check_backend(backend)
+        self.chunk_size = chunk_size
+        self.rows = 0
+
+        self._columns = {}
+        self._n = 0
+        self._chunks = []
+
+        # what a row without a field gets: NaN like a dataframe of dicts for pandas, null for arrow
+        self._missing = np.nan if backend == 'pandas' else None
+
+        # the fields of the last row and their columns, rows with the same fields in the same order take a fast path
+        self._keys = ()
+        self._lists = []
+
+    def append(self, row):
+        """
+        Adds one flat row dict.
+
+        :param row:
+        :return:
+        """
+
+        keys = tuple(row)
+        if keys == self._keys:
+            # append each value to its column without a python level loop
+            deque(map(list.append, self._lists, row.values()), maxlen=0)
+            self._n += 1
+            self.rows += 1
+            if self.backend != 'pandas' and self._n >= self.chunk_size:
+                self._flush()
+            return
+
+        # the fast path only holds while its fields are every column, which this row may change
+        self._keys = ()
+        self._lists = []
+
+        columns = self._columns
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [self._missing] * self._n
+            column.append(value)
+        self._n += 1
+        self.rows += 1
+
+        # pad the columns this row didn't have
+        if len(row) != len(columns):
+            for column in columns.values():
+                if len(column) < self._n:
+                    column.append(self._missing)
+        elif keys == tuple(columns):
+            self._keys = keys
+            self._lists = list(columns.values())
+
+        if self.backend != 'pandas' and self._n >= self.chunk_size:
+            self._flush()
+
+    def extend(self, rows):
+        """
+        Adds each row of an iterable of flat row dicts.
+
+        :param rows:
+        :return:
+        """
+
+        for row in rows:
+            self.append(row)
+
+    def _flush(self):
+        import pyarrow as pa
+
+        if self._n:
+            self._chunks.append(pa.table({name: _arrow_column(values) for name, values in self._columns.items()}))
+        self._columns = {}
+        self._n = 0
+        self._keys = ()
+        self._lists = []
+
+    def build(self):
+        """
+        Returns the frame of every row added, in the builder's backend.
+
+        :return:
+        """
+
+        if self.backend == 'pandas':
+            return pd.DataFrame(self._columns)
+
+        import pyarrow as pa
+
+        self._flush()
+        table = _concat_tables(self._chunks) if self._chunks else pa.table({})
+
+        if self.backend == 'polars':
+            import polars as pl
+            return pl.from_arrow(table)
+
+        return table
+
+
+def build_frame(rows, backend='pandas', chunk_size=50000):
+    """
+    Builds a frame in the given backend from an iterable of flat row dicts.
+
+    :param rows:
+    :param backend: (optional, default=pandas) pandas, pyarrow or polars
+    :param chunk_size: (optional, default=50000) rows per arrow chunk for the pyarrow and polars backends
+    :return:
+    """
+
+    builder = ColumnBuilder(backend=backend, chunk_size=chunk_size)
+    builder.extend(rows)
+
+    return builder.build()
+
+
+def to_pandas(frame, columns=None):
+    """
+    Converts a frame from any backend to a pandas dataframe, or a column (a polars Series or an arrow array) to a pandas
+    series.  Anything already pandas, or not a frame at all (like a list of ids), is returned as it is.  Integer
+    columns with nulls come back as object columns of ints rather than floats, so ids keep every digit.
+
+    :param frame:
+    :param columns: (optional) convert only these columns
+    :return:
+    """
+
+    if columns is not None:
+        frame = frame[columns] if isinstance(frame, pd.DataFrame) else frame.select(columns)
+
+    if isinstance(frame, (pd.DataFrame, pd.Series)) or not hasattr(frame, 'to_pandas'):
+        return frame
+
+    # polars goes through arrow, which can keep nullable integers exact
+    if hasattr(frame, 'to_arrow'):
+        frame = frame.to_arrow()
+
+    try:
+        return frame.to_pandas(integer_object_nulls=True)
+    except TypeError:
+        return frame.to_pandas()
@@ -0,0 +1,142 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: resolves coordinates to their nearest trend location locally, without calling trends_closest
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import numpy as np
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine(lat1, long1, lat2, long2):
+    """
+    Vectorized great circle distance in kilometers between arrays (or scalars) of coordinates in degrees.
+
+    :param lat1:
+    :param long1:
+    :param lat2:
+    :param long2:
+    :return:
+    """
+
+    lat1, long1, lat2, long2 = [np.radians(np.asarray(x, dtype='float64')) for x in [lat1, long1, lat2, long2]]
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((long2 - long1) / 2.0) ** 2
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _to_unit_vectors(lat, long):
+    lat = np.radians(np.asarray(lat, dtype='float64'))
+    long = np.radians(np.asarray(long, dtype='float64'))
+    return np.column_stack([np.cos(lat) * np.cos(long), np.cos(lat) * np.sin(long), np.sin(lat)])
+
+
+class LocationResolver(object):
+    """
+    Maps coordinates to the nearest location in a trends_available catalog that has coordinates, the same way
+    trends_closest does, but locally and for whole arrays at once.  Locations are indexed as points on the unit sphere,
+    where straight line distance orders the same as great circle distance, in a KD-tree if scipy is installed or with
+    a chunked brute force search otherwise.
+
+    """
+
+    def __init__(self, catalog, lat='lat', long='long', place_types=None, chunk_size=4096):
+        """
+
+        :param catalog: a dataframe of locations with a woeid column and coordinate columns, e.g. trends_available joined
+            to a table of woeid coordinates
+        :param lat: (optional, default=lat) the latitude column in the catalog
+        :param long: (optional, default=long) the longitude column in the catalog
+        :param place_types: (optional) a list of placeType.name values to limit matches to, e.g. ['Town']
+        :param chunk_size: (optional, default=4096) the number of points per chunk when searching without scipy
+        :return:
+
+        """
+
+        catalog = catalog.dropna(subset=[lat, long])
+        if place_types is not None:
+            catalog = catalog[catalog['placeType.name'].isin(place_types)]
+        if len(catalog) == 0:
+            raise ValueError('The catalog has no locations with coordinates to resolve against')
+
+        self.catalog = catalog.reset_index(drop=True)
+        self.lat = self.catalog[lat].values.astype('float64')
+        self.long = self.catalog[long].values.astype('float64')
+        self.chunk_size = chunk_size
+
+        self._points = _to_unit_vectors(self.lat, self.long)
+        try:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(self._points)
+        except ImportError:
+            self._tree = None
+
+    @classmethod
+    def from_catalog(cls, catalog, coordinates, **kwargs):
+        """
+        Builds a resolver from a trends_available catalog and a separate table of woeid coordinates (the API does not
+        return coordinates with the catalog).
+
+        :param catalog: a dataframe as returned by trends_available
+        :param coordinates: a dataframe with woeid, lat and long columns
+        :return:
+        """
+
+        return cls(catalog.merge(coordinates, on='woeid', how='inner'), **kwargs)
+
+    def _nearest(self, points):
+        if self._tree is not None:
+            _, idx = self._tree.query(points)
+            return idx
+
+        idx = np.empty(len(points), dtype='int64')
+        for start in range(0, len(points), self.chunk_size):
+            chunk = points[start:start + self.chunk_size]
+            # the largest dot product is the smallest angle
+            idx[start:start + self.chunk_size] = np.argmax(chunk.dot(self._points.T), axis=1)
+        return idx
+
+    def resolve(self, lat, long):
+        """
+        Returns a dataframe with the nearest catalog location for each coordinate pair, with the distance to it in
+        kilometers.  If lat is a Series its index is kept, rows with missing coordinates come back empty.
+
+        :param lat: an array or Series of latitudes
+        :param long: an array or Series of longitudes
+        :return:
+        """
+
+        index = lat.index if isinstance(lat, pd.Series) else None
+        lat = np.atleast_1d(np.asarray(lat, dtype='float64'))
+        long = np.atleast_1d(np.asarray(long, dtype='float64'))
+        valid = ~(np.isnan(lat) | np.isnan(long))
+
+        idx = self._nearest(_to_unit_vectors(lat[valid], long[valid]))
+
+        matched = self.catalog.iloc[idx].reset_index(drop=True)
+        matched['distance_km'] = haversine(lat[valid], long[valid], self.lat[idx], self.long[idx])
+
+        df = matched.set_index(np.flatnonzero(valid)).reindex(np.arange(len(lat)))
+        if index is not None:
+            df.index = index
+
+        return df
+
+    def closest(self, lat, long):
+        """
+        Returns a one row dataframe with the nearest location, like trends_closest.
+
+        :param lat:
+        :param long:
+        :return:
+        """
+
+        return self.resolve([lat], [long]).drop('distance_km', axis=1).reset_index(drop=True)
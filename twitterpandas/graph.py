@@ -0,0 +1,238 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: sparse adjacency matrix analytics over follow edges: reciprocity, degrees, audience overlap, similarity
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import numpy as np
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+KINDS = ['followers', 'friends']
+
+
+class FollowGraph(object):
+    """
+    A directed follow graph held as a scipy CSR adjacency matrix (scipy is needed to use it), where row i, column j is
+    1 if user i follows user j.  User ids are mapped to a compact 0..n-1 index, so the matrix is only as big as the
+    users that appear in the edges, and index maps between ids and rows / columns.  Every query is a sparse matrix
+    product or reduction rather than a merge, and the pairwise ones work through the rows in blocks to bound memory.
+
+    """
+
+    def __init__(self, matrix, index):
+        """
+
+        :param matrix: a square scipy sparse matrix of 0s and 1s, row follows column
+        :param index: the user id of each row / column
+        :return:
+
+        """
+
+        from scipy import sparse
+
+        self.matrix = sparse.csr_matrix(matrix, dtype='int32')
+        self.index = pd.Index(index, name='user_id')
+        self._rows = None
+
+    @classmethod
+    def from_edges(cls, edges, source='source', target='target'):
+        """
+        Builds the graph from an edge table, e.g. GraphCrawler.edges() or the output of followers_friendships joined to
+        the user it was run for.  Repeated edges count once.
+
+        :param edges: a dataframe with a column of follower ids and one of followed ids
+        :param source: (optional, default=source) the column of the users following
+        :param target: (optional, default=target) the column of the users being followed
+        :return:
+        """
+
+        from scipy import sparse
+
+        src = np.asarray(edges[source], dtype='int64')
+        dst = np.asarray(edges[target], dtype='int64')
+
+        # one compact index over both ends of every edge
+        ids, inverse = np.unique(np.concatenate([src, dst]), return_inverse=True)
+        rows, cols = inverse[:len(src)], inverse[len(src):]
+
+        matrix = sparse.csr_matrix((np.ones(len(rows), dtype='int32'), (rows, cols)), shape=(len(ids), len(ids)))
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+
+        return cls(matrix, ids)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def n_edges(self):
+        return self.matrix.nnz
+
+    def _positions(self, user_ids):
+        if self._rows is None:
+            self._rows = pd.Series(np.arange(len(self.index)), index=self.index)
+        return self._rows.loc[list(user_ids)].values
+
+    def _by_kind(self, kind):
+        """
+        The matrix with one row per user over the users it is related to: who follows them for followers, who they
+        follow for friends.
+        """
+
+        if kind not in KINDS:
+            raise ValueError('kind must be one of %s' % ', '.join(KINDS))
+
+        return self.matrix.T.tocsr() if kind == 'followers' else self.matrix
+
+    def in_degree(self):
+        """
+        Returns a series of the number of followers each user has within the graph.
+
+        :return:
+        """
+
+        return pd.Series(np.asarray(self.matrix.sum(axis=0)).ravel(), index=self.index, name='in_degree')
+
+    def out_degree(self):
+        """
+        Returns a series of the number of users each user follows within the graph.
+
+        :return:
+        """
+
+        return pd.Series(np.asarray(self.matrix.sum(axis=1)).ravel(), index=self.index, name='out_degree')
+
+    def reciprocity(self):
+        """
+        Returns the share of edges that are returned, i.e. where the followed user follows back.
+
+        :return:
+        """
+
+        if self.n_edges == 0:
+            return 0.0
+
+        return self.matrix.multiply(self.matrix.T).nnz / float(self.n_edges)
+
+    def mutual_counts(self):
+        """
+        Returns a series of the number of mutual follows (users that both follow and are followed by) each user has.
+
+        :return:
+        """
+
+        mutual = self.matrix.multiply(self.matrix.T)
+
+        return pd.Series(np.asarray(mutual.sum(axis=1)).ravel(), index=self.index, name='mutual')
+
+    def mutual_edges(self):
+        """
+        Returns a dataframe of each pair of users that follow each other, once per pair with user_a < user_b.
+
+        :return:
+        """
+
+        from scipy import sparse
+
+        mutual = sparse.triu(self.matrix.multiply(self.matrix.T), k=1).tocoo()
+        ids = self.index.values
+
+        return pd.DataFrame({'user_a': ids[mutual.row], 'user_b': ids[mutual.col]}, columns=['user_a', 'user_b'])
+
+    def overlap(self, user_ids, kind='followers'):
+        """
+        Returns a users by users dataframe of how many followers (or friends) each pair of the given users has in
+        common, with the diagonal the number each has.  This is A.A^T over just the given rows.
+
+        :param user_ids: the users to compare
+        :param kind: (optional, default=followers) followers for audience overlap, friends for mutual friends
+        :return:
+        """
+
+        rows = self._by_kind(kind)[self._positions(user_ids)]
+        shared = (rows @ rows.T).toarray()
+        index = pd.Index(list(user_ids), name='user_id')
+
+        return pd.DataFrame(shared, index=index, columns=index)
+
+    def similar(self, user_id, k=10, kind='followers', metric='jaccard', min_overlap=1):
+        """
+        Returns the k users whose followers (or friends) are most like user_id's, as a dataframe with the overlap and
+        the similarity score.  Only one row of A.A^T is computed.
+
+        :param user_id:
+        :param k: (optional, default=10) the number of users to return
+        :param kind: (optional, default=followers) compare followers (audience) or friends
+        :param metric: (optional, default=jaccard) jaccard, cosine or overlap (the raw count in common)
+        :param min_overlap: (optional, default=1) leave out users with fewer in common
+        :return:
+        """
+
+        by_kind = self._by_kind(kind)
+        sizes = np.diff(by_kind.indptr)
+        i = self._positions([user_id])[0]
+
+        shared = (by_kind[i] @ by_kind.T).tocoo()
+        keep = (shared.col != i) & (shared.data >= min_overlap)
+
+        return self._top(np.full(keep.sum(), i), shared.col[keep], shared.data[keep], sizes, k, metric)
+
+    def top_similar(self, k=10, kind='followers', metric='jaccard', min_overlap=1, block_size=1024):
+        """
+        Returns the k most similar users for every user with any followers (or friends) in the graph, as a long
+        dataframe of user_id, similar_id, overlap and score.  A.A^T is computed block_size rows at a time and only the
+        top k of each row is kept, so memory is bounded by a block rather than the whole product.
+
+        :param k: (optional, default=10) the number of similar users to keep per user
+        :param kind: (optional, default=followers) compare followers (audience) or friends
+        :param metric: (optional, default=jaccard) jaccard, cosine or overlap
+        :param min_overlap: (optional, default=1) leave out pairs with fewer in common
+        :param block_size: (optional, default=1024) the number of rows of the product to compute at once
+        :return:
+        """
+
+        by_kind = self._by_kind(kind)
+        sizes = np.diff(by_kind.indptr)
+        transposed = by_kind.T.tocsc()
+
+        frames = []
+        for start in range(0, by_kind.shape[0], block_size):
+            block = (by_kind[start:start + block_size] @ transposed).tocoo()
+            rows = block.row + start
+            keep = (rows != block.col) & (block.data >= min_overlap)
+            frames.append(self._top(rows[keep], block.col[keep], block.data[keep], sizes, k, metric))
+
+        if not frames:
+            return pd.DataFrame(columns=['user_id', 'similar_id', 'overlap', 'score'])
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _top(self, rows, cols, shared, sizes, k, metric):
+        shared = shared.astype('float64')
+        if metric == 'jaccard':
+            score = shared / (sizes[rows] + sizes[cols] - shared)
+        elif metric == 'cosine':
+            score = shared / np.sqrt(sizes[rows].astype('float64') * sizes[cols])
+        elif metric == 'overlap':
+            score = shared
+        else:
+            raise ValueError('metric must be one of jaccard, cosine or overlap')
+
+        df = pd.DataFrame({
+            'user_id': self.index.values[rows],
+            'similar_id': self.index.values[cols],
+            'overlap': shared.astype('int64'),
+            'score': score,
+        }, columns=['user_id', 'similar_id', 'overlap', 'score'])
+
+        # the k best per user, ties broken by id so results are stable
+        df = df.sort_values(['user_id', 'score', 'similar_id'], ascending=[True, False, True])
+
+        return df.groupby('user_id', sort=False).head(k).reset_index(drop=True)
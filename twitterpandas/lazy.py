@@ -0,0 +1,180 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: a lazily paged result for cursor methods, fetching only the pages a head, slice or iteration needs
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import threading
+
+__author__ = 'willmcginnis'
+
+
+def _has_rows(frame):
+    # pandas, pyarrow and polars frames, rather than a bundle of them
+    return hasattr(frame, 'iloc') or hasattr(frame, 'slice')
+
+
+def _row(frame, k):
+    # a series for pandas, a one row frame for the others
+    return frame.iloc[k] if hasattr(frame, 'iloc') else frame.slice(k, 1)
+
+
+class LazyFrame(object):
+    """
+    The result of a cursor method called with lazy=True.  Nothing is fetched until it is used, and then only the pages
+    needed: head(n) and slices with a non-negative stop fetch just enough pages for those rows, iterating fetches a page
+    at a time as it goes, and anything that needs the end (len(), negative indexes, to_frame()) pages through the rest.
+    Fetched items are kept, so nothing is fetched twice, and frames are built only from the rows asked for, in the same
+    form the method returns without lazy.  Iterating yields the rows one at a time, in the same form as indexing.
+
+    Items that need a lookup to become rows, like ids, are hydrated the first time a row of them is asked for and the
+    rows kept, so looking at them again costs no more calls.
+
+    """
+
+    def __init__(self, items, build, hydrate=None, batch=1):
+        """
+
+        :param items: an iterator of the raw items of the cursor, fetching pages as it is advanced
+        :param build: a function taking a list of raw items (or hydrated rows) and returning the method's dataframe for them
+        :param hydrate: (optional) a function taking a list of items and returning a dict of item to its row, for items like ids that each need a lookup; items missing from the dict are dropped
+        :param batch: (optional) how many items iterating fetches ahead and builds rows for at once, e.g. one lookup's worth of ids
+        :return:
+
+        """
+
+        self._items = items
+        self._build = build
+        self._hydrate = hydrate
+        self._batch = batch
+        self._rows = {}
+        self._cache = []
+        self._full = None
+        self._lock = threading.Lock()
+        self.exhausted = False
+
+    def _fill(self, n=None):
+        """
+        Advances the cursor until at least n items are cached, or to the end if n is None.
+        """
+
+        with self._lock:
+            while not self.exhausted and (n is None or len(self._cache) < n):
+                try:
+                    self._cache.append(next(self._items))
+                except StopIteration:
+                    self.exhausted = True
+
+    def _rows_for(self, items):
+        """
+        The rows to build a frame from: the items as they are, or their hydrated rows, looking up only items not
+        hydrated before.
+        """
+
+        if self._hydrate is None:
+            return items
+
+        with self._lock:
+            missing = list(dict.fromkeys(item for item in items if item not in self._rows))
+            if missing:
+                found = self._hydrate(missing)
+                for item in missing:
+                    self._rows[item] = found.get(item)
+
+            return [self._rows[item] for item in items if self._rows[item] is not None]
+
+    def _frame(self, items):
+        return self._build(self._rows_for(items))
+
+    @property
+    def fetched(self):
+        """
+        The number of items fetched so far.
+        """
+
+        return len(self._cache)
+
+    def head(self, n=5):
+        """
+        Returns the first n rows, fetching only the pages needed for them.
+
+        :param n:
+        :return:
+        """
+
+        self._fill(n)
+        return self._frame(self._cache[:n])
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.stop is not None and key.stop >= 0 and (key.start is None or key.start >= 0):
+                self._fill(key.stop)
+            else:
+                self._fill()
+            return self._frame(self._cache[key])
+
+        if key >= 0:
+            self._fill(key + 1)
+        else:
+            self._fill()
+
+        frame = self._frame([self._cache[key]])
+        return _row(frame, 0) if _has_rows(frame) else frame
+
+    def __iter__(self):
+        """
+        Iterates over the rows, fetching pages only as they are reached and building the rows of a batch together.
+        """
+
+        i = 0
+        while True:
+            self._fill(i + self._batch)
+            if i >= len(self._cache):
+                return
+
+            chunk = self._cache[i:i + self._batch]
+            frame = self._frame(chunk)
+            if _has_rows(frame):
+                for k in range(len(frame)):
+                    yield _row(frame, k)
+            else:
+                # a bundle of tables, e.g. normalized statuses, one per item
+                for item in chunk:
+                    yield self._frame([item])
+            i += len(chunk)
+
+    def __len__(self):
+        self._fill()
+        return len(self._cache)
+
+    def to_frame(self):
+        """
+        Fetches everything that is left and returns the full result, the same as calling the method without lazy.
+
+        :return:
+        """
+
+        if self._full is None:
+            self._fill()
+            self._full = self._frame(self._cache)
+
+        return self._full
+
+    def close(self):
+        """
+        Stops paging, the rows fetched so far stay available.
+
+        :return:
+        """
+
+        close = getattr(self._items, 'close', None)
+        if close is not None:
+            close()
+        self.exhausted = True
+
+    def __repr__(self):
+        return '<LazyFrame: %d items fetched%s>' % (len(self._cache), '' if self.exhausted else ', more to fetch')
@@ -0,0 +1,183 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: a sparse users by lists membership matrix for analyzing overlap between many lists
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import numpy as np
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+
+class MembershipMatrix(object):
+    """
+    A users by lists matrix of list membership, kept as a scipy CSR matrix (scipy is needed to use it).  Lists are added
+    one at a time from their member ids, so the full membership never has to exist as a dataframe, and user_index /
+    list_index map between ids and matrix rows / columns.
+
+    """
+
+    def __init__(self):
+        self._user_rows = {}
+        self._user_ids = []
+        self._lists = []
+        self._rows = []
+        self._cols = []
+        self._matrix = None
+
+    def add_list(self, key, user_ids):
+        """
+        Adds the members of one list.
+
+        :param key: the (owner, slug) of the list
+        :param user_ids: an iterable of member user ids
+        :return:
+        """
+
+        col = len(self._lists)
+        self._lists.append(tuple(key))
+
+        rows = []
+        for user_id in user_ids:
+            row = self._user_rows.get(user_id)
+            if row is None:
+                row = len(self._user_ids)
+                self._user_rows[user_id] = row
+                self._user_ids.append(user_id)
+            rows.append(row)
+
+        rows = np.unique(np.asarray(rows, dtype='int64'))
+        self._rows.append(rows)
+        self._cols.append(np.full(len(rows), col, dtype='int64'))
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        """
+        The users by lists membership matrix, as a scipy.sparse.csr_matrix of 1s.
+
+        :return:
+        """
+
+        if self._matrix is None:
+            from scipy import sparse
+
+            rows = np.concatenate(self._rows) if self._rows else np.empty(0, dtype='int64')
+            cols = np.concatenate(self._cols) if self._cols else np.empty(0, dtype='int64')
+            self._matrix = sparse.csr_matrix(
+                (np.ones(len(rows), dtype='int32'), (rows, cols)),
+                shape=(len(self._user_ids), len(self._lists))
+            )
+
+        return self._matrix
+
+    @property
+    def user_index(self):
+        """
+        The user id of each row.
+
+        :return:
+        """
+
+        return pd.Index(self._user_ids, name='user_id')
+
+    @property
+    def list_index(self):
+        """
+        The (list_owner, list_slug) of each column.
+
+        :return:
+        """
+
+        return pd.MultiIndex.from_tuples(self._lists, names=['list_owner', 'list_slug'])
+
+    @property
+    def shape(self):
+        return len(self._user_ids), len(self._lists)
+
+    def list_sizes(self):
+        """
+        Returns a series of the number of members of each list.
+
+        :return:
+        """
+
+        return pd.Series(np.asarray(self.matrix.sum(axis=0)).ravel(), index=self.list_index, name='members')
+
+    def membership_counts(self):
+        """
+        Returns a series of the number of lists each user is a member of.
+
+        :return:
+        """
+
+        return pd.Series(np.asarray(self.matrix.sum(axis=1)).ravel(), index=self.user_index, name='lists')
+
+    def users_in_at_least(self, k):
+        """
+        Returns a series of the number of lists each user is in, for the users in k or more of the lists.
+
+        :param k:
+        :return:
+        """
+
+        counts = self.membership_counts()
+
+        return counts[counts >= k].sort_values(ascending=False)
+
+    def lists_of(self, user_id):
+        """
+        Returns the (owner, slug) of each list a user is a member of.
+
+        :param user_id:
+        :return:
+        """
+
+        row = self._user_rows[user_id]
+        cols = self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]]
+
+        return self.list_index[np.sort(cols)]
+
+    def overlap(self):
+        """
+        Returns a lists by lists dataframe of the number of members each pair of lists has in common (the diagonal is
+        the size of each list).
+
+        :return:
+        """
+
+        m = self.matrix
+        shared = (m.T @ m).toarray()
+
+        return pd.DataFrame(shared, index=self.list_index, columns=self.list_index)
+
+    def jaccard(self, a=None, b=None):
+        """
+        Returns the Jaccard similarity between the members of lists a and b, or, if they are not passed, a lists by
+        lists dataframe of the similarity between every pair of lists.
+
+        :param a: (optional) the (owner, slug) of one list
+        :param b: (optional) the (owner, slug) of another list
+        :return:
+        """
+
+        if a is not None and b is not None:
+            cols = self.matrix.tocsc()
+            i, j = self._lists.index(tuple(a)), self._lists.index(tuple(b))
+            rows_a = cols.indices[cols.indptr[i]:cols.indptr[i + 1]]
+            rows_b = cols.indices[cols.indptr[j]:cols.indptr[j + 1]]
+            union = len(np.union1d(rows_a, rows_b))
+            return len(np.intersect1d(rows_a, rows_b)) / float(union) if union else 0.0
+
+        shared = self.overlap().values.astype('float64')
+        sizes = np.diag(shared)
+        union = sizes[:, None] + sizes[None, :] - shared
+        with np.errstate(invalid='ignore', divide='ignore'):
+            similarity = np.where(union > 0, shared / union, 0.0)
+
+        return pd.DataFrame(similarity, index=self.list_index, columns=self.list_index)
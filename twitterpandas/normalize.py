@@ -0,0 +1,123 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: splits raw statuses into separate, deduplicated statuses, users and entities tables
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+from collections import namedtuple
+
+import pandas as pd
+
+from twitterpandas.utils import flatten_dict
+
+__author__ = 'willmcginnis'
+
+StatusTables = namedtuple('StatusTables', ['statuses', 'users', 'hashtags', 'mentions', 'urls', 'media', 'referenced'])
+
+# keys of a status that get their own tables instead of being flattened into the status row
+NESTED = ['user', 'entities', 'extended_entities', 'retweeted_status', 'quoted_status']
+
+ENTITY_COLUMNS = {
+    'hashtags': ['status_id', 'position', 'text', 'start', 'end'],
+    'mentions': ['status_id', 'position', 'user_id', 'screen_name', 'name', 'start', 'end'],
+    'urls': ['status_id', 'position', 'url', 'expanded_url', 'display_url', 'start', 'end'],
+    'media': ['status_id', 'position', 'media_id', 'type', 'media_url_https', 'expanded_url', 'display_url', 'start',
+              'end'],
+}
+
+
+def _indices(entity):
+    indices = entity.get('indices') or [None, None]
+    return {'start': indices[0], 'end': indices[1]}
+
+
+def _entity_rows(status):
+    status_id = status['id']
+    entities = status.get('entities') or {}
+    rows = {kind: [] for kind in ENTITY_COLUMNS}
+
+    for position, hashtag in enumerate(entities.get('hashtags') or []):
+        rows['hashtags'].append(dict(status_id=status_id, position=position, text=hashtag.get('text'),
+                                     **_indices(hashtag)))
+
+    for position, mention in enumerate(entities.get('user_mentions') or []):
+        rows['mentions'].append(dict(status_id=status_id, position=position, user_id=mention.get('id'),
+                                     screen_name=mention.get('screen_name'), name=mention.get('name'),
+                                     **_indices(mention)))
+
+    for position, url in enumerate(entities.get('urls') or []):
+        rows['urls'].append(dict(status_id=status_id, position=position, url=url.get('url'),
+                                 expanded_url=url.get('expanded_url'), display_url=url.get('display_url'),
+                                 **_indices(url)))
+
+    # extended_entities has every attached photo, entities only the first
+    media = (status.get('extended_entities') or {}).get('media') or entities.get('media') or []
+    for position, item in enumerate(media):
+        rows['media'].append(dict(status_id=status_id, position=position, media_id=item.get('id'),
+                                  type=item.get('type'), media_url_https=item.get('media_url_https'),
+                                  expanded_url=item.get('expanded_url'), display_url=item.get('display_url'),
+                                  **_indices(item)))
+
+    return rows
+
+
+def _status_row(status):
+    row = flatten_dict({k: v for k, v in status.items() if k not in NESTED}, layers=3, drop_deeper=True)
+    row['user_id'] = (status.get('user') or {}).get('id')
+    row['retweeted_status_id'] = (status.get('retweeted_status') or {}).get('id')
+    row['quoted_status_id'] = (status.get('quoted_status') or {}).get('id')
+    return row
+
+
+def normalize_statuses(statuses):
+    """
+    Splits a list of raw status dicts (as in status._json) into a StatusTables bundle of dataframes:
+
+     * statuses: one row per status, with user_id, retweeted_status_id and quoted_status_id foreign keys in place of
+       the nested objects
+     * users: one row per distinct user, the authors of all statuses including referenced ones, deduplicated on id
+       keeping the first (for a timeline, the most recent) version of each
+     * hashtags, mentions, urls, media: one row per entity, keyed by status_id and position within the status
+     * referenced: the retweeted and quoted statuses, in the same shape as statuses, deduplicated on id
+
+    :param statuses:
+    :return:
+    """
+
+    status_rows, referenced_rows = [], []
+    users = {}
+    entities = {kind: [] for kind in ENTITY_COLUMNS}
+    seen_referenced = set()
+
+    def visit(status, rows):
+        rows.append(_status_row(status))
+
+        user = status.get('user')
+        if user and user.get('id') not in users:
+            users[user.get('id')] = flatten_dict(user, layers=3, drop_deeper=True)
+
+        for kind, entity_rows in _entity_rows(status).items():
+            entities[kind].extend(entity_rows)
+
+        for key in ['retweeted_status', 'quoted_status']:
+            referenced = status.get(key)
+            if referenced and referenced.get('id') not in seen_referenced:
+                seen_referenced.add(referenced.get('id'))
+                visit(referenced, referenced_rows)
+
+    for status in statuses:
+        visit(status, status_rows)
+
+    return StatusTables(
+        statuses=pd.DataFrame(status_rows),
+        users=pd.DataFrame(list(users.values())),
+        hashtags=pd.DataFrame(entities['hashtags'], columns=ENTITY_COLUMNS['hashtags']),
+        mentions=pd.DataFrame(entities['mentions'], columns=ENTITY_COLUMNS['mentions']),
+        urls=pd.DataFrame(entities['urls'], columns=ENTITY_COLUMNS['urls']),
+        media=pd.DataFrame(entities['media'], columns=ENTITY_COLUMNS['media']),
+        referenced=pd.DataFrame(referenced_rows),
+    )
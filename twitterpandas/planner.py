@@ -0,0 +1,246 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: estimates the cost of a request and picks the cheapest way to make it
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import math
+from collections import namedtuple
+
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+# length of a rate limit window, in seconds
+WINDOW = 15 * 60
+
+# the tweepy method name, the REST path (as reported by rate_limit_status), the largest page the endpoint will return,
+# the number of calls allowed per window with user auth, and the most items the endpoint will ever return in total.
+Endpoint = namedtuple('Endpoint', ['name', 'path', 'page_size', 'window_limit', 'max_items'])
+
+ENDPOINTS = {e.name: e for e in [
+    Endpoint('followers', '/followers/list', 200, 15, None),
+    Endpoint('followers_ids', '/followers/ids', 5000, 15, None),
+    Endpoint('friends', '/friends/list', 200, 15, None),
+    Endpoint('friends_ids', '/friends/ids', 5000, 15, None),
+    Endpoint('lookup_users', '/users/lookup', 100, 900, None),
+    Endpoint('get_user', '/users/show/:id', 1, 900, None),
+    Endpoint('search_users', '/users/search', 20, 900, 1000),
+    Endpoint('user_timeline', '/statuses/user_timeline', 200, 900, 3200),
+    Endpoint('home_timeline', '/statuses/home_timeline', 200, 15, 800),
+    Endpoint('retweets_of_me', '/statuses/retweets_of_me', 100, 75, None),
+    Endpoint('statuses_lookup', '/statuses/lookup', 100, 900, None),
+    Endpoint('get_status', '/statuses/show/:id', 1, 900, None),
+    Endpoint('retweets', '/statuses/retweets/:id', 100, 75, 100),
+    Endpoint('retweeters', '/statuses/retweeters/ids', 100, 75, None),
+    Endpoint('favorites', '/favorites/list', 200, 75, None),
+    Endpoint('direct_messages', '/direct_messages', 200, 15, None),
+    Endpoint('sent_direct_messages', '/direct_messages/sent', 200, 15, None),
+    Endpoint('search', '/search/tweets', 100, 180, None),
+    Endpoint('list_timeline', '/lists/statuses', 200, 900, None),
+    Endpoint('list_members', '/lists/members', 5000, 900, None),
+    Endpoint('list_subscribers', '/lists/subscribers', 5000, 180, None),
+    Endpoint('add_list_members', '/lists/members/create_all', 100, 75, None),
+    Endpoint('remove_list_members', '/lists/members/destroy_all', 100, 75, None),
+    Endpoint('show_friendship', '/friendships/show', 1, 180, None),
+    Endpoint('trends_place', '/trends/place', 1, 75, None),
+    Endpoint('trends_available', '/trends/available', 1, 75, None),
+    Endpoint('trends_closest', '/trends/closest', 1, 75, None),
+]}
+
+# the ways each TwitterPandas method can be served, as (strategy, [endpoints called in order]). The first strategy
+# listed is the one used when we know nothing about how big the result will be.
+STRATEGIES = {
+    'followers': [
+        ('list', ['followers']),
+        ('ids', ['followers_ids', 'lookup_users']),
+    ],
+    'friends': [
+        ('ids', ['friends_ids', 'lookup_users']),
+        ('list', ['friends']),
+    ],
+    'followers_friendships': [('ids', ['followers_ids'])],
+    'friends_friendships': [('ids', ['friends_ids'])],
+    'search_users': [('list', ['search_users'])],
+    'user_timeline': [('list', ['user_timeline'])],
+    'home_timeline': [('list', ['home_timeline'])],
+    'retweets_of_me': [('list', ['retweets_of_me'])],
+    'favorites': [('list', ['favorites'])],
+    'search': [('list', ['search'])],
+    'list_timeline': [('list', ['list_timeline'])],
+    'list_members': [('list', ['list_members'])],
+    'list_subscribers': [('list', ['list_subscribers'])],
+}
+
+
+def page_size(endpoint):
+    """
+    Returns the largest page size the endpoint supports, or None if we don't know it.
+
+    :param endpoint: the name of the tweepy method
+    :return:
+    """
+
+    spec = ENDPOINTS.get(endpoint)
+    return spec.page_size if spec is not None else None
+
+
+class RequestPlan(object):
+    """
+    The strategy chosen for one request, along with the estimates for every strategy that was considered.
+
+    """
+
+    def __init__(self, method, strategy, candidates):
+        self.method = method
+        self.strategy = strategy
+        self.candidates = candidates
+
+    @property
+    def chosen(self):
+        return [c for c in self.candidates if c['strategy'] == self.strategy]
+
+    @property
+    def endpoints(self):
+        return [c['endpoint'] for c in self.chosen]
+
+    @property
+    def page_size(self):
+        """
+        The page size to use for the first endpoint in the chosen strategy (the one being paged through).
+
+        :return:
+        """
+
+        return self.chosen[0]['page_size']
+
+    @property
+    def calls(self):
+        return sum(c['calls'] for c in self.chosen)
+
+    @property
+    def seconds(self):
+        return sum(c['seconds'] for c in self.chosen)
+
+    def explain(self):
+        """
+        Returns a dataframe with one row per endpoint per candidate strategy, with the page size, the estimated number
+        of calls, the calls remaining in the current window and the estimated wall time in seconds.
+
+        :return:
+        """
+
+        df = pd.DataFrame(self.candidates, columns=[
+            'strategy', 'endpoint', 'path', 'items', 'page_size', 'calls', 'window_limit', 'remaining',
+            'reset_in', 'seconds'
+        ])
+        df['chosen'] = df['strategy'] == self.strategy
+
+        return df
+
+    def __repr__(self):
+        return '<RequestPlan %s via %s: %s calls, ~%ss>' % (self.method, self.strategy, self.calls, self.seconds)
+
+
+class RequestPlanner(object):
+    """
+    Picks, for a given method, the strategy that will finish soonest under the rate limits (and with the fewest calls
+    when that's a tie), and the maximal page size for each endpoint it uses.
+
+    """
+
+    def __init__(self, rate_limits=None, latency=0.5, now=None):
+        """
+
+        :param rate_limits: (optional) a dataframe as returned by TwitterPandas.rate_limit_status, used for the calls
+            remaining in the current window.  Without it we assume every window is fresh.
+        :param latency: the assumed round trip time of one call, in seconds
+        :param now: (optional) the current time as a pandas Timestamp, used to work out how long until a reset
+        :return:
+
+        """
+
+        self.latency = latency
+        self.now = now
+        self.remaining = {}
+        if rate_limits is not None and len(rate_limits) > 0:
+            now = self.now if self.now is not None else pd.Timestamp.utcnow().tz_localize(None)
+            for _, row in rate_limits.iterrows():
+                reset_in = max((pd.Timestamp(row['reset']) - now).total_seconds(), 0)
+                self.remaining[row['endpoint']] = (int(row['remaining']), reset_in)
+
+    def estimate(self, endpoint, items):
+        """
+        Estimates the calls needed to fetch a number of items from an endpoint, and how long that will take.
+
+        :param endpoint: the name of the tweepy method
+        :param items: the number of items to fetch, or None if unknown
+        :return:
+        """
+
+        spec = ENDPOINTS[endpoint]
+        remaining, reset_in = self.remaining.get(spec.path, (spec.window_limit, WINDOW))
+
+        if items is None:
+            calls = float('nan')
+            seconds = float('nan')
+        else:
+            if spec.max_items is not None:
+                items = min(items, spec.max_items)
+            calls = max(int(math.ceil(items / float(spec.page_size))), 1)
+
+            # anything past what is left in this window waits for the reset, then for as many full windows as needed
+            seconds = calls * self.latency
+            overflow = calls - remaining
+            if overflow > 0:
+                seconds += reset_in + (int(math.ceil(overflow / float(spec.window_limit))) - 1) * WINDOW
+
+        return {
+            'endpoint': endpoint,
+            'path': spec.path,
+            'items': items,
+            'page_size': spec.page_size,
+            'calls': calls,
+            'window_limit': spec.window_limit,
+            'remaining': remaining,
+            'reset_in': reset_in,
+            'seconds': seconds,
+        }
+
+    def plan(self, method, limit=None, account_size=None):
+        """
+        Plans a request.
+
+        :param method: the name of the TwitterPandas method, e.g. followers
+        :param limit: the limit the method will be called with
+        :param account_size: (optional) how many items exist in total, e.g. the followers_count of the user
+        :return: a RequestPlan
+        """
+
+        if method not in STRATEGIES:
+            raise ValueError('No plan is available for %s, try one of: %s' % (method, ', '.join(sorted(STRATEGIES))))
+
+        sizes = [x for x in [limit, account_size] if x is not None]
+        items = min(sizes) if sizes else None
+
+        candidates = []
+        for strategy, endpoints in STRATEGIES[method]:
+            for endpoint in endpoints:
+                estimate = self.estimate(endpoint, items)
+                estimate['strategy'] = strategy
+                candidates.append(estimate)
+
+        # with nothing to go on, stick with the method's default
+        strategy = STRATEGIES[method][0][0]
+        if items is not None:
+            totals = {}
+            for c in candidates:
+                seconds, calls = totals.get(c['strategy'], (0, 0))
+                totals[c['strategy']] = (seconds + c['seconds'], calls + c['calls'])
+            strategy = min([s for s, _ in STRATEGIES[method]], key=lambda s: totals[s])
+
+        return RequestPlan(method, strategy, candidates)
@@ -0,0 +1,109 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: fetches the next pages of a cursor on a background thread while the current one is parsed
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import threading
+import queue
+import weakref
+
+__author__ = 'willmcginnis'
+
+_DONE = object()
+
+
+def _put(buffer, stop, item):
+    # waits for room in the buffer, giving up once stopped
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _fetch_ahead(pages, buffer, stop, before_fetch, limit):
+    # the thread's loop, holding no reference to the iterator so it can be collected, and so stop this, when dropped
+    fetched = 0
+    try:
+        while not stop.is_set() and (limit is None or fetched < limit):
+            if before_fetch is not None:
+                before_fetch()
+            try:
+                page = next(pages)
+            except StopIteration:
+                break
+            fetched += len(page)
+            if not _put(buffer, stop, (page, None)):
+                return
+    except Exception as e:
+        _put(buffer, stop, (None, e))
+        return
+
+    _put(buffer, stop, (_DONE, None))
+
+
+class PrefetchIterator(object):
+    """
+    Wraps an iterator of pages (e.g. tweepy.Cursor(...).pages()) and pulls from it on a background thread, keeping up
+    to depth pages ready, so the network wait for the next page overlaps with parsing the current one.  Errors raised
+    while fetching are re-raised from next().  Call close() to stop fetching early; an iterator that is dropped
+    without it, e.g. by a generator closed or collected part way through, stops its thread when it is collected.
+
+    """
+
+    def __init__(self, pages, depth=2, before_fetch=None, limit=None):
+        """
+
+        :param pages: an iterator of pages
+        :param depth: (optional, default=2) the most pages to fetch ahead of the consumer
+        :param before_fetch: (optional) a callable run on the background thread before each page, e.g. a rate budget's acquire
+        :param limit: (optional) stop fetching once the pages fetched hold this many items, so reading ahead never spends a call on a page past the limit
+        :return:
+
+        """
+
+        self._queue = queue.Queue(maxsize=max(int(depth), 1))
+        self._stop = threading.Event()
+        self._finished = False
+
+        self._thread = threading.Thread(target=_fetch_ahead, name='twitterpandas-prefetch',
+                                        args=(iter(pages), self._queue, self._stop, before_fetch, limit))
+        self._thread.daemon = True
+        self._thread.start()
+        weakref.finalize(self, self._stop.set)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+
+        page, error = self._queue.get()
+        if error is not None:
+            self.close()
+            raise error
+        if page is _DONE:
+            self.close()
+            raise StopIteration
+
+        return page
+
+    next = __next__
+
+    def close(self):
+        """
+        Stops fetching.
+
+        :return:
+        """
+
+        self._finished = True
+        self._stop.set()
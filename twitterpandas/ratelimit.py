@@ -0,0 +1,108 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: client side accounting of the calls left in a rate limit window
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import threading
+import time
+from collections import deque
+
+from twitterpandas.planner import ENDPOINTS, WINDOW
+
+__author__ = 'willmcginnis'
+
+
+class RateBudget(object):
+    """
+    A sliding window budget of calls to one endpoint, shared between threads.  Each call to acquire() blocks until a
+    call can be made without going over the budget.
+
+    """
+
+    def __init__(self, calls, window=WINDOW, clock=time.time, sleep=time.sleep):
+        """
+
+        :param calls: the number of calls allowed per window
+        :param window: the length of the window in seconds
+        :param clock: (optional) the time function, swappable for testing
+        :param sleep: (optional) the sleep function, swappable for testing
+        :return:
+
+        """
+
+        self.calls = int(calls)
+        self.window = window
+        self.clock = clock
+        self.sleep = sleep
+        self._made = deque()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_endpoint(cls, endpoint, remaining=None, **kwargs):
+        """
+        Builds a budget from the known window limit of an endpoint, or from the calls remaining if that is known.
+
+        :param endpoint: the name of the tweepy method
+        :param remaining: (optional) the calls left in the current window
+        :return:
+        """
+
+        calls = ENDPOINTS[endpoint].window_limit
+        if remaining is not None:
+            calls = min(calls, remaining)
+        return cls(max(calls, 1), **kwargs)
+
+    def _expire(self, now):
+        while self._made and self._made[0] <= now - self.window:
+            self._made.popleft()
+
+    @property
+    def remaining(self):
+        with self._lock:
+            self._expire(self.clock())
+            return self.calls - len(self._made)
+
+    def wait_time(self):
+        """
+        The seconds until a call can be made, 0 if one can be made now.
+
+        :return:
+        """
+
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            if len(self._made) < self.calls:
+                return 0.0
+            return max(self._made[0] + self.window - now, 0.0)
+
+    def acquire(self, stop=None):
+        """
+        Blocks until a call is available and then records it.  If a stop event is passed, the wait ends as soon as it is
+        set, without recording a call.
+
+        :param stop: (optional) a threading.Event that cancels the wait
+        :return: True if a call was recorded, False if stop was set first
+        """
+
+        while True:
+            if stop is not None and stop.is_set():
+                return False
+
+            with self._lock:
+                now = self.clock()
+                self._expire(now)
+                if len(self._made) < self.calls:
+                    self._made.append(now)
+                    return True
+                wait = self._made[0] + self.window - now
+
+            if stop is not None:
+                stop.wait(max(wait, 0))
+            else:
+                self.sleep(max(wait, 0))
@@ -0,0 +1,133 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: uniform samples of an id list and population estimates with confidence intervals from them
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from twitterpandas.frames import to_pandas
+
+__author__ = 'willmcginnis'
+
+FollowerSample = namedtuple('FollowerSample', ['sample', 'statistics', 'population'])
+
+# user fields summarized by default, as shares of each value and as means and quantiles
+CATEGORICAL = ['lang', 'verified', 'protected', 'default_profile', 'geo_enabled', 'has_location']
+NUMERIC = ['followers_count', 'friends_count', 'statuses_count', 'favourites_count', 'listed_count']
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+STAT_COLUMNS = ['field', 'statistic', 'value', 'estimate', 'lower', 'upper', 'n']
+
+
+def _z(confidence):
+    return NormalDist().inv_cdf((1 + confidence) / 2.0)
+
+
+def _fpc(n, population):
+    # the finite population correction, sampling a good part of a small population narrows the interval
+    if population is None or population <= 1:
+        return 1.0
+    return np.sqrt(max(population - n, 0) / float(population - 1))
+
+
+def sample_size(population, confidence=0.95, margin=0.05):
+    """
+    Returns the sample size that estimates any share of a population to within margin at the given confidence, from
+    the worst case share of one half, with the finite population correction.
+
+    :param population: the size of the population
+    :param confidence: (optional, default=0.95)
+    :param margin: (optional, default=0.05) the half width of the confidence interval of a share
+    :return:
+    """
+
+    n0 = _z(confidence) ** 2 * 0.25 / margin ** 2
+    n = n0 / (1 + (n0 - 1) / float(population)) if population else n0
+
+    return int(min(np.ceil(n), population)) if population else int(np.ceil(n))
+
+
+def uniform_sample(ids, size, seed=None):
+    """
+    Returns size ids drawn uniformly without replacement, or all of them if there are no more than size.
+
+    :param ids:
+    :param size:
+    :param seed: (optional) a seed for repeatable samples
+    :return:
+    """
+
+    ids = np.asarray(ids)
+    if size >= len(ids):
+        return ids.tolist()
+
+    return ids[np.random.default_rng(seed).choice(len(ids), size=size, replace=False)].tolist()
+
+
+def population_statistics(sample, population=None, confidence=0.95, categorical=None, numeric=None, top=10):
+    """
+    Estimates population statistics from a uniform sample of users, as a long dataframe of field, statistic, value,
+    estimate, lower, upper and n (the sample rows with the field).  For categorical fields there is a share row per
+    value (the top most common, for fields like lang), for numeric fields a mean row and a row per quantile.  Shares and
+    means get normal intervals with the finite population correction, quantiles get distribution free intervals from
+    the order statistics.
+
+    :param sample: a dataframe (of any backend) of sampled users
+    :param population: (optional) the population size, for the finite population correction
+    :param confidence: (optional, default=0.95)
+    :param categorical: (optional) fields to give shares of, defaults to lang, verified, protected, default_profile, geo_enabled and has_location (whether location is filled in)
+    :param numeric: (optional) fields to give means and quantiles of, defaults to the count fields
+    :param top: (optional, default=10) the most values to give shares of per categorical field
+    :return:
+    """
+
+    z = _z(confidence)
+    categorical = CATEGORICAL if categorical is None else categorical
+    numeric = NUMERIC if numeric is None else numeric
+
+    sample = to_pandas(sample).copy()
+    if 'has_location' in categorical and 'has_location' not in sample.columns and 'location' in sample.columns:
+        sample['has_location'] = sample['location'].fillna('').astype(str).str.strip() != ''
+
+    rows = []
+    for field in categorical:
+        if field not in sample.columns:
+            continue
+        values = sample[field].dropna()
+        n = len(values)
+        if not n:
+            continue
+        fpc = _fpc(n, population)
+        for value, share in values.value_counts(normalize=True).head(top).items():
+            half = z * np.sqrt(share * (1 - share) / n) * fpc
+            rows.append((field, 'share', value, share, max(share - half, 0.0), min(share + half, 1.0), n))
+
+    for field in numeric:
+        if field not in sample.columns:
+            continue
+        values = np.sort(pd.to_numeric(sample[field], errors='coerce').dropna().values.astype('float64'))
+        n = len(values)
+        if not n:
+            continue
+
+        mean = values.mean()
+        half = z * (values.std(ddof=1) / np.sqrt(n) if n > 1 else 0.0) * _fpc(n, population)
+        rows.append((field, 'mean', None, mean, mean - half, mean + half, n))
+
+        for q in QUANTILES:
+            # the ranks that bracket the q quantile at the given confidence
+            spread = z * np.sqrt(n * q * (1 - q))
+            lower = values[int(np.clip(np.floor(n * q - spread), 0, n - 1))]
+            upper = values[int(np.clip(np.ceil(n * q + spread), 0, n - 1))]
+            rows.append((field, 'quantile', q, float(np.quantile(values, q)), lower, upper, n))
+
+    return pd.DataFrame(rows, columns=STAT_COLUMNS)
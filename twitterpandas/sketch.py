@@ -0,0 +1,355 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: fixed size HyperLogLog and MinHash sketches of follower ids, for cardinality, union and overlap estimates
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+# marks the unused slots of a minhash that holds fewer than k values, when sketches are stacked to be saved
+EMPTY = np.iinfo('uint64').max
+
+
+def hash_ids(ids):
+    """
+    Hashes an array of integer ids to well mixed 64 bit values (splitmix64), vectorized and the same on every
+    platform, so sketches built in different processes can be compared.
+
+    :param ids:
+    :return:
+    """
+
+    x = np.asarray(ids, dtype='int64').astype('uint64')
+    with np.errstate(over='ignore'):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return x ^ (x >> np.uint64(31))
+
+
+def _bit_length(x):
+    # exact for 64 bit values, by halves, since float64 only holds 53 bits
+    hi = np.frexp((x >> np.uint64(32)).astype('float64'))[1]
+    lo = np.frexp((x & np.uint64(0xFFFFFFFF)).astype('float64'))[1]
+    return np.where(hi > 0, hi + 32, lo)
+
+
+def hll_estimate(registers):
+    """
+    The HyperLogLog cardinality estimate of a registers array, or of each row of a 2d array of them, with the linear
+    counting correction for small sets.
+
+    :param registers:
+    :return:
+    """
+
+    registers = np.asarray(registers)
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype('int64')), axis=-1)
+    zeros = np.sum(registers == 0, axis=-1)
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1).astype('float64'))
+
+    return np.where((estimate <= 2.5 * m) & (zeros > 0), linear, estimate)
+
+
+class FollowerSketch(object):
+    """
+    A fixed size summary of one account's follower ids: a HyperLogLog of 2^precision registers for the number of
+    distinct ids, and a bottom-k MinHash (the k smallest id hashes) for Jaccard similarity with other accounts.  Its
+    size doesn't depend on the number of followers, and ids are added a page at a time.
+
+    seen is the number of ids added.  A sketch of only the first pages of an account (stopped early, or by a limit) is
+    a sample: total is then the account's follower count if known, and the estimates that use it are scaled up.
+
+    """
+
+    def __init__(self, precision=14, k=256, registers=None, minhash=None, seen=0, total=None, complete=False):
+        """
+
+        :param precision: (optional, default=14) log2 of the number of registers, the cardinality error is about 1.04 / sqrt(2^precision), 0.8% at 14
+        :param k: (optional, default=256) the number of hashes kept, the Jaccard error is about 1 / sqrt(k)
+        :param registers: (optional) saved registers to start from
+        :param minhash: (optional) saved minhash values to start from
+        :param seen: (optional, default=0) the number of ids already added
+        :param total: (optional) the account's follower count
+        :param complete: (optional, default=False) whether every follower has been added
+        :return:
+
+        """
+
+        self.precision = precision
+        self.k = k
+        self.registers = np.zeros(2 ** precision, dtype='uint8') if registers is None else registers
+        self.minhash = np.array([], dtype='uint64') if minhash is None else minhash
+        self.seen = seen
+        self.total = total
+        self.complete = complete
+
+    def update(self, ids):
+        """
+        Adds a page of ids.
+
+        :param ids:
+        :return:
+        """
+
+        hashes = hash_ids(ids)
+        if not len(hashes):
+            return
+        self.seen += len(hashes)
+
+        # the top bits pick the register, the rank of the first set bit in the rest is its value
+        width = np.uint64(64 - self.precision)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        ranks = (int(width) - _bit_length(rest) + 1).astype('uint8')
+        np.maximum.at(self.registers, (hashes >> width).astype('int64'), ranks)
+
+        if len(self.minhash) == self.k:
+            hashes = hashes[hashes < self.minhash[-1]]
+        self.minhash = np.union1d(self.minhash, hashes)[:self.k]
+
+    @property
+    def fraction(self):
+        """
+        The share of the account's followers added, 1 if complete or the total isn't known.
+        """
+
+        if self.complete or not self.total or not self.seen:
+            return 1.0
+        return min(self.seen / float(self.total), 1.0)
+
+    def cardinality(self):
+        """
+        Returns the estimated number of distinct followers: from the registers if complete, otherwise the follower
+        count if known.
+
+        :return:
+        """
+
+        if not self.complete and self.total:
+            return float(self.total)
+        return float(hll_estimate(self.registers))
+
+    def sampling_error(self):
+        """
+        Returns the largest standard error of any share of followers estimated from the ids added so far, e.g. the
+        share that also follow another account, with the finite population correction if the total is known.  0 once
+        complete.
+
+        :return:
+        """
+
+        if self.complete:
+            return 0.0
+        if not self.seen:
+            return float('inf')
+
+        correction = 1.0
+        if self.total and self.total > 1:
+            correction = max(self.total - self.seen, 0) / float(self.total - 1)
+
+        return float(np.sqrt(0.25 / self.seen * correction))
+
+
+class SketchBank(object):
+    """
+    The follower sketches of many accounts, keyed by user id, with pairwise estimates across them.  Every sketch has
+    the same precision and k, so they can be stacked: union estimates take the elementwise max of registers, and
+    overlaps combine a MinHash Jaccard with a HyperLogLog union.  The whole bank is saved to and loaded from one npz
+    file, so it can be grown over several runs.
+
+    """
+
+    def __init__(self, precision=14, k=256):
+        """
+
+        :param precision: (optional, default=14) log2 of the number of HyperLogLog registers per sketch
+        :param k: (optional, default=256) the number of MinHash values per sketch
+        :return:
+
+        """
+
+        self.precision = precision
+        self.k = k
+        self.sketches = {}
+
+    def __len__(self):
+        return len(self.sketches)
+
+    def __contains__(self, user_id):
+        return user_id in self.sketches
+
+    def __getitem__(self, user_id):
+        return self.sketches[user_id]
+
+    def __setitem__(self, user_id, sketch):
+        if (sketch.precision, sketch.k) != (self.precision, self.k):
+            raise ValueError('Sketches in a bank must all have precision=%s and k=%s' % (self.precision, self.k))
+        self.sketches[user_id] = sketch
+
+    def new_sketch(self, total=None):
+        return FollowerSketch(precision=self.precision, k=self.k, total=total)
+
+    @property
+    def user_ids(self):
+        return list(self.sketches.keys())
+
+    def save(self, path):
+        """
+        Writes the bank to an npz file, replacing it in one step.
+
+        :param path:
+        :return:
+        """
+
+        user_ids = self.user_ids
+        sketches = [self.sketches[user_id] for user_id in user_ids]
+
+        minhash = np.full((len(sketches), self.k), EMPTY, dtype='uint64')
+        for row, sketch in enumerate(sketches):
+            minhash[row, :len(sketch.minhash)] = sketch.minhash
+
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(
+                f,
+                precision=self.precision,
+                k=self.k,
+                user_ids=np.asarray(user_ids, dtype='int64'),
+                registers=np.asarray([s.registers for s in sketches], dtype='uint8').reshape(-1, 2 ** self.precision),
+                minhash=minhash,
+                lengths=np.asarray([len(s.minhash) for s in sketches], dtype='int64'),
+                seen=np.asarray([s.seen for s in sketches], dtype='int64'),
+                total=np.asarray([-1 if s.total is None else s.total for s in sketches], dtype='int64'),
+                complete=np.asarray([s.complete for s in sketches], dtype='bool'),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a bank written by save().
+
+        :param path:
+        :return:
+        """
+
+        with np.load(path) as data:
+            bank = cls(precision=int(data['precision']), k=int(data['k']))
+            for row, user_id in enumerate(data['user_ids'].tolist()):
+                bank[user_id] = FollowerSketch(
+                    precision=bank.precision,
+                    k=bank.k,
+                    registers=data['registers'][row].copy(),
+                    minhash=data['minhash'][row, :data['lengths'][row]].copy(),
+                    seen=int(data['seen'][row]),
+                    total=None if data['total'][row] < 0 else int(data['total'][row]),
+                    complete=bool(data['complete'][row]),
+                )
+
+        return bank
+
+    def cardinality(self):
+        """
+        Returns a series of the estimated number of followers of each account.
+
+        :return:
+        """
+
+        return pd.Series(
+            [self.sketches[user_id].cardinality() for user_id in self.user_ids],
+            index=pd.Index(self.user_ids, name='user_id'),
+            name='cardinality'
+        )
+
+    def union(self, user_ids=None):
+        """
+        Returns the estimated number of distinct followers across accounts (all of them by default).  For sketches
+        that aren't complete this only counts the ids that were added.
+
+        :param user_ids:
+        :return:
+        """
+
+        user_ids = self.user_ids if user_ids is None else list(user_ids)
+        registers = np.max([self.sketches[user_id].registers for user_id in user_ids], axis=0)
+
+        return float(hll_estimate(registers))
+
+    def _jaccard(self, a, b):
+        # the k smallest hashes of the union are a uniform sample of it, count those in both sets
+        union = np.union1d(a.minhash, b.minhash)[:self.k]
+        if not len(union):
+            return 0.0
+        both = np.isin(union, a.minhash, assume_unique=True) & np.isin(union, b.minhash, assume_unique=True)
+        return both.sum() / float(len(union))
+
+    def _pairwise(self, user_ids):
+        """
+        The estimated followers in common of each pair of accounts, as a square array.  The added ids in common are the
+        MinHash Jaccard times the HyperLogLog union, then divided by the fraction added of each account, so a pair of
+        sampled accounts is scaled up to the full accounts.
+        """
+
+        sketches = [self.sketches[user_id] for user_id in user_ids]
+        registers = np.asarray([s.registers for s in sketches])
+        fractions = np.asarray([s.fraction for s in sketches])
+        sizes = np.asarray([s.cardinality() for s in sketches])
+
+        shared = np.diag(sizes)
+        for i in range(len(sketches) - 1):
+            unions = hll_estimate(np.maximum(registers[i], registers[i + 1:]))
+            jaccards = np.asarray([self._jaccard(sketches[i], other) for other in sketches[i + 1:]])
+            row = jaccards * unions / (fractions[i] * fractions[i + 1:])
+
+            # can't have more in common than the smaller account has
+            row = np.minimum(row, np.minimum(sizes[i], sizes[i + 1:]))
+            shared[i, i + 1:] = row
+            shared[i + 1:, i] = row
+
+        return shared, sizes
+
+    def overlap(self, user_ids=None):
+        """
+        Returns an accounts by accounts dataframe of the estimated number of followers each pair has in common, with the
+        diagonal the estimated follower count of each.
+
+        :param user_ids: (optional) the accounts to compare, all of them by default
+        :return:
+        """
+
+        user_ids = self.user_ids if user_ids is None else list(user_ids)
+        shared, _ = self._pairwise(user_ids)
+        index = pd.Index(user_ids, name='user_id')
+
+        return pd.DataFrame(shared, index=index, columns=index)
+
+    def jaccard(self, user_ids=None):
+        """
+        Returns an accounts by accounts dataframe of the estimated Jaccard similarity of each pair's followers.
+
+        :param user_ids: (optional) the accounts to compare, all of them by default
+        :return:
+        """
+
+        user_ids = self.user_ids if user_ids is None else list(user_ids)
+        shared, sizes = self._pairwise(user_ids)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = np.nan_to_num(shared / (sizes[:, None] + sizes[None, :] - shared))
+        np.fill_diagonal(similarity, 1.0)
+        index = pd.Index(user_ids, name='user_id')
+
+        return pd.DataFrame(similarity, index=index, columns=index)
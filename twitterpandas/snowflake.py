@@ -0,0 +1,148 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: conversions between twitter's snowflake ids and the times they were created
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+# milliseconds since the unix epoch of the first snowflake id, and how far the timestamp is shifted within the id
+TWEPOCH = 1288834974657
+TIMESTAMP_SHIFT = 22
+
+
+def _to_utc_millis(dt):
+    ts = pd.Timestamp(dt)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int((ts - pd.Timestamp('1970-01-01')) // pd.Timedelta(milliseconds=1))
+
+
+def datetime_to_snowflake(dt):
+    """
+    Returns the smallest snowflake id that could have been created at the given time.  Naive datetimes are taken to be
+    UTC.
+
+    :param dt: a datetime, pandas Timestamp or anything pandas can parse into one
+    :return:
+    """
+
+    return max(_to_utc_millis(dt) - TWEPOCH, 0) << TIMESTAMP_SHIFT
+
+
+def snowflake_to_datetime(id_):
+    """
+    Returns the (naive, UTC) time a snowflake id was created at.
+
+    :param id_:
+    :return:
+    """
+
+    millis = (int(id_) >> TIMESTAMP_SHIFT) + TWEPOCH
+    return pd.Timestamp(datetime.datetime(1970, 1, 1)) + pd.Timedelta(milliseconds=millis)
+
+
+def snowflakes_to_datetimes(ids):
+    """
+    Vectorized snowflake_to_datetime, for a whole column of ids at once.  Returns the (naive, UTC) creation times as a
+    Series with the same index if ids is a Series, otherwise as a DatetimeIndex.  Missing ids come back as NaT.
+
+    :param ids: an array, list or Series of snowflake ids
+    :return:
+    """
+
+    s = ids if isinstance(ids, pd.Series) else pd.Series(np.asarray(ids))
+    valid = s.notna().values
+
+    millis = np.full(len(s), np.nan)
+    millis[valid] = (s[valid].values.astype('int64') >> TIMESTAMP_SHIFT) + TWEPOCH
+    out = pd.to_datetime(millis, unit='ms')
+
+    return pd.Series(out, index=s.index, name=s.name) if isinstance(ids, pd.Series) else out
+
+
+def datetimes_to_snowflakes(dts):
+    """
+    Vectorized datetime_to_snowflake, for a whole column of times at once.  Naive times are taken to be UTC.  Returns
+    the smallest id that could have been created at each time, as a Series with the same index if dts is a Series
+    (nullable Int64 if any time is missing), otherwise as an int64 array.
+
+    :param dts: an array, list or Series of datetimes, or anything pandas can parse into them
+    :return:
+    """
+
+    times = pd.to_datetime(dts, utc=True)
+    if isinstance(times, pd.Series):
+        index, name, times = times.index, times.name, pd.DatetimeIndex(times)
+    else:
+        index, name = None, None
+
+    valid = ~times.isna()
+    millis = times.tz_localize(None).values[valid].astype('datetime64[ms]').astype('int64')
+    ids = np.maximum(millis - TWEPOCH, 0) << TIMESTAMP_SHIFT
+
+    if index is None:
+        return ids
+    if valid.all():
+        return pd.Series(ids, index=index, name=name)
+
+    out = pd.Series(pd.array([pd.NA] * len(valid), dtype='Int64'), index=index, name=name)
+    out[valid] = ids
+    return out
+
+
+def id_bounds(start=None, end=None, since_id=None, max_id=None):
+    """
+    Narrows since_id (exclusive) and max_id (inclusive) to the time window [start, end), keeping whichever bound is
+    tighter, and returns them as (since_id, max_id).  A start before the first snowflake id adds no bound.
+
+    :param start: (optional) the oldest time to include
+    :param end: (optional) the time to stop before
+    :param since_id: (optional) an existing since_id
+    :param max_id: (optional) an existing max_id
+    :return:
+    """
+
+    if start is not None:
+        bound = datetime_to_snowflake(start) - 1
+        if bound > 0:
+            since_id = bound if since_id is None else max(since_id, bound)
+
+    if end is not None:
+        bound = datetime_to_snowflake(end) - 1
+        max_id = bound if max_id is None else min(max_id, bound)
+
+    return since_id, max_id
+
+
+def shard_ids(since, until, shards):
+    """
+    Splits the time window [since, until) into equal shards and returns the snowflake id boundaries between them, as a
+    list of shards + 1 ids from oldest to newest.  Shard i covers since_id=bounds[i] (exclusive) to max_id=bounds[i + 1]
+    (inclusive).
+
+    :param since:
+    :param until:
+    :param shards:
+    :return:
+    """
+
+    start = datetime_to_snowflake(since)
+    end = datetime_to_snowflake(until)
+    if end <= start:
+        raise ValueError('until must be after since')
+
+    shards = max(int(shards), 1)
+    step = (end - start) // shards
+    bounds = [start + i * step for i in range(shards)] + [end]
+
+    return bounds
@@ -0,0 +1,196 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: spools raw pages to compressed JSON-lines files and parses them into dataframes or parquet in parallel
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import os
+import gzip
+import json
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from twitterpandas.utils import flatten_dict
+
+__author__ = 'willmcginnis'
+
+PART_SUFFIX = '.jsonl.gz'
+
+
+class SpoolWriter(object):
+    """
+    Stage one of a fetch/parse pipeline: writes pages of raw items, as returned by the API, to gzipped JSON-lines files
+    in a directory, one item per line, without parsing them.  Items are buffered into parts of about part_size items,
+    and each part is written to a temporary name and renamed into place, so a reader never sees half of one.
+
+    """
+
+    def __init__(self, path, part_size=10000, compresslevel=6):
+        """
+
+        :param path: the spool directory, it will be created if it doesn't exist
+        :param part_size: (optional, default=10000) the number of items per spool file
+        :param compresslevel: (optional, default=6) the gzip compression level
+        :return:
+
+        """
+
+        self.path = path
+        self.part_size = part_size
+        self.compresslevel = compresslevel
+        self.items = 0
+        self.parts = []
+
+        self._buffer = []
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+    def write_page(self, page):
+        """
+        Adds a page of raw items (dicts, or ids from the id endpoints) to the spool.
+
+        :param page:
+        :return:
+        """
+
+        self._buffer.extend(page)
+        self.items += len(page)
+        if len(self._buffer) >= self.part_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes out anything buffered as a new part.
+
+        :return: the path of the part written, or None if nothing was buffered
+        """
+
+        if not self._buffer:
+            return None
+
+        # named by write time, so parts sort in the order they were fetched
+        name = 'part-%020d-%s%s' % (time.time_ns(), uuid.uuid4().hex[:8], PART_SUFFIX)
+        tmp = os.path.join(self.path, '.' + name + '.tmp')
+        with gzip.open(tmp, 'wt', encoding='utf-8', compresslevel=self.compresslevel) as f:
+            for item in self._buffer:
+                f.write(json.dumps(item))
+                f.write('\n')
+        os.rename(tmp, os.path.join(self.path, name))
+
+        self._buffer = []
+        self.parts.append(os.path.join(self.path, name))
+
+        return self.parts[-1]
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def spool_parts(path):
+    """
+    Returns the paths of the finished spool files in a directory, in a stable order.
+
+    :param path:
+    :return:
+    """
+
+    if not os.path.exists(path):
+        return []
+
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.endswith(PART_SUFFIX) and not name.startswith('.')]
+
+
+def read_part(part):
+    """
+    Generator of the raw items in one spool file.
+
+    :param part:
+    :return:
+    """
+
+    with gzip.open(part, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def flatten_items(items, layers=3):
+    """
+    The default parser: flattens each raw item a few layers and discards anything nested farther, the same as the
+    client's methods.  Bare ids, from the id endpoints, become an id column.
+
+    :param items:
+    :param layers:
+    :return:
+    """
+
+    return pd.DataFrame([
+        flatten_dict(item, layers=layers, drop_deeper=True) if isinstance(item, dict) else {'id': item}
+        for item in items
+    ])
+
+
+def _parse_part(part, parser, output):
+    # runs in a worker process, so everything it touches has to be importable at module level
+    df = parser(read_part(part))
+    if output is None:
+        return df
+
+    target = os.path.join(output, os.path.basename(part)[:-len(PART_SUFFIX)] + '.parquet')
+    tmp = os.path.join(output, '.' + os.path.basename(target) + '.tmp')
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, target)
+
+    return target
+
+
+def parse_spool(path, output=None, parser=flatten_items, max_workers=None, dedupe=True):
+    """
+    Stage two of a fetch/parse pipeline: parses every file in a spool directory on a process pool.  Nothing is fetched,
+    so it can be re-run as often as needed, e.g. with a new parser, against the same spool.
+
+    Without output the parts come back concatenated as one dataframe, deduplicated on id if dedupe is set and there is
+    an id column (a spool written more than once can hold the same item twice).  With output each spool file is
+    written to a parquet file of the same name in that directory (needs pyarrow), which is replaced if it is already
+    there, and the list of parquet paths is returned.
+
+    :param path: the spool directory
+    :param output: (optional) a directory to write parquet files to instead of returning a dataframe
+    :param parser: (optional) a module level function taking an iterator of raw items and returning a dataframe, defaults to flatten_items
+    :param max_workers: (optional) the number of worker processes, defaults to the number of cpus
+    :param dedupe: (optional, default=True) drop rows with repeated ids from the returned dataframe
+    :return:
+    """
+
+    parts = spool_parts(path)
+    if output is not None and not os.path.exists(output):
+        os.makedirs(output)
+
+    if not parts:
+        return [] if output is not None else pd.DataFrame()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_parse_part, parts, [parser] * len(parts), [output] * len(parts)))
+
+    if output is not None:
+        return results
+
+    df = pd.concat(results, ignore_index=True, sort=False)
+    if dedupe and 'id' in df.columns:
+        df = df.drop_duplicates(subset='id').reset_index(drop=True)
+
+    return df
@@ -0,0 +1,242 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: consumes the streaming API on a background thread and hands back micro-batches as dataframes
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+
+from twitterpandas.frames import build_frame, check_backend
+from twitterpandas.utils import flatten_dict
+
+__author__ = 'willmcginnis'
+
+FILTER_URL = 'https://stream.twitter.com/1.1/statuses/filter.json'
+SAMPLE_URL = 'https://stream.twitter.com/1.1/statuses/sample.json'
+
+
+class TweetStream(object):
+    """
+    A connection to one of the streaming endpoints.  Statuses are read on a background thread into a bounded ring
+    buffer, and batches() flushes them out as dataframes with the same flattening as the timeline methods, every
+    batch_size rows or every flush_interval seconds, whichever comes first.  If the consumer falls behind and the buffer
+    fills, the oldest statuses are dropped and counted in metrics.
+
+    """
+
+    def __init__(self, url, params=None, auth=None, method='POST', batch_size=1000, flush_interval=5.0,
+                 buffer_size=10000, max_retries=5, timeout=90, backend='pandas'):
+        """
+
+        :param url: the streaming endpoint
+        :param params: the parameters to the endpoint, e.g. track
+        :param auth: a requests auth object, e.g. from tweepy's OAuthHandler.apply_auth()
+        :param method: the HTTP method to connect with
+        :param batch_size: (optional, default=1000) the most rows per batch
+        :param flush_interval: (optional, default=5.0) the most seconds between batches, if any rows are waiting
+        :param buffer_size: (optional, default=10000) the most statuses held between batches before dropping
+        :param max_retries: (optional, default=5) the number of times to reconnect after a disconnect
+        :param timeout: (optional, default=90) read timeout, twitter sends keep-alives every 30 seconds
+        :param backend: (optional, default=pandas) the frame type batches come back as: pandas, pyarrow or polars
+        :return:
+
+        """
+
+        self.url = url
+        self.params = params or {}
+        self.auth = auth
+        self.method = method
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backend = check_backend(backend)
+
+        self._buffer = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._response = None
+        self.error = None
+
+        self.received = 0
+        self.dropped = 0
+        self.undelivered = 0
+        self.high_water = 0
+        self.batches_flushed = 0
+        self.rows_flushed = 0
+        self.reconnects = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def metrics(self):
+        """
+        Returns a dict of counters: statuses received, dropped from a full buffer, reported undelivered by twitter in
+        limit notices, currently buffered, the most ever buffered at once, batches and rows flushed, and reconnects.
+
+        :return:
+        """
+
+        with self._cond:
+            return {
+                'received': self.received,
+                'dropped': self.dropped,
+                'undelivered': self.undelivered,
+                'buffered': len(self._buffer),
+                'buffer_size': self._buffer.maxlen,
+                'high_water': self.high_water,
+                'batches': self.batches_flushed,
+                'rows': self.rows_flushed,
+                'reconnects': self.reconnects,
+            }
+
+    def start(self):
+        """
+        Connects and starts reading on a background thread.
+
+        :return:
+        """
+
+        if self.running:
+            return self
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='twitterpandas-stream')
+        self._thread.daemon = True
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """
+        Disconnects.  Anything still buffered can be drained with batches().
+
+        :return:
+        """
+
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(self.timeout)
+
+    def _put(self, status):
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(status)
+            self.received += 1
+            self.high_water = max(self.high_water, len(self._buffer))
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _handle(self, line):
+        if not line:
+            # keep-alive
+            return
+
+        message = json.loads(line.decode('utf-8') if isinstance(line, bytes) else line)
+        if 'limit' in message:
+            with self._cond:
+                self.undelivered = max(self.undelivered, message['limit'].get('track', 0))
+        elif 'id' in message and ('text' in message or 'full_text' in message):
+            self._put(message)
+
+    def _run(self):
+        retries = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._response = requests.request(
+                        self.method,
+                        self.url,
+                        data=self.params if self.method == 'POST' else None,
+                        params=self.params if self.method != 'POST' else None,
+                        auth=self.auth,
+                        stream=True,
+                        timeout=self.timeout
+                    )
+                    self._response.raise_for_status()
+                    for line in self._response.iter_lines():
+                        if self._stop.is_set():
+                            break
+                        self._handle(line)
+                        retries = 0
+                except (requests.RequestException, ValueError) as e:
+                    if self._stop.is_set():
+                        break
+                    self.error = e
+
+                if self._stop.is_set() or retries >= self.max_retries:
+                    break
+
+                # back off exponentially before reconnecting
+                retries += 1
+                self.reconnects += 1
+                self._stop.wait(min(2 ** retries, 320))
+        finally:
+            self._stop.set()
+            with self._cond:
+                self._cond.notify_all()
+
+    def _flush(self):
+        with self._cond:
+            n = min(len(self._buffer), self.batch_size)
+            ds = [self._buffer.popleft() for _ in range(n)]
+            self.batches_flushed += 1
+            self.rows_flushed += n
+
+        return build_frame((flatten_dict(status, layers=3, drop_deeper=True) for status in ds), backend=self.backend)
+
+    def batches(self):
+        """
+        Generator of dataframes, each of up to batch_size statuses.  Runs until the stream is stopped (or gives up
+        reconnecting) and the buffer is drained.
+
+        :return:
+        """
+
+        last_flush = time.time()
+        while True:
+            with self._cond:
+                while len(self._buffer) < self.batch_size and not self._stop.is_set():
+                    remaining = self.flush_interval - (time.time() - last_flush)
+                    if remaining <= 0:
+                        if len(self._buffer) > 0:
+                            break
+                        # nothing arrived this interval, start the next one
+                        last_flush = time.time()
+                        remaining = self.flush_interval
+                    self._cond.wait(remaining)
+
+                ready = len(self._buffer) > 0
+                if not ready and self._stop.is_set():
+                    return
+
+            if ready:
+                yield self._flush()
+            last_flush = time.time()
+
+    def __iter__(self):
+        return self.batches()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
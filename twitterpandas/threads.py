@@ -0,0 +1,75 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: reply thread structure, computed over whole id columns at once
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+ReplyThreads = namedtuple('ReplyThreads', ['edges', 'statuses', 'ancestors'])
+
+
+def id_values(values):
+    """
+    Returns a sequence of ids, with nulls for none, as an int64 array and a mask of which are present.  Status ids are
+    past 2 ** 53, so they are never passed through float64: python ints, strings (the *_id_str fields) and nullable
+    Int64 are converted exactly.  A float64 column has already been rounded, use the *_id_str column instead.
+
+    :param values:
+    :return:
+    """
+
+    # a plain list with a None in it would be made float64
+    if isinstance(values, (pd.Series, pd.Index, np.ndarray, pd.api.extensions.ExtensionArray)):
+        values = pd.Series(values)
+    else:
+        values = pd.Series(list(values), dtype=object)
+
+    if values.dtype == object:
+        mask = values.notnull().values
+        out = np.zeros(len(values), dtype='int64')
+        out[mask] = [int(value) for value in values.values[mask]]
+        return out, mask
+
+    values = values.astype('Int64')
+    return values.to_numpy(dtype='int64', na_value=0), values.notna().values
+
+
+def thread_roots(ids, parent_ids):
+    """
+    Given each status id and the id it replies to (null for none, or not known), returns a dataframe indexed by id with
+    the root of each status's thread and its depth below the root.  Parents that are not themselves in ids are treated
+    as roots.  Uses pointer jumping, so the number of vectorized steps grows with the log of the deepest thread.
+
+    :param ids: a sequence of status ids
+    :param parent_ids: a sequence of the in_reply_to_status_id of each, with nulls for none (see id_values)
+    :return:
+    """
+
+    ids, _ = id_values(ids)
+    parents, has_parent = id_values(parent_ids)
+
+    # every status and every parent becomes a node, roots point at themselves
+    known_parents = parents[has_parent]
+    nodes = pd.Index(np.unique(np.concatenate([ids, known_parents])))
+    jump = np.arange(len(nodes))
+    jump[nodes.get_indexer(ids[has_parent])] = nodes.get_indexer(known_parents)
+    depth = (jump != np.arange(len(nodes))).astype('int64')
+
+    while True:
+        next_jump = jump[jump]
+        if (next_jump == jump).all():
+            break
+        depth = depth + depth[jump]
+        jump = next_jump
+
+    return pd.DataFrame({'root_id': nodes.values[jump], 'depth': depth}, index=pd.Index(nodes.values, name='id'))
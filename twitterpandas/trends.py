@@ -0,0 +1,237 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: collects trends for many locations at once into a local time series store
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import os
+import time
+import uuid
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import tweepy
+
+from twitterpandas.geo import LocationResolver
+
+__author__ = 'willmcginnis'
+
+# the columns kept per trend, and the compact dtypes they are stored with
+STORE_COLUMNS = ['woeid', 'as_of', 'created_at', 'location_name', 'rank', 'name', 'query', 'tweet_volume',
+                 'promoted_content']
+CATEGORY_COLUMNS = ['location_name', 'name', 'query']
+
+
+def _utc(value):
+    # times are stored as naive utc, naive values are taken to be utc already
+    return pd.to_datetime(value, utc=True).tz_localize(None)
+
+
+class TrendStore(object):
+    """
+    An append-only, columnar store of trend snapshots on local disk.  Each snapshot is written as a parquet file under
+    a directory per day, so reads for a time range only touch the days in it, and the repeated location and trend
+    names are stored as categoricals.
+
+    """
+
+    def __init__(self, path):
+        """
+
+        :param path: the directory to keep the store in, it will be created if it doesn't exist
+        :return:
+
+        """
+
+        self.path = path
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+    def append(self, df):
+        """
+        Writes a snapshot (rows as returned by TwitterPandas.trends_place) to the store.
+
+        :param df:
+        :return: the number of rows written
+        """
+
+        if df is None or len(df) == 0:
+            return 0
+
+        df = df.reindex(columns=STORE_COLUMNS).copy()
+        df['woeid'] = df['woeid'].astype('int64')
+        df['as_of'] = pd.to_datetime(df['as_of'], utc=True).dt.tz_localize(None)
+        df['created_at'] = pd.to_datetime(df['created_at'], utc=True).dt.tz_localize(None)
+        df['rank'] = df['rank'].astype('int16')
+        df['tweet_volume'] = df['tweet_volume'].astype('float64')
+
+        for day, part in df.groupby(df['as_of'].dt.strftime('%Y-%m-%d')):
+            directory = os.path.join(self.path, 'date=%s' % day)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            for column in CATEGORY_COLUMNS:
+                part[column] = part[column].astype('category')
+            part.to_parquet(os.path.join(directory, 'part-%s.parquet' % uuid.uuid4().hex), index=False)
+
+        return len(df)
+
+    def days(self, start=None, end=None):
+        days = sorted(d[len('date='):] for d in os.listdir(self.path) if d.startswith('date='))
+        if start is not None:
+            days = [d for d in days if d >= _utc(start).strftime('%Y-%m-%d')]
+        if end is not None:
+            days = [d for d in days if d <= _utc(end).strftime('%Y-%m-%d')]
+        return days
+
+    def read(self, woeids=None, names=None, start=None, end=None):
+        """
+        Returns the stored trends as a dataframe, filtered by location, trend name and as_of time range.
+
+        :param woeids: (optional) a list of woeids to keep
+        :param names: (optional) a list of trend names to keep
+        :param start: (optional) the earliest as_of to keep, naive times are taken to be UTC
+        :param end: (optional) the latest as_of to keep, naive times are taken to be UTC
+        :return:
+        """
+
+        frames = []
+        for day in self.days(start, end):
+            directory = os.path.join(self.path, 'date=%s' % day)
+            for part in sorted(os.listdir(directory)):
+                df = pd.read_parquet(os.path.join(directory, part))
+                if woeids is not None:
+                    df = df[df['woeid'].isin(woeids)]
+                if names is not None:
+                    df = df[df['name'].isin(names)]
+                frames.append(df)
+
+        if not frames:
+            return pd.DataFrame(columns=STORE_COLUMNS)
+
+        df = pd.concat(frames, ignore_index=True)
+        for column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype('category')
+        if start is not None:
+            df = df[df['as_of'] >= _utc(start)]
+        if end is not None:
+            df = df[df['as_of'] <= _utc(end)]
+
+        return df.sort_values(['as_of', 'woeid', 'rank']).reset_index(drop=True)
+
+    def history(self, name, start=None, end=None, value='rank'):
+        """
+        Returns a time series of one trend, as a dataframe indexed by as_of with a column per woeid.
+
+        :param name: the trend name, e.g. #python
+        :param start: (optional) the earliest as_of to include
+        :param end: (optional) the latest as_of to include
+        :param value: (optional, default=rank) the column to chart, rank or tweet_volume
+        :return:
+        """
+
+        df = self.read(names=[name], start=start, end=end)
+
+        return df.pivot_table(index='as_of', columns='woeid', values=value, aggfunc='min', observed=True)
+
+
+class TrendsCollector(object):
+    """
+    Fetches the trends for many locations concurrently, within the trends/place rate limit, and appends each snapshot
+    to a TrendStore.  The trends_available catalog is fetched once and reused until it is older than catalog_ttl.
+    A location that fails (e.g. one no longer available) doesn't hold up the rest: the round keeps every location that
+    succeeded, and the ones that failed are listed in failures.
+
+    """
+
+    def __init__(self, twitter_pandas, store=None, max_workers=8, catalog_ttl=24 * 60 * 60):
+        """
+
+        :param twitter_pandas: a TwitterPandas client
+        :param store: (optional) a TrendStore or a path to one, if None snapshots are only returned
+        :param max_workers: (optional, default=8) the number of locations to fetch at once
+        :param catalog_ttl: (optional, default=1 day) how long the trends_available catalog is cached, in seconds
+        :return:
+
+        """
+
+        self.twitter_pandas = twitter_pandas
+        self.store = TrendStore(store) if isinstance(store, str) else store
+        self.max_workers = max_workers
+        self.catalog_ttl = catalog_ttl
+        self.budget = twitter_pandas.rate_budget('trends_place')
+
+        # the woeid and error of each location that failed in the last round
+        self.failures = pd.DataFrame(columns=['woeid', 'error'])
+
+        self._catalog = None
+        self._catalog_at = None
+
+    def catalog(self, refresh=False):
+        """
+        Returns the trends_available catalog, from cache unless it has expired or refresh is True.
+
+        :param refresh:
+        :return:
+        """
+
+        expired = self._catalog_at is None or time.time() - self._catalog_at > self.catalog_ttl
+        if refresh or expired:
+            self._catalog = self.twitter_pandas.trends_available()
+            self._catalog_at = time.time()
+
+        return self._catalog
+
+    def resolver(self, coordinates, place_types=None):
+        """
+        Returns a LocationResolver over the cached catalog, for mapping coordinates to woeids without calling
+        trends_closest.
+
+        :param coordinates: a dataframe with woeid, lat and long columns
+        :param place_types: (optional) a list of placeType.name values to limit matches to
+        :return:
+        """
+
+        return LocationResolver.from_catalog(self.catalog(), coordinates, place_types=place_types)
+
+    def _fetch(self, woeid, exclude):
+        self.budget.acquire()
+        try:
+            return self.twitter_pandas.trends_place(id_=woeid, exclude=exclude), None
+        except tweepy.TweepError as e:
+            return None, str(e)
+
+    def collect(self, woeids=None, exclude=None):
+        """
+        Fetches one snapshot of trends for every location, appending it to the store.  Locations that fail are left
+        out of the snapshot with a warning, and listed with their errors in failures.
+
+        :param woeids: (optional) the locations to fetch, defaults to every location in the catalog
+        :param exclude: (optional) set to hashtags to leave hashtags out
+        :return: the snapshot as a dataframe
+        """
+
+        if woeids is None:
+            woeids = self.catalog()['woeid'].tolist()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda woeid: self._fetch(woeid, exclude), woeids))
+
+        self.failures = pd.DataFrame(
+            [(woeid, error) for woeid, (_, error) in zip(woeids, results) if error is not None],
+            columns=['woeid', 'error']
+        )
+        if len(self.failures) > 0:
+            warnings.warn('trends failed for %d of %d locations, see failures' % (len(self.failures), len(woeids)))
+
+        frames = [df for df, _ in results if df is not None and len(df) > 0]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=STORE_COLUMNS)
+
+        if self.store is not None:
+            self.store.append(df)
+
+        return df
@@ -0,0 +1,198 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: a local SQLite store of hydrated users, with staleness aware lookups and a history of profile changes
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+__author__ = 'willmcginnis'
+
+# profile fields whose changes are kept as history rows
+HISTORY_FIELDS = [
+    'screen_name', 'name', 'description', 'location', 'url', 'verified', 'protected', 'followers_count',
+    'friends_count', 'listed_count', 'statuses_count', 'favourites_count', 'profile_image_url_https',
+]
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        screen_name TEXT,
+        fetched_at REAL NOT NULL,
+        data TEXT NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS users_screen_name ON users (screen_name)',
+    '''CREATE TABLE IF NOT EXISTS history (
+        user_id INTEGER NOT NULL,
+        changed_at REAL NOT NULL,
+        field TEXT NOT NULL,
+        old TEXT,
+        new TEXT
+    )''',
+    'CREATE INDEX IF NOT EXISTS history_user ON history (user_id, changed_at)',
+]
+
+# SQLite's limit on bound parameters is 999 on older builds
+BATCH = 500
+
+
+class UserStore(object):
+    """
+    Keeps the latest flattened version of every user the client has hydrated in a SQLite file, keyed by user id and
+    looked up by id or (case insensitive) screen name, with when it was fetched.  Rows older than max_age count as
+    stale, so the client re-fetches only those.  When a stored user is written again, each tracked profile field that
+    changed is recorded as one (user_id, changed_at, field, old, new) history row, rather than another copy of the user.
+
+    """
+
+    def __init__(self, path, max_age=24 * 60 * 60, history_fields=None):
+        """
+
+        :param path: the SQLite file, created if it doesn't exist
+        :param max_age: (optional, default=one day) seconds before a stored user is stale and fetched again
+        :param history_fields: (optional) the fields to track changes of, defaults to HISTORY_FIELDS
+        :return:
+
+        """
+
+        self.path = path
+        self.max_age = max_age
+        self.history_fields = HISTORY_FIELDS if history_fields is None else list(history_fields)
+
+        # shared by the client's worker threads, so every use of the connection is under the lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            for statement in SCHEMA:
+                self._db.execute(statement)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _select(self, column, values, max_age):
+        """
+        The stored rows whose column is in values and that were fetched within max_age (None for any age), keyed by
+        that column.  Callers hold the lock.
+        """
+
+        oldest = None if max_age is None else time.time() - max_age
+        found = {}
+        for start in range(0, len(values), BATCH):
+            batch = values[start:start + BATCH]
+            sql = 'SELECT %s, fetched_at, data FROM users WHERE %s IN (%s)' % (
+                column, column, ', '.join('?' * len(batch)))
+            for key, fetched_at, data in self._db.execute(sql, batch):
+                if oldest is None or fetched_at >= oldest:
+                    found[key] = json.loads(data)
+
+        return found
+
+    def get(self, user_ids=None, screen_names=None, max_age=None):
+        """
+        Returns the fresh stored users among the ids or screen names given, in the order given, skipping any that are
+        missing or stale.
+
+        :param user_ids: (optional) a list of user ids
+        :param screen_names: (optional) a list of screen names
+        :param max_age: (optional) seconds a row may be old, defaults to the store's max_age
+        :return:
+        """
+
+        max_age = self.max_age if max_age is None else max_age
+
+        if user_ids is not None:
+            user_ids = [int(user_id) for user_id in user_ids]
+            with self._lock:
+                found = self._select('user_id', user_ids, max_age)
+            return [found[user_id] for user_id in user_ids if user_id in found]
+
+        keys = [screen_name.lower() for screen_name in screen_names or []]
+        with self._lock:
+            found = self._select('screen_name', keys, max_age)
+        return [found[key] for key in keys if key in found]
+
+    def put(self, users, fetched_at=None):
+        """
+        Stores flattened user dicts (with an id), replacing older versions and recording changes to tracked fields.
+
+        :param users:
+        :param fetched_at: (optional) when they were fetched, defaults to now
+        :return:
+        """
+
+        users = [user for user in users if user.get('id') is not None]
+        if not users:
+            return
+
+        fetched_at = time.time() if fetched_at is None else fetched_at
+
+        # read, compare and write as one, so two threads storing the same user can't both diff against the same row
+        with self._lock, self._db:
+            previous = self._select('user_id', [int(user['id']) for user in users], None)
+
+            history = []
+            for user in users:
+                old = previous.get(int(user['id']))
+                if old is None:
+                    continue
+                for field in self.history_fields:
+                    if field in user and old.get(field) != user.get(field):
+                        history.append((int(user['id']), fetched_at, field, json.dumps(old.get(field)),
+                                        json.dumps(user.get(field))))
+
+            self._db.executemany('INSERT INTO history (user_id, changed_at, field, old, new) VALUES (?, ?, ?, ?, ?)',
+                                 history)
+            self._db.executemany(
+                'INSERT OR REPLACE INTO users (user_id, screen_name, fetched_at, data) VALUES (?, ?, ?, ?)',
+                [(int(user['id']), (user.get('screen_name') or '').lower() or None, fetched_at,
+                  json.dumps(user, default=str)) for user in users]
+            )
+
+    def users(self):
+        """
+        Returns a dataframe of every stored user, with a fetched_at column.
+
+        :return:
+        """
+
+        with self._lock:
+            rows = self._db.execute('SELECT fetched_at, data FROM users ORDER BY user_id').fetchall()
+
+        return pd.DataFrame([dict(json.loads(data), fetched_at=fetched_at) for fetched_at, data in rows])
+
+    def history(self, user_id=None):
+        """
+        Returns a dataframe of recorded profile changes, oldest first, for one user or all of them.
+
+        :param user_id: (optional)
+        :return:
+        """
+
+        sql = 'SELECT user_id, changed_at, field, old, new FROM history'
+        params = ()
+        if user_id is not None:
+            sql += ' WHERE user_id = ?'
+            params = (int(user_id),)
+
+        with self._lock:
+            df = pd.read_sql_query(sql + ' ORDER BY changed_at, rowid', self._db, params=params)
+
+        for column in ['old', 'new']:
+            df[column] = df[column].map(json.loads)
+
+        return df
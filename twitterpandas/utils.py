@@ -0,0 +1,37 @@
+"""
+.. module::
+   :platform: Unix, Windows
+   :synopsis: helpers shared by the client and the modules built around it
+
+.. moduleauthor:: Will McGinnis <will@pedalwrencher.com>
+
+
+"""
+
+__author__ = 'willmcginnis'
+
+
+def flatten_dict(data, layers=1, drop_deeper=True):
+    """
+    takes in a dictionary and will flatten it with level_1.level_2 as the key, for however many levels are
+    specified. If specified (true by default), anything deeper than the specified level will be dropped from the
+    dictionary outright.
+
+    :param data:
+    :param layers:
+    :param drop_deeper:
+    :return:
+    """
+
+    for _ in range(layers):
+        data = [(k, v) if not isinstance(v, dict) else [(k + '.' + k2, v2) for k2, v2 in v.items()] for k, v in
+                data.items()]
+        data = [item for sublist in data for item in sublist if isinstance(sublist, list)] + [y for y in data if
+                                                                                              not isinstance(y,
+                                                                                                             list)]
+        data = dict(data)
+
+    if drop_deeper:
+        data = {k: v for k, v in data.items() if not isinstance(v, dict) or isinstance(v, list)}
+
+    return data